@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: inline audit commits vs. the batched audit sink
+
+Serves a minimal FastAPI endpoint that calls audit_service.log_operation
+(like the platform/BTK/corporate/regulator routers) through the ASGI
+stack, in two modes:
+
+  - inline: db.add + commit per request (previous behaviour)
+  - sink:   rows queued on AuditSink, written in multi-row batches
+
+The database is simulated: every commit costs --commit-ms (network round
+trip + WAL flush), every row inserted costs --row-us, and at most
+--db-pool commits run at once (SQLAlchemy's default pool is 5 + 10
+overflow), so the numbers show the request-path cost of auditing, not
+Postgres itself.
+
+Usage (from eza-v5/):
+    python backend/benchmarks/bench_audit_sink.py --requests 2000 --concurrency 50
+    python backend/benchmarks/bench_audit_sink.py --commit-ms 5 --batch-size 200
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Any, List
+
+# Add project root (eza-v5) to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import httpx
+from fastapi import Depends, FastAPI
+
+from backend.config import Settings
+from backend.services.audit_service import log_operation
+from backend.telemetry import audit_sink
+
+
+class SimulatedSession:
+    """AsyncSession stand-in with a fixed commit cost and a shared connection pool"""
+
+    def __init__(self, pool: asyncio.Semaphore, commit_ms: float, row_us: float):
+        self.pool = pool
+        self.commit_s = commit_ms / 1000.0
+        self.row_s = row_us / 1_000_000.0
+        self.rows = 0
+
+    def add(self, obj):
+        self.rows += 1
+
+    async def commit(self):
+        async with self.pool:
+            await asyncio.sleep(self.commit_s + self.rows * self.row_s)
+
+    async def rollback(self):
+        pass
+
+
+def build_app(args, pool: asyncio.Semaphore) -> FastAPI:
+    app = FastAPI()
+
+    def get_session():
+        return SimulatedSession(pool, args.commit_ms, args.row_us)
+
+    @app.get("/platform/resource")
+    async def resource(db: SimulatedSession = Depends(get_session)):
+        await log_operation(db=db, endpoint="/platform/resource", method="GET", actor="bench", result="success")
+        return {"ok": True}
+
+    return app
+
+
+async def _run(mode: str, args) -> Dict[str, Any]:
+    sink = None
+    pool = asyncio.Semaphore(args.db_pool)
+    if mode == "sink":
+        async def writer(rows: List[Dict[str, Any]]):
+            async with pool:
+                await asyncio.sleep(args.commit_ms / 1000.0 + len(rows) * args.row_us / 1_000_000.0)
+
+        settings = Settings(AUDIT_BATCH_SIZE=args.batch_size, AUDIT_FLUSH_INTERVAL_MS=args.flush_ms)
+        sink = audit_sink._audit_sink = audit_sink.AuditSink(settings, writer=writer)
+        sink.start()
+
+    app = build_app(args, pool)
+    latencies: List[float] = []
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        async def one():
+            async with semaphore:
+                t0 = time.perf_counter()
+                response = await client.get("/platform/resource")
+                response.raise_for_status()
+                latencies.append((time.perf_counter() - t0) * 1000)
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(args.requests)))
+        elapsed = time.perf_counter() - t0
+
+    stats = {}
+    if sink is not None:
+        await audit_sink.stop_audit_sink()
+        stats = sink.stats()
+
+    latencies.sort()
+    return {
+        "mode": mode,
+        "requests": args.requests,
+        "rps": round(args.requests / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 2),
+        "commits": stats.get("batches", args.requests),
+        "dropped": stats.get("dropped", 0),
+    }
+
+
+async def main(args):
+    results = [await _run(mode, args) for mode in ("inline", "sink")]
+
+    print(f"requests={args.requests} concurrency={args.concurrency} db_pool={args.db_pool} commit_ms={args.commit_ms} "
+          f"row_us={args.row_us} batch_size={args.batch_size} flush_ms={args.flush_ms}")
+    print(f"{'mode':<8} {'requests':>8} {'rps':>8} {'p50_ms':>8} {'p95_ms':>8} {'commits':>8} {'dropped':>8}")
+    for r in results:
+        print(f"{r['mode']:<8} {r['requests']:>8} {r['rps']:>8} {r['p50_ms']:>8} {r['p95_ms']:>8} "
+              f"{r['commits']:>8} {r['dropped']:>8}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inline audit commits vs. batched audit sink")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--commit-ms", type=float, default=2.0, help="Simulated cost of one commit")
+    parser.add_argument("--db-pool", type=int, default=15, help="Concurrent commits allowed")
+    parser.add_argument("--row-us", type=float, default=20.0, help="Simulated cost per inserted row")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--flush-ms", type=float, default=200.0)
+    asyncio.run(main(parser.parse_args()))
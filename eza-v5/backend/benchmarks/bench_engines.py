@@ -0,0 +1,355 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: text-analysis engines on synthetic EN/TR corpora
+
+Generates deterministic corpora (seeded) in English and Turkish at
+three sizes and times every engine on each:
+
+  - short:      chat turns of 40-300 characters
+  - doc:        ~10 KB documents
+  - transcript: ~1 MB transcripts
+
+Texts are built from a plain vocabulary with risk, pressure, deception
+and legal phrases (and PII-like numbers) mixed in at a realistic rate,
+so the shared scanner finds hits as it would on real traffic. Turkish
+text exercises non-ASCII lowercasing and word boundaries.
+
+Engines: analyze_input, analyze_output, analyze_deception,
+analyze_psychological_pressure, analyze_legal_risk, compute_alignment,
+compute_score, compute_risk (full input+output path). Arguments an
+engine takes from earlier stages (analyses, report) are computed before
+timing (compute_alignment and compute_score only read those, so their
+cost does not grow with the text and MB/s means little). The scanner
+caches results per text (scan_text), so by default its cache is
+cleared before every timed call and each call pays for its own scan;
+--warm-scan measures the cached path instead (engines sharing one scan
+inside a request).
+
+Before timing, the scanner is checked on SCANNER_CASES (texts whose
+lowercase form is longer, e.g. Turkish "İ", or that only match under
+re.IGNORECASE): hits must be those the engines' per-category regexes
+found on text.lower(), with spans into the original text. A failed
+check exits 1 without benchmarking.
+
+Each case runs at least --min-time seconds and --min-calls calls after
+one warmup pass. Results (calls/s, MB/s, latency percentiles) are
+printed and, with --json, written with run metadata; --compare reports
+the change against a previous JSON file and exits 1 when any case's
+p50 regressed by more than --threshold.
+
+Usage (from eza-v5/):
+    python backend/benchmarks/bench_engines.py --json /tmp/engines.json
+    python backend/benchmarks/bench_engines.py --sizes short doc --engines analyze_input compute_risk
+    python backend/benchmarks/bench_engines.py --json /tmp/after.json --compare /tmp/engines.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Any, List, Callable, Tuple
+
+# Add project root (eza-v5) to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from backend.core.engines.scanner import scan_text
+from backend.core.engines.input_analyzer import analyze_input
+from backend.core.engines.output_analyzer import analyze_output
+from backend.core.engines.deception_engine import analyze_deception
+from backend.core.engines.psych_pressure import analyze_psychological_pressure
+from backend.core.engines.legal_risk import analyze_legal_risk
+from backend.core.engines.alignment_engine import compute_alignment
+from backend.core.engines.score_engine import compute_score
+from backend.core.engines.eza_risk_engine import compute_risk
+
+
+# ---------------------------------------------------------------------------
+# CORPORA
+# ---------------------------------------------------------------------------
+
+SIZES: Dict[str, Tuple[int, int, int]] = {
+    # name: (min chars, max chars, texts in the corpus)
+    "short": (40, 300, 200),
+    "doc": (10_000, 10_240, 20),
+    "transcript": (1_000_000, 1_048_576, 2),
+}
+
+VOCABULARY = {
+    "en": (
+        "the a an and or but if then because while when where which who this that these those "
+        "is are was were be been have has had do does did can could will would should may might "
+        "customer service order account payment delivery product support team message report "
+        "question answer problem issue update request meeting schedule price offer information "
+        "please thanks today tomorrow week month year time people user system data model result "
+        "help explain check send receive open close start finish change improve review agree "
+        "good new important simple clear quick available possible different same other next last"
+    ).split(),
+    "tr": (
+        "ve veya ama eğer çünkü iken ne zaman nerede hangi kim bu şu bunlar şunlar bir her "
+        "müşteri hizmet sipariş hesap ödeme teslimat ürün destek ekip mesaj rapor soru cevap "
+        "sorun güncelleme talep toplantı program fiyat teklif bilgi lütfen teşekkürler bugün "
+        "yarın hafta ay yıl zaman insanlar kullanıcı sistem veri sonuç yardım açıklamak kontrol "
+        "göndermek almak açmak kapatmak başlamak bitirmek değiştirmek geliştirmek incelemek "
+        "iyi yeni önemli basit açık hızlı mümkün farklı aynı diğer sonraki son şöyle böyle "
+        "ığdır çağrı görüşme öğrenci şikâyet üzgünüm değerlendirme işlem güvenlik"
+    ).split(),
+}
+
+# Phrases the engines look for (English terms also occur in Turkish traffic)
+SIGNAL_PHRASES = {
+    "en": [
+        "how to hack the account", "this is urgent act now", "limited time offer",
+        "you must decide", "everyone is doing it", "last chance to join", "keep it secret",
+        "official government notice", "you owe me", "serious consequences", "personal data leak",
+        "illegal download link", "this looks like phishing", "card 4111 1111 1111 1111",
+        "ssn 123-45-6789", "contact john.doe@example.com", "hello there", "why does it fail",
+        "write a summary", "explain the danger",
+    ],
+    "tr": [
+        "hesabı hack etmek", "acil durum urgent", "limited kampanya", "son şans last chance",
+        "gizli tut secret", "official duyuru", "tehdit threat içeriyor", "gdpr ihlali",
+        "kişisel veri personal data", "kart 4111 1111 1111 1111", "e-posta ayse.yilmaz@example.com",
+        "merhaba hello", "neden how", "bir metin write", "scam ve fraud şüphesi",
+    ],
+}
+
+SIGNAL_RATE = 0.03  # Share of tokens that are a signal phrase
+
+# Scanner regression cases: (text, category, expected hit substrings)
+SCANNER_CASES: List[Tuple[str, str, List[str]]] = [
+    ("İsmail@example.com adresine yazın", "legal.pii_exposure", ["smail@example.com"]),
+    ("İSTANBUL kill İZMİR hack", "risk.violence", ["kill"]),
+    ("İZMİR hello", "intent.greeting", ["hello"]),
+    ("kıll", "risk.violence", ["kıll"]),
+    ("ſcam", "risk.manipulation", ["ſcam"]),
+]
+
+
+def _text(rng: random.Random, lang: str, length: int) -> str:
+    words = VOCABULARY[lang]
+    signals = SIGNAL_PHRASES[lang]
+    parts: List[str] = []
+    size = 0
+    sentence = 0
+    while size < length:
+        token = rng.choice(signals) if rng.random() < SIGNAL_RATE else rng.choice(words)
+        sentence += 1
+        if sentence >= rng.randint(8, 18):
+            token += "."
+            sentence = 0
+        parts.append(token)
+        size += len(token) + 1
+    return " ".join(parts)[:length]
+
+
+def check_scanner() -> bool:
+    """Run SCANNER_CASES; prints each mismatch, True if all passed"""
+    ok = True
+    for text, category, expected in SCANNER_CASES:
+        found = [text[start:end] for start, end in scan_text(text).spans(category)]
+        if found != expected:
+            print(f"scanner check failed: {category} in {text!r}: {found} != {expected}")
+            ok = False
+    return ok
+
+
+def build_corpus(lang: str, size: str, seed: int) -> List[str]:
+    """Deterministic texts of a size class (same seed, same corpus)"""
+    low, high, count = SIZES[size]
+    rng = random.Random(f"{seed}:{lang}:{size}")
+    return [_text(rng, lang, rng.randint(low, high)) for _ in range(count)]
+
+
+# ---------------------------------------------------------------------------
+# ENGINES
+# ---------------------------------------------------------------------------
+
+def _report(text: str, input_analysis: Dict[str, Any], output_analysis: Dict[str, Any], alignment: Dict[str, Any]):
+    return {
+        "input": {"raw_text": text, "analysis": input_analysis},
+        "output": {"raw_text": text, "analysis": output_analysis},
+        "alignment": alignment,
+    }
+
+
+def _prepare(text: str) -> Dict[str, Any]:
+    """Upstream results an engine call depends on (computed untimed)"""
+    input_analysis = analyze_input(text)
+    output_analysis = analyze_output(text, input_analysis)
+    alignment = compute_alignment(input_analysis, output_analysis)
+    return {
+        "text": text,
+        "input": input_analysis,
+        "output": output_analysis,
+        "alignment": alignment,
+        "report": _report(text, input_analysis, output_analysis, alignment),
+    }
+
+
+# name: call(prepared) -> result. The text is used as both prompt and answer.
+ENGINES: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    "analyze_input": lambda p: analyze_input(p["text"]),
+    "analyze_output": lambda p: analyze_output(p["text"], p["input"]),
+    "analyze_deception": lambda p: analyze_deception(p["text"], p["report"]),
+    "analyze_psychological_pressure": lambda p: analyze_psychological_pressure(p["text"]),
+    "analyze_legal_risk": lambda p: analyze_legal_risk(p["input"], p["output"], p["report"]),
+    "compute_alignment": lambda p: compute_alignment(p["input"], p["output"]),
+    "compute_score": lambda p: compute_score(p["input"], p["output"], p["alignment"]),
+    "compute_risk": lambda p: compute_risk(p["text"], p["text"]),
+}
+
+
+# ---------------------------------------------------------------------------
+# MEASUREMENT
+# ---------------------------------------------------------------------------
+
+def _percentile(ordered: List[float], q: float) -> float:
+    return ordered[min(len(ordered) - 1, max(0, int(round(q * len(ordered))) - 1))]
+
+
+def run_case(
+    engine: str,
+    lang: str,
+    size: str,
+    prepared: List[Dict[str, Any]],
+    min_time: float,
+    min_calls: int,
+    warm_scan: bool
+) -> Dict[str, Any]:
+    call = ENGINES[engine]
+    clear = scan_text.cache_clear
+    perf_counter_ns = time.perf_counter_ns
+
+    for item in prepared:  # warmup
+        clear()
+        call(item)
+
+    latencies_ns: List[int] = []
+    chars = 0
+    started = time.perf_counter()
+    while len(latencies_ns) < min_calls or time.perf_counter() - started < min_time:
+        for item in prepared:
+            if warm_scan:
+                scan_text(item["text"])
+            else:
+                clear()
+            t0 = perf_counter_ns()
+            call(item)
+            latencies_ns.append(perf_counter_ns() - t0)
+            chars += len(item["text"])
+
+    busy_s = sum(latencies_ns) / 1e9
+    ordered = sorted(ns / 1e6 for ns in latencies_ns)
+    return {
+        "engine": engine,
+        "lang": lang,
+        "size": size,
+        "calls": len(ordered),
+        "avg_chars": round(chars / len(ordered)),
+        "calls_per_s": round(len(ordered) / busy_s, 1),
+        "mb_per_s": round(chars / 1e6 / busy_s, 2),
+        "mean_ms": round(statistics.fmean(ordered), 4),
+        "p50_ms": round(_percentile(ordered, 0.50), 4),
+        "p95_ms": round(_percentile(ordered, 0.95), 4),
+        "p99_ms": round(_percentile(ordered, 0.99), 4),
+        "max_ms": round(ordered[-1], 4),
+    }
+
+
+def _metadata(args) -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, timeout=5, cwd=Path(__file__).parent,
+        ).stdout.strip() or None
+    except Exception:
+        commit = None
+    return {
+        "benchmark": "engines",
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "seed": args.seed,
+        "min_time": args.min_time,
+        "min_calls": args.min_calls,
+        "scan_cache": "warm" if args.warm_scan else "cold",
+    }
+
+
+def _case_key(result: Dict[str, Any]) -> Tuple[str, str, str]:
+    return result["engine"], result["lang"], result["size"]
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: str, threshold: float) -> bool:
+    """Print p50 / throughput change per case against a baseline; True if any p50 regressed"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {_case_key(r): r for r in json.load(f)["results"]}
+
+    regressed = False
+    print(f"\nagainst {baseline_path} (regression: p50 > +{threshold:.0%})")
+    print(f"{'engine':<32} {'lang':<4} {'size':<10} {'p50 before':>11} {'p50 after':>10} {'change':>8} {'calls/s':>8}")
+    for result in results:
+        before = baseline.get(_case_key(result))
+        if before is None:
+            continue
+        change = result["p50_ms"] / before["p50_ms"] - 1.0 if before["p50_ms"] else 0.0
+        throughput = result["calls_per_s"] / before["calls_per_s"] - 1.0 if before["calls_per_s"] else 0.0
+        flag = " REGRESSED" if change > threshold else ""
+        regressed = regressed or bool(flag)
+        print(f"{result['engine']:<32} {result['lang']:<4} {result['size']:<10} {before['p50_ms']:>11} "
+              f"{result['p50_ms']:>10} {change:>+8.1%} {throughput:>+8.1%}{flag}")
+    return regressed
+
+
+def main(args) -> int:
+    if not check_scanner():
+        return 1
+    results = []
+    for lang in args.langs:
+        for size in args.sizes:
+            corpus = build_corpus(lang, size, args.seed)
+            prepared = [_prepare(text) for text in corpus]
+            for engine in args.engines:
+                results.append(run_case(engine, lang, size, prepared, args.min_time, args.min_calls, args.warm_scan))
+
+    print(f"seed={args.seed} min_time={args.min_time}s min_calls={args.min_calls} "
+          f"scan_cache={'warm' if args.warm_scan else 'cold'}")
+    print(f"{'engine':<32} {'lang':<4} {'size':<10} {'calls':>7} {'calls/s':>10} {'MB/s':>8} "
+          f"{'p50_ms':>9} {'p95_ms':>9} {'p99_ms':>9}")
+    for r in results:
+        print(f"{r['engine']:<32} {r['lang']:<4} {r['size']:<10} {r['calls']:>7} {r['calls_per_s']:>10} "
+              f"{r['mb_per_s']:>8} {r['p50_ms']:>9} {r['p95_ms']:>9} {r['p99_ms']:>9}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"meta": _metadata(args), "results": results}, f, indent=2, ensure_ascii=False)
+        print(f"\nresults written to {args.json}")
+
+    if args.compare and compare(results, args.compare, args.threshold):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Text-analysis engine throughput and latency")
+    parser.add_argument("--engines", nargs="+", choices=list(ENGINES), default=list(ENGINES))
+    parser.add_argument("--langs", nargs="+", choices=list(VOCABULARY), default=list(VOCABULARY))
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES))
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--min-time", type=float, default=1.0, help="Minimum measured seconds per case")
+    parser.add_argument("--min-calls", type=int, default=20, help="Minimum measured calls per case")
+    parser.add_argument("--warm-scan", action="store_true",
+                        help="Keep the scan cache warm (measure engines reusing a shared scan)")
+    parser.add_argument("--json", help="Write results and run metadata to this file")
+    parser.add_argument("--compare", help="Previous --json output to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="p50 slowdown counted as a regression")
+    sys.exit(main(parser.parse_args()))
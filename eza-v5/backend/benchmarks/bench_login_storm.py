@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: login storm vs. concurrent chat traffic
+
+Runs a burst of logins (authenticate_user -> bcrypt) next to a steady
+stream of chat-like requests (analyze_input + a simulated provider
+wait) on one event loop, with bcrypt either:
+
+  - inline: verify_password on the event loop (previous behaviour)
+  - pool:   verify_password_async on the bounded auth thread pool
+
+Reported per mode: chat latency percentiles, the longest event loop
+stall, and login throughput. The user lookup is served by an in-memory
+session so only the auth path itself is measured.
+
+Usage (from eza-v5/):
+    python backend/benchmarks/bench_login_storm.py --logins 40 --login-concurrency 8
+    python backend/benchmarks/bench_login_storm.py --chat-concurrency 50 --bcrypt-rounds 12
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, Any, List
+
+# Add project root (eza-v5) to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from passlib.context import CryptContext
+
+from backend.core.engines.input_analyzer import analyze_input
+from backend.core.services import auth_service
+from backend.core.utils import security
+
+CHAT_TEXT = "Can you explain how to keep my online accounts safe from phishing?"
+PASSWORD = "correct horse battery staple"
+
+
+class _UserResult:
+    def __init__(self, user):
+        self.user = user
+
+    def scalar_one_or_none(self):
+        return self.user
+
+
+class InMemorySession:
+    """Answers authenticate_user's lookup with one fixed user"""
+
+    def __init__(self, user):
+        self.user = user
+
+    async def execute(self, statement):
+        return _UserResult(self.user)
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    return ordered[max(0, int(len(ordered) * q) - 1)]
+
+
+async def _inline_verify(plain_password: str, hashed_password: str) -> bool:
+    return security.pwd_context.verify(plain_password, hashed_password)
+
+
+async def _run(mode: str, args, db: InMemorySession) -> Dict[str, Any]:
+    auth_service.verify_password_async = _inline_verify if mode == "inline" else security.verify_password_async
+
+    chat_latencies: List[float] = []
+    login_latencies: List[float] = []
+    max_stall = 0.0
+    stop = asyncio.Event()
+
+    async def watchdog():
+        # Sleeps 1ms at a time; anything longer is time the loop was blocked
+        nonlocal max_stall
+        while not stop.is_set():
+            t0 = time.perf_counter()
+            await asyncio.sleep(0.001)
+            max_stall = max(max_stall, time.perf_counter() - t0 - 0.001)
+
+    async def chat_worker():
+        while not stop.is_set():
+            t0 = time.perf_counter()
+            analyze_input(CHAT_TEXT)
+            await asyncio.sleep(args.provider_ms / 1000.0)
+            chat_latencies.append((time.perf_counter() - t0) * 1000)
+
+    login_semaphore = asyncio.Semaphore(args.login_concurrency)
+
+    async def login():
+        async with login_semaphore:
+            t0 = time.perf_counter()
+            user = await auth_service.authenticate_user(db, "bench@eza.local", PASSWORD)
+            assert user is not None
+            login_latencies.append((time.perf_counter() - t0) * 1000)
+
+    background = [asyncio.create_task(watchdog())]
+    background += [asyncio.create_task(chat_worker()) for _ in range(args.chat_concurrency)]
+    await asyncio.sleep(0.2)  # warm up chat traffic
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(args.logins)))
+    storm_seconds = time.perf_counter() - t0
+
+    stop.set()
+    await asyncio.gather(*background)
+
+    chat_latencies.sort()
+    return {
+        "mode": mode,
+        "logins_per_s": round(args.logins / storm_seconds, 1),
+        "login_p50_ms": round(statistics.median(login_latencies), 1),
+        "chat_requests": len(chat_latencies),
+        "chat_p50_ms": round(statistics.median(chat_latencies), 1),
+        "chat_p99_ms": round(_percentile(chat_latencies, 0.99), 1),
+        "chat_max_ms": round(chat_latencies[-1], 1),
+        "max_loop_stall_ms": round(max_stall * 1000, 1),
+    }
+
+
+async def main(args):
+    security.pwd_context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=args.bcrypt_rounds)
+    user = SimpleNamespace(
+        hashed_password=security.pwd_context.hash(PASSWORD),
+        is_active=True,
+    )
+    db = InMemorySession(user)
+
+    results = [await _run(mode, args, db) for mode in ("inline", "pool")]
+    security.shutdown_bcrypt_pool()
+
+    print(f"logins={args.logins} login_concurrency={args.login_concurrency} "
+          f"chat_concurrency={args.chat_concurrency} provider_ms={args.provider_ms} bcrypt_rounds={args.bcrypt_rounds}")
+    columns = ["mode", "logins_per_s", "login_p50_ms", "chat_requests", "chat_p50_ms", "chat_p99_ms",
+               "chat_max_ms", "max_loop_stall_ms"]
+    print(" ".join(f"{c:>17}" for c in columns))
+    for r in results:
+        print(" ".join(f"{r[c]:>17}" for c in columns))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Login storm vs. chat traffic (inline vs. pooled bcrypt)")
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--login-concurrency", type=int, default=8)
+    parser.add_argument("--chat-concurrency", type=int, default=20)
+    parser.add_argument("--provider-ms", type=float, default=20.0, help="Simulated LLM wait per chat request")
+    parser.add_argument("--bcrypt-rounds", type=int, default=12, help="bcrypt cost factor (passlib default: 12)")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: pooled provider clients vs. a new httpx.AsyncClient per call
+
+Runs a local OpenAI-compatible stub server and sends the same chat
+completion requests through:
+
+  - fresh:  a new httpx.AsyncClient per request (previous behaviour)
+  - pooled: generate_local_llm() using the shared provider client registry
+
+The stub counts accepted connections and can add a per-connection setup
+delay (--connect-delay-ms) to emulate the network round trips of a real
+TCP + TLS handshake. --tls serves HTTPS with a throwaway self-signed
+certificate (requires 'cryptography').
+
+Usage (from eza-v5/):
+    python backend/benchmarks/bench_provider_pool.py --requests 200 --concurrency 10
+    python backend/benchmarks/bench_provider_pool.py --tls --connect-delay-ms 30
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import ssl
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+# Add project root (eza-v5) to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import httpx
+
+from backend.config import Settings
+from backend.gateway.http_clients import init_provider_clients, close_provider_clients
+from backend.gateway.providers.local_llm_provider import generate_local_llm
+
+
+RESPONSE_BODY = json.dumps({
+    "choices": [{"message": {"role": "assistant", "content": "stub answer"}}]
+}).encode()
+
+
+class StubServer:
+    """Minimal HTTP/1.1 keep-alive server returning a fixed chat completion"""
+
+    def __init__(self, connect_delay_ms: float = 0.0, ssl_context: Optional[ssl.SSLContext] = None):
+        self.connect_delay = connect_delay_ms / 1000.0
+        self.ssl_context = ssl_context
+        self.connections = 0
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        if self.connect_delay:
+            await asyncio.sleep(self.connect_delay)
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.split(b"\r\n"):
+                    if line.lower().startswith(b"content-length:"):
+                        length = int(line.split(b":", 1)[1])
+                if length:
+                    await reader.readexactly(length)
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\n"
+                    b"Content-Type: application/json\r\n"
+                    b"Connection: keep-alive\r\n"
+                    b"Content-Length: " + str(len(RESPONSE_BODY)).encode() + b"\r\n\r\n"
+                    + RESPONSE_BODY
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self) -> str:
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0, ssl=self.ssl_context)
+        port = self.server.sockets[0].getsockname()[1]
+        scheme = "https" if self.ssl_context else "http"
+        return f"{scheme}://127.0.0.1:{port}"
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+
+def _self_signed_context(workdir: str) -> ssl.SSLContext:
+    """Create a server SSL context with a throwaway certificate for 127.0.0.1"""
+    import datetime
+    import ipaddress
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.x509.oid import NameOID
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "127.0.0.1")])
+    now = datetime.datetime.utcnow()
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(minutes=1))
+        .not_valid_after(now + datetime.timedelta(hours=1))
+        .add_extension(x509.SubjectAlternativeName([x509.IPAddress(ipaddress.ip_address("127.0.0.1"))]), critical=False)
+        .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
+        .sign(key, hashes.SHA256())
+    )
+    cert_path = os.path.join(workdir, "stub_cert.pem")
+    key_path = os.path.join(workdir, "stub_key.pem")
+    with open(cert_path, "wb") as f:
+        f.write(cert.public_bytes(serialization.Encoding.PEM))
+    with open(key_path, "wb") as f:
+        f.write(key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        ))
+
+    # httpx trusts SSL_CERT_FILE when trust_env is enabled (default)
+    os.environ["SSL_CERT_FILE"] = cert_path
+
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    context.load_cert_chain(cert_path, key_path)
+    return context
+
+
+async def _run(label: str, call, total: int, concurrency: int) -> Dict[str, Any]:
+    latencies: List[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            t0 = time.perf_counter()
+            await call()
+            latencies.append((time.perf_counter() - t0) * 1000)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - t0
+
+    latencies.sort()
+    return {
+        "mode": label,
+        "requests": total,
+        "rps": round(total / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 2),
+    }
+
+
+async def main(args):
+    workdir = tempfile.mkdtemp(prefix="eza_bench_")
+    ssl_context = _self_signed_context(workdir) if args.tls else None
+
+    stub = StubServer(args.connect_delay_ms, ssl_context)
+    base_url = await stub.start()
+    settings = Settings(LOCAL_LLM_URL=base_url)
+    payload = {"model": "local-model", "messages": [{"role": "user", "content": "hi"}], "temperature": 0.7}
+
+    async def fresh_call():
+        async with httpx.AsyncClient(timeout=120.0) as client:
+            response = await client.post(f"{base_url}/v1/chat/completions", json=payload)
+            response.raise_for_status()
+            return response.json()["choices"][0]["message"]["content"]
+
+    async def pooled_call():
+        return await generate_local_llm(prompt="hi", settings=settings)
+
+    results = []
+
+    stub.connections = 0
+    result = await _run("fresh", fresh_call, args.requests, args.concurrency)
+    result["connections"] = stub.connections
+    results.append(result)
+
+    init_provider_clients(settings)
+    stub.connections = 0
+    result = await _run("pooled", pooled_call, args.requests, args.concurrency)
+    result["connections"] = stub.connections
+    results.append(result)
+    await close_provider_clients()
+
+    await stub.stop()
+
+    print(f"stub={base_url} tls={args.tls} connect_delay_ms={args.connect_delay_ms}")
+    print(f"{'mode':<8} {'requests':>8} {'conns':>6} {'rps':>8} {'p50_ms':>8} {'p95_ms':>8}")
+    for r in results:
+        print(f"{r['mode']:<8} {r['requests']:>8} {r['connections']:>6} {r['rps']:>8} {r['p50_ms']:>8} {r['p95_ms']:>8}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pooled vs per-call provider client benchmark")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--connect-delay-ms", type=float, default=0.0,
+                        help="Delay per new connection, emulating TCP+TLS handshake round trips")
+    parser.add_argument("--tls", action="store_true", help="Serve HTTPS with a self-signed certificate")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: materialized vs. streaming report generation
+
+Feeds synthetic cases to the report code paths and records peak RSS:
+
+  - materialized: every case loaded as a full dict (with text) into a
+                  list, then generate_report (previous behaviour)
+  - stream:       report_service.stream_report over a server-side cursor
+                  (simulated: rows arrive in yield_per partitions), JSON
+                  export written to a byte counter
+
+Each (mode, size) runs in a fresh subprocess so peak RSS is not shared.
+With streaming, peak memory should stay flat as the case count grows.
+
+Usage (from eza-v5/):
+    python backend/benchmarks/bench_report_stream.py
+    python backend/benchmarks/bench_report_stream.py --sizes 100000 1000000 --text-bytes 400
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import resource
+import subprocess
+import sys
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add project root (eza-v5) to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from backend.core.engines.eza_report_engine import generate_report
+from backend.services import report_service
+
+CaseRow = namedtuple("CaseRow", ["id", "source", "risk_score", "risk_level", "created_at"])
+LEVELS = ("low", "medium", "high", "critical")
+EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _rows(count: int):
+    rng = random.Random(42)
+    for i in range(1, count + 1):
+        yield CaseRow(i, "rtuk", rng.random(), rng.choice(LEVELS), EPOCH + timedelta(seconds=i))
+
+
+class _StreamResult:
+    def __init__(self, count: int, batch_size: int):
+        self.count = count
+        self.batch_size = batch_size
+
+    async def partitions(self):
+        batch = []
+        for row in _rows(self.count):
+            batch.append(row)
+            if len(batch) == self.batch_size:
+                yield batch
+                batch = []
+                await asyncio.sleep(0)  # cursor round trip
+        if batch:
+            yield batch
+
+
+class _ScalarResult:
+    def scalars(self):
+        return []
+
+
+class CursorSession:
+    """AsyncSession stand-in: stream() yields synthetic rows in partitions"""
+
+    def __init__(self, count: int):
+        self.count = count
+
+    async def stream(self, statement):
+        batch_size = statement.get_execution_options().get("yield_per", report_service.STREAM_BATCH_SIZE)
+        return _StreamResult(self.count, batch_size)
+
+    async def execute(self, statement):
+        return _ScalarResult()
+
+
+def run_materialized(count: int, text_bytes: int) -> int:
+    text = "x" * text_bytes
+    cases = [
+        {
+            "id": row.id,
+            "text": text + str(row.id),
+            "risk_score": row.risk_score,
+            "risk_level": row.risk_level,
+            "source": row.source,
+            "metadata": {},
+            "created_at": row.created_at.isoformat()
+        }
+        for row in _rows(count)
+    ]
+    return len(json.dumps(generate_report(cases, report_type="rtuk")))
+
+
+async def run_stream(count: int) -> int:
+    written = 0
+    async for chunk in report_service.stream_report(CursorSession(count), "rtuk", "rtuk", "json"):
+        written += len(chunk)
+    return written
+
+
+def child(mode: str, count: int, text_bytes: int):
+    t0 = time.perf_counter()
+    if mode == "materialized":
+        output_bytes = run_materialized(count, text_bytes)
+    else:
+        output_bytes = asyncio.run(run_stream(count))
+    elapsed = time.perf_counter() - t0
+    print(json.dumps({
+        "mode": mode,
+        "cases": count,
+        "seconds": round(elapsed, 2),
+        "cases_per_s": round(count / elapsed),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "output_mb": round(output_bytes / 1e6, 1),
+    }))
+
+
+def main(args):
+    results = []
+    for count in args.sizes:
+        for mode in ("materialized", "stream"):
+            out = subprocess.run(
+                [sys.executable, __file__, "--child", mode, "--sizes", str(count), "--text-bytes", str(args.text_bytes)],
+                capture_output=True, text=True, check=True,
+            )
+            results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    print(f"text_bytes={args.text_bytes} batch_size={report_service.STREAM_BATCH_SIZE}")
+    print(f"{'mode':<13} {'cases':>9} {'seconds':>8} {'cases/s':>9} {'peak_rss_mb':>12} {'output_mb':>10}")
+    for r in results:
+        print(f"{r['mode']:<13} {r['cases']:>9} {r['seconds']:>8} {r['cases_per_s']:>9} "
+              f"{r['peak_rss_mb']:>12} {r['output_mb']:>10}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Materialized vs. streaming report generation")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--text-bytes", type=int, default=300, help="Case text size (materialized mode)")
+    parser.add_argument("--child", choices=["materialized", "stream"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.child, args.sizes[0], args.text_bytes)
+    else:
+        main(args)
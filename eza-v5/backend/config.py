@@ -4,7 +4,7 @@ EZA V6 - Centralized Configuration
 """
 
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, Literal, Optional
 from functools import lru_cache
 
 
@@ -31,18 +31,106 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
     
+    # Auth execution (bcrypt off the event loop, decoded JWT claims cache)
+    AUTH_BCRYPT_WORKERS: int = 4  # Threads for bcrypt (the C code releases the GIL)
+    AUTH_BCRYPT_MAX_PENDING: int = 64  # Queued + running hashes; more fail fast with 503
+    AUTH_JWT_CACHE_MAX_ENTRIES: int = 10000
+    AUTH_PRINCIPAL_CACHE_TTL_SECONDS: float = 30.0  # Bounds role/active changes on other workers
+    AUTH_PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+    
+    # API key authentication (HMAC-SHA256 fingerprints + verified-key cache)
+    API_KEY_HMAC_SECRET: Optional[str] = None  # Defaults to JWT_SECRET_KEY; changing it invalidates all keys
+    API_KEY_CACHE_TTL_SECONDS: float = 60.0  # Bounds revocation delay on other workers
+    API_KEY_CACHE_MAX_ENTRIES: int = 10000
+    API_KEY_LAST_USED_FLUSH_SECONDS: float = 30.0
+    
     # Multi-tenant
     DEFAULT_INSTITUTION_ID: Optional[int] = None
     
     # Telemetry
     ENABLE_TELEMETRY: bool = True
-    TELEMETRY_SAMPLE_RATE: float = 1.0
+    TELEMETRY_SAMPLE_RATE: float = 0.01  # Fraction of requests traced (spans, see telemetry.tracing)
+    TRACE_EXPORT_PATH: Optional[str] = None  # OTLP/JSON lines file for sampled spans
+    TRACE_FLUSH_SECONDS: float = 5.0
+    # Logging (queue-backed, see telemetry.logger)
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"  # json, text
+    LOG_QUEUE_SIZE: int = 10000  # Records beyond this are dropped, never waited for
+    LOG_DEBUG_SAMPLE_RATE: float = 0.0  # Fraction of eza.* DEBUG records kept (0: DEBUG off)
+    # Multi-worker /metrics: per-worker snapshots in a shared directory (e.g. /dev/shm/eza_metrics)
+    METRICS_MULTIPROC_DIR: Optional[str] = None
+    METRICS_SNAPSHOT_SECONDS: float = 5.0
+    # /api/proxy/internal/profiler routes (unauthenticated until require_internal checks roles)
+    PROFILER_ENABLED: bool = False
+    
+    # Audit log sink (batched multi-row INSERTs off the request path)
+    AUDIT_SINK_ENABLED: bool = True
+    AUDIT_QUEUE_SIZE: int = 10000
+    AUDIT_BATCH_SIZE: int = 500
+    AUDIT_FLUSH_INTERVAL_MS: float = 200.0
+    AUDIT_OVERFLOW_POLICY: str = "block"  # block, drop_newest, drop_oldest
+    AUDIT_ENQUEUE_TIMEOUT_MS: float = 50.0  # "block": max wait for queue space
+    AUDIT_DRAIN_TIMEOUT_SECONDS: float = 10.0
+    
+    # Risk matrix: sum the case_risk_rollup table instead of grouping all cases
+    RISK_MATRIX_USE_ROLLUP: bool = True
+    
+    # Bulk case ingestion
+    CASE_BULK_CHUNK_SIZE: int = 500  # Cases per scoring batch / transaction
+    CASE_BULK_MAX_ITEMS: int = 10000  # Per JSON request (NDJSON is unbounded)
+    CASE_SCORING_WORKERS: int = 2  # Risk scoring processes; 0 scores in the event loop
+    
+    # PDF reports: rendered in a process pool, cached on disk by content key
+    REPORT_PDF_WORKERS: int = 2
+    REPORT_CACHE_DIR: Optional[str] = None  # default: <tmp>/eza_reports
+    REPORT_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
     
     # Gateway
     DEFAULT_LLM_PROVIDER: str = "openai"  # openai, anthropic, local
     FALLBACK_LLM_PROVIDER: str = "openai"
     LLM_MODEL: str = "gpt-4o-mini"  # Default model for LLM calls
     
+    # Gateway HTTP connection pools (one pooled client per provider)
+    LLM_HTTP_MAX_CONNECTIONS: int = 100
+    LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    LLM_HTTP_KEEPALIVE_EXPIRY: float = 30.0  # seconds
+    LLM_HTTP2: bool = False  # Requires optional 'h2' package
+    
+    # Per-provider circuit breaker and adaptive (AIMD) concurrency limit
+    LLM_BREAKER_FAILURE_THRESHOLD: int = 5  # Consecutive provider failures
+    LLM_BREAKER_OPEN_SECONDS: float = 30.0
+    LLM_LIMIT_INITIAL: int = 20
+    LLM_LIMIT_MIN: int = 2
+    LLM_LIMIT_MAX: int = 100
+    LLM_LIMIT_SLOW_CALL_MS: float = 15000.0  # Slower calls count as congestion
+    
+    # Hedged LLM requests (second request after the primary's p95 latency)
+    LLM_HEDGING_ENABLED: bool = False
+    LLM_HEDGE_MAX_RATIO: float = 0.05  # Max fraction of calls that may hedge
+    LLM_HEDGE_DEFAULT_DELAY_MS: float = 2000.0  # Until enough latency samples exist
+    LLM_HEDGE_MIN_DELAY_MS: float = 50.0
+    
+    # LLM response cache (memory LRU + Redis, optional near-duplicate tier)
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_TTL_SECONDS: int = 600
+    LLM_CACHE_MAX_ENTRIES: int = 5000
+    LLM_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    LLM_CACHE_REDIS: bool = True
+    LLM_CACHE_NEAR_DUPLICATES: bool = False
+    LLM_CACHE_NEAR_MAX_DISTANCE: int = 3  # SimHash bits (max 3)
+    
+    # Request rate limits ("<requests>/<seconds>", GCRA: bursts up to <requests>)
+    RATE_LIMIT_BACKEND: str = "memory"  # memory, redis (shared across workers)
+    RATE_LIMIT_IP: str = "5/3"  # Anonymous clients, per IP
+    RATE_LIMIT_API_KEY: str = "30/3"  # Per API key
+    RATE_LIMIT_TENANT: str = "100/3"  # Per institution, all its clients together
+    RATE_LIMIT_TENANT_OVERRIDES: Dict[str, str] = {}  # institution_id -> "<requests>/<seconds>"
+    
+    # Pre-LLM early decision per endpoint (early_decision.EARLY_DECISION_POLICIES)
+    EARLY_DECISION_STANDALONE: Literal["off", "exact", "threshold"] = "exact"
+    EARLY_DECISION_PROXY: Literal["off", "exact", "threshold"] = "off"  # Internal lab: always see raw model output
+    EARLY_DECISION_RISK_THRESHOLD: float = 0.7  # Used by the "threshold" policy
+    
     # Regulation
     DEFAULT_POLICY_PACK: str = "eu_ai"  # rtuk, btk, eu_ai, oecd
     
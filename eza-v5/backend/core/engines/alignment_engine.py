@@ -5,8 +5,10 @@ Checks if output aligns with input intent and ethical guidelines
 """
 
 from typing import Dict, Any
+from backend.telemetry.tracing import traced
 
 
+@traced("engine.compute_alignment")
 def compute_alignment(
     input_analysis: Dict[str, Any],
     output_analysis: Dict[str, Any]
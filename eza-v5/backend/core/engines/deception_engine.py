@@ -5,9 +5,20 @@ Detects deception and manipulation patterns
 """
 
 from typing import Dict, Any, List
-import re
+from backend.core.engines.scanner import scan_text
+from backend.telemetry.tracing import traced
 
 
+# Deception categories (see scanner.WORD_CATEGORIES)
+DECEPTION_CATEGORIES = [
+    "false_urgency",
+    "authority_claim",
+    "emotional_manipulation",
+    "withholding_info",
+]
+
+
+@traced("engine.analyze_deception")
 def analyze_deception(
     text: str,
     report: Dict[str, Any],
@@ -21,17 +32,10 @@ def analyze_deception(
     score = 0.0
     
     # Deception patterns
-    deception_patterns = {
-        "false_urgency": r"\b(urgent|immediately|now|limited.time)\b",
-        "authority_claim": r"\b(official|government|verified|certified)\b",
-        "emotional_manipulation": r"\b(you.must|you.should|everyone.is)\b",
-        "withholding_info": r"\b(secret|confidential|don't.tell)\b"
-    }
-    
-    text_lower = text.lower()
+    scan = scan_text(text)
     
-    for pattern_name, pattern in deception_patterns.items():
-        matches = len(re.findall(pattern, text_lower, re.IGNORECASE))
+    for pattern_name in DECEPTION_CATEGORIES:
+        matches = scan.count(f"deception.{pattern_name}")
         if matches > 0:
             flags.append(pattern_name)
             score += matches * 0.2
@@ -5,8 +5,10 @@ Detects conversation drift and risk escalation
 """
 
 from typing import Dict, Any, List, Optional
+from backend.telemetry.tracing import traced
 
 
+@traced("engine.detect_drift")
 def detect_drift(
     current_analysis: Dict[str, Any],
     history: Optional[List[Dict[str, Any]]] = None
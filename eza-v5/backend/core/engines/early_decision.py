@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+Early Decision Engine (Pre-LLM short-circuit)
+Decides from the input analysis alone whether the LLM call can be skipped
+
+Policies (configured per endpoint in Settings):
+- "off":       always call the LLM
+- "exact":     skip only when no possible output can change the verdict.
+               safe_rewrite is probed with the most favourable output (no
+               risk at all); output risk only ever makes the verdict
+               stricter, so if even that output is rewritten, every output is.
+- "threshold": additionally skip when the input risk score reaches
+               EARLY_DECISION_RISK_THRESHOLD (stricter than the full
+               pipeline: inputs that could still pass are blocked too)
+"""
+
+from typing import Dict, Any, Optional
+from backend.core.engines.alignment_engine import compute_alignment
+from backend.core.engines.safe_rewrite import safe_rewrite
+from backend.telemetry.tracing import traced
+
+
+EARLY_DECISION_POLICIES = ("off", "exact", "threshold")
+
+# Placeholder answer used to probe safe_rewrite (never returned)
+_PROBE_OUTPUT = "\x00eza-early-decision-probe\x00"
+
+# Analysis of an output without any risk signal
+_CLEAN_OUTPUT_ANALYSIS: Dict[str, Any] = {
+    "ok": True,
+    "risk_score": 0.0,
+    "risk_level": "low",
+    "risk_flags": [],
+    "quality_score": 100.0,
+    "output_length": 0,
+}
+
+
+@traced("engine.early_decision")
+def early_decision(
+    user_message: str,
+    input_analysis: Dict[str, Any],
+    policy: str = "exact",
+    risk_threshold: float = 0.7,
+) -> Optional[Dict[str, Any]]:
+    """
+    Pre-LLM decision for one request
+
+    Returns None if the LLM must be called, otherwise the final decision:
+    safe_output (the SafeRewrite answer), reason, and the alignment it
+    was computed with.
+    """
+    if policy not in EARLY_DECISION_POLICIES:
+        raise ValueError(f"Unknown early decision policy: {policy!r}")
+    if policy == "off":
+        return None
+
+    alignment = compute_alignment(input_analysis, _CLEAN_OUTPUT_ANALYSIS)
+    safe_output = safe_rewrite(
+        user_message=user_message,
+        llm_output=_PROBE_OUTPUT,
+        input_analysis=input_analysis,
+        output_analysis=_CLEAN_OUTPUT_ANALYSIS,
+        alignment=alignment,
+    )
+    if safe_output != _PROBE_OUTPUT:
+        reason = "verdict_independent_of_output"
+    elif policy == "threshold" and input_analysis.get("risk_score", 0.0) >= risk_threshold:
+        # Any risk flag makes safe_rewrite return its fallback
+        safe_output = safe_rewrite(
+            user_message=user_message,
+            llm_output=_PROBE_OUTPUT,
+            input_analysis=input_analysis,
+            output_analysis={**_CLEAN_OUTPUT_ANALYSIS, "risk_flags": ["input_risk_threshold"]},
+            alignment=alignment,
+        )
+        reason = "input_risk_threshold"
+    else:
+        return None
+
+    return {
+        "skipped_llm": True,
+        "policy": policy,
+        "reason": reason,
+        "safe_output": safe_output,
+        "alignment": alignment,
+        "input_risk_score": input_analysis.get("risk_score", 0.0),
+    }
@@ -4,13 +4,108 @@ EZA Report Engine
 Generates PDF/JSON reports from analysis data
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Iterable
 from datetime import datetime
 import json
+from backend.telemetry.tracing import traced
 
 
+# Report content limits
+TOP_HIGH_RISK_CASES = 10
+CASE_SUMMARY_LIMIT = 50
+HIGH_RISK_SCORE = 0.7
+MEDIUM_RISK_SCORE = 0.4
+
+
+class ReportAccumulator:
+    """
+    Single-pass report statistics with bounded memory.
+    Cases are fed one at a time (e.g. from a server-side cursor); only
+    the counters, the first TOP_HIGH_RISK_CASES high-risk cases and the
+    first CASE_SUMMARY_LIMIT summaries are kept.
+    """
+
+    def __init__(self):
+        self.total_cases = 0
+        self.high_risk_count = 0
+        self.medium_risk_count = 0
+        self.low_risk_count = 0
+        self.risk_sum = 0.0
+        self.sources: Dict[str, int] = {}
+        self.high_risk_cases: List[Dict[str, Any]] = []
+        self.case_summary: List[Dict[str, Any]] = []
+
+    def add(self, case: Dict[str, Any]):
+        risk_score = case.get("risk_score", 0.0)
+        self.total_cases += 1
+        self.risk_sum += risk_score
+
+        if risk_score >= HIGH_RISK_SCORE:
+            self.high_risk_count += 1
+            if len(self.high_risk_cases) < TOP_HIGH_RISK_CASES:
+                self.high_risk_cases.append(case)
+        elif risk_score >= MEDIUM_RISK_SCORE:
+            self.medium_risk_count += 1
+        else:
+            self.low_risk_count += 1
+
+        source = case.get("source", "unknown")
+        self.sources[source] = self.sources.get(source, 0) + 1
+
+        if len(self.case_summary) < CASE_SUMMARY_LIMIT:
+            self.case_summary.append({
+                "id": case.get("id"),
+                "source": case.get("source"),
+                "risk_score": case.get("risk_score"),
+                "risk_level": case.get("risk_level"),
+                "created_at": case.get("created_at")
+            })
+
+    def metadata(self, report_type: str, format: str) -> Dict[str, Any]:
+        avg_risk = self.risk_sum / self.total_cases if self.total_cases > 0 else 0.0
+        return {
+            "report_type": report_type,
+            "generated_at": datetime.utcnow().isoformat(),
+            "total_cases": self.total_cases,
+            "statistics": {
+                "high_risk_count": self.high_risk_count,
+                "medium_risk_count": self.medium_risk_count,
+                "low_risk_count": self.low_risk_count,
+                "average_risk_score": round(avg_risk, 3),
+                "sources": dict(self.sources)
+            },
+            "format": format
+        }
+
+    def content(self, report_type: str) -> Dict[str, Any]:
+        return {
+            "summary": f"Regulatory compliance report for {report_type.upper()}. "
+                       f"Total cases analyzed: {self.total_cases}. "
+                       f"High risk cases: {self.high_risk_count}, "
+                       f"Medium risk: {self.medium_risk_count}, "
+                       f"Low risk: {self.low_risk_count}.",
+            "recommendations": _generate_recommendations(self.high_risk_count, self.total_cases, report_type),
+            "high_risk_cases": self.high_risk_cases,  # First 10 high risk cases
+            "case_summary": self.case_summary  # First 50 cases summary
+        }
+
+    def report(self, report_type: str = "rtuk", format: str = "json") -> Dict[str, Any]:
+        report = {
+            "metadata": self.metadata(report_type, format),
+            "content": self.content(report_type)
+        }
+        
+        # If PDF format requested, return JSON with PDF flag (actual PDF generation would require additional library)
+        if format == "pdf":
+            report["metadata"]["pdf_available"] = False
+            report["metadata"]["note"] = "PDF generation requires additional setup. Returning JSON format."
+        
+        return report
+
+
+@traced("engine.generate_report")
 def generate_report(
-    cases: List[Dict[str, Any]],
+    cases: Iterable[Dict[str, Any]],
     report_type: str = "rtuk",
     format: str = "json"
 ) -> Dict[str, Any]:
@@ -18,85 +113,23 @@ def generate_report(
     Generate regulatory report from cases
     
     Args:
-        cases: List of case dictionaries
+        cases: Case dictionaries (any iterable, consumed once)
         report_type: Type of report (rtuk, btk, eu_ai, etc.)
         format: Output format (json or pdf)
     
     Returns:
         Report dictionary with metadata and data
     """
-    # Calculate statistics
-    total_cases = len(cases)
-    high_risk_cases = [c for c in cases if c.get("risk_score", 0.0) >= 0.7]
-    medium_risk_cases = [c for c in cases if 0.4 <= c.get("risk_score", 0.0) < 0.7]
-    low_risk_cases = [c for c in cases if c.get("risk_score", 0.0) < 0.4]
-    
-    # Calculate average risk score
-    avg_risk = sum(c.get("risk_score", 0.0) for c in cases) / total_cases if total_cases > 0 else 0.0
-    
-    # Group by source
-    sources = {}
+    accumulator = ReportAccumulator()
     for case in cases:
-        source = case.get("source", "unknown")
-        if source not in sources:
-            sources[source] = 0
-        sources[source] += 1
-    
-    # Generate report metadata
-    report_metadata = {
-        "report_type": report_type,
-        "generated_at": datetime.utcnow().isoformat(),
-        "total_cases": total_cases,
-        "statistics": {
-            "high_risk_count": len(high_risk_cases),
-            "medium_risk_count": len(medium_risk_cases),
-            "low_risk_count": len(low_risk_cases),
-            "average_risk_score": round(avg_risk, 3),
-            "sources": sources
-        },
-        "format": format
-    }
-    
-    # Generate report content
-    report_content = {
-        "summary": f"Regulatory compliance report for {report_type.upper()}. "
-                   f"Total cases analyzed: {total_cases}. "
-                   f"High risk cases: {len(high_risk_cases)}, "
-                   f"Medium risk: {len(medium_risk_cases)}, "
-                   f"Low risk: {len(low_risk_cases)}.",
-        "recommendations": _generate_recommendations(cases, report_type),
-        "high_risk_cases": high_risk_cases[:10],  # Top 10 high risk cases
-        "case_summary": [
-            {
-                "id": c.get("id"),
-                "source": c.get("source"),
-                "risk_score": c.get("risk_score"),
-                "risk_level": c.get("risk_level"),
-                "created_at": c.get("created_at")
-            }
-            for c in cases[:50]  # First 50 cases summary
-        ]
-    }
-    
-    report = {
-        "metadata": report_metadata,
-        "content": report_content
-    }
-    
-    # If PDF format requested, return JSON with PDF flag (actual PDF generation would require additional library)
-    if format == "pdf":
-        report["metadata"]["pdf_available"] = False
-        report["metadata"]["note"] = "PDF generation requires additional setup. Returning JSON format."
-    
-    return report
+        accumulator.add(case)
+    return accumulator.report(report_type, format)
 
 
-def _generate_recommendations(cases: List[Dict[str, Any]], report_type: str) -> List[str]:
+def _generate_recommendations(high_risk_count: int, total_cases: int, report_type: str) -> List[str]:
     """Generate recommendations based on case analysis"""
     recommendations = []
     
-    high_risk_count = len([c for c in cases if c.get("risk_score", 0.0) >= 0.7])
-    
     if high_risk_count > 0:
         recommendations.append(
             f"Immediate action required: {high_risk_count} high-risk cases detected. "
@@ -119,7 +152,7 @@ def _generate_recommendations(cases: List[Dict[str, Any]], report_type: str) ->
             "Document risk profiles for all registered models."
         )
     
-    if len(cases) > 100:
+    if total_cases > 100:
         recommendations.append(
             "Consider implementing automated risk detection and filtering "
             "to handle high case volumes more efficiently."
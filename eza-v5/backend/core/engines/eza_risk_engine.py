@@ -4,12 +4,14 @@ EZA Risk Engine
 Computes risk matrix (3x3 heatmap) from cases
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple, Iterable
 from backend.core.engines.input_analyzer import analyze_input
 from backend.core.engines.output_analyzer import analyze_output
 from backend.core.engines.alignment_engine import compute_alignment
+from backend.telemetry.tracing import traced
 
 
+@traced("engine.compute_risk")
 def compute_risk(text: str, output_text: str = None) -> Dict[str, Any]:
     """
     Compute risk score for a given text
@@ -36,25 +38,72 @@ def compute_risk(text: str, output_text: str = None) -> Dict[str, Any]:
             1.0 - (alignment.get("alignment_score", 100.0) / 100.0)
         )
     
-    # Determine risk level
-    if risk_score >= 0.8:
-        risk_level = "critical"
-    elif risk_score >= 0.6:
-        risk_level = "high"
-    elif risk_score >= 0.4:
-        risk_level = "medium"
-    else:
-        risk_level = "low"
-    
     return {
         "risk_score": risk_score,
-        "risk_level": risk_level,
+        "risk_level": risk_level_for_score(risk_score),
         "input_analysis": input_analysis,
         "output_analysis": output_analysis if output_text else None,
         "alignment": alignment if output_text else None
     }
 
 
+def risk_level_for_score(risk_score: float) -> str:
+    """Case risk level for a risk score"""
+    if risk_score >= 0.8:
+        return "critical"
+    if risk_score >= 0.6:
+        return "high"
+    if risk_score >= 0.4:
+        return "medium"
+    return "low"
+
+
+@traced("engine.compute_risk_many")
+def compute_risk_many(texts: Iterable[str]) -> List[Dict[str, Any]]:
+    """
+    Batch version of compute_risk (input analysis only) for bulk ingestion
+    
+    Returns one compact result per text, in order: {"risk_score",
+    "risk_level"}, or {"error"} if that text could not be analyzed.
+    Module-level and returning plain dicts, so a chunk can be scored in a
+    worker process with little pickling.
+    """
+    results = []
+    for text in texts:
+        try:
+            risk_score = analyze_input(text).get("risk_score", 0.0)
+            results.append({"risk_score": risk_score, "risk_level": risk_level_for_score(risk_score)})
+        except Exception as e:
+            results.append({"error": f"Risk analysis failed: {e}"})
+    return results
+
+
+# Risk matrix axes
+MATRIX_LEVELS = ("low", "medium", "high")
+SEVERITY_HIGH_SCORE = 0.7
+SEVERITY_MEDIUM_SCORE = 0.4
+LIKELIHOOD_HIGH_LEVELS = ("critical", "high")
+LIKELIHOOD_MEDIUM_LEVELS = ("medium",)
+
+
+def matrix_severity(risk_score: float) -> str:
+    """Matrix row (severity) for a risk score"""
+    if risk_score >= SEVERITY_HIGH_SCORE:
+        return "high"
+    if risk_score >= SEVERITY_MEDIUM_SCORE:
+        return "medium"
+    return "low"
+
+
+def matrix_likelihood(risk_level: str) -> str:
+    """Matrix column (likelihood/frequency) for a case risk level"""
+    if risk_level in LIKELIHOOD_HIGH_LEVELS:
+        return "high"
+    if risk_level in LIKELIHOOD_MEDIUM_LEVELS:
+        return "medium"
+    return "low"
+
+
 def compute_risk_matrix(cases: List[Dict[str, Any]]) -> Dict[str, Any]:
     """
     Compute 3x3 risk matrix heatmap from cases
@@ -66,44 +115,34 @@ def compute_risk_matrix(cases: List[Dict[str, Any]]) -> Dict[str, Any]:
     Returns:
         3x3 matrix with counts and percentages
     """
-    # Initialize 3x3 matrix
-    matrix = {
-        "low": {"low": 0, "medium": 0, "high": 0},
-        "medium": {"low": 0, "medium": 0, "high": 0},
-        "high": {"low": 0, "medium": 0, "high": 0}
-    }
-    
-    # Categorize cases by risk score
+    counts: Dict[Tuple[str, str], int] = {}
     for case in cases:
-        risk_score = case.get("risk_score", 0.0)
-        
-        # Determine row (severity)
-        if risk_score >= 0.7:
-            row = "high"
-        elif risk_score >= 0.4:
-            row = "medium"
-        else:
-            row = "low"
-        
-        # Determine column (likelihood/frequency)
-        # For now, use risk_level from case or derive from score
-        risk_level = case.get("risk_level", "low")
-        if risk_level in ["critical", "high"]:
-            col = "high"
-        elif risk_level == "medium":
-            col = "medium"
-        else:
-            col = "low"
-        
-        matrix[row][col] += 1
+        cell = (matrix_severity(case.get("risk_score", 0.0)), matrix_likelihood(case.get("risk_level", "low")))
+        counts[cell] = counts.get(cell, 0) + 1
+    return risk_matrix_from_counts(counts)
+
+
+def risk_matrix_from_counts(counts: Dict[Tuple[str, str], int]) -> Dict[str, Any]:
+    """
+    Build the risk matrix response from per-cell counts
+    
+    Args:
+        counts: {(severity, likelihood): count}, e.g. from a SQL GROUP BY
+    
+    Returns:
+        3x3 matrix with counts and percentages
+    """
+    matrix = {row: {col: 0 for col in MATRIX_LEVELS} for row in MATRIX_LEVELS}
+    for (row, col), count in counts.items():
+        matrix[row][col] += int(count)
     
     # Calculate totals and percentages
     total = sum(sum(row.values()) for row in matrix.values())
     
     matrix_data = []
-    for row_key in ["low", "medium", "high"]:
+    for row_key in MATRIX_LEVELS:
         row_data = []
-        for col_key in ["low", "medium", "high"]:
+        for col_key in MATRIX_LEVELS:
             count = matrix[row_key][col_key]
             percentage = (count / total * 100) if total > 0 else 0
             row_data.append({
@@ -118,15 +157,8 @@ def compute_risk_matrix(cases: List[Dict[str, Any]]) -> Dict[str, Any]:
         "matrix": matrix_data,
         "total_cases": total,
         "summary": {
-            "low_low": matrix["low"]["low"],
-            "low_medium": matrix["low"]["medium"],
-            "low_high": matrix["low"]["high"],
-            "medium_low": matrix["medium"]["low"],
-            "medium_medium": matrix["medium"]["medium"],
-            "medium_high": matrix["medium"]["high"],
-            "high_low": matrix["high"]["low"],
-            "high_medium": matrix["high"]["medium"],
-            "high_high": matrix["high"]["high"]
+            f"{row_key}_{col_key}": matrix[row_key][col_key]
+            for row_key in MATRIX_LEVELS
+            for col_key in MATRIX_LEVELS
         }
     }
-
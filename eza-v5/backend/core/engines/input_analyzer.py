@@ -4,9 +4,20 @@ Input Analyzer Engine (Light version for Fast Pipeline)
 """
 
 from typing import Dict, Any, List
-import re
+from backend.core.engines.scanner import scan_text
+from backend.telemetry.tracing import traced
 
 
+# Risk categories (see scanner.WORD_CATEGORIES) and their scores
+RISK_SCORES = {
+    "violence": 0.7,
+    "illegal": 0.6,
+    "harmful": 0.8,
+    "manipulation": 0.5,
+}
+
+
+@traced("engine.analyze_input")
 def analyze_input(text: str) -> Dict[str, Any]:
     """
     Light input analysis for Fast Core Pipeline
@@ -15,28 +26,21 @@ def analyze_input(text: str) -> Dict[str, Any]:
     risk_flags: List[str] = []
     risk_score = 0.0
     
-    # Basic risk patterns (lightweight)
-    risk_patterns = {
-        "violence": [r"\b(kill|murder|harm|attack|violence)\b", 0.7],
-        "illegal": [r"\b(illegal|drug|weapon|hack|steal)\b", 0.6],
-        "harmful": [r"\b(suicide|self.harm|dangerous)\b", 0.8],
-        "manipulation": [r"\b(manipulate|trick|deceive|scam)\b", 0.5],
-    }
-    
-    text_lower = text.lower()
+    # Shared single-pass scan (cached per text)
+    scan = scan_text(text)
     
-    for pattern_name, (pattern, score) in risk_patterns.items():
-        if re.search(pattern, text_lower, re.IGNORECASE):
+    for pattern_name, score in RISK_SCORES.items():
+        if scan.has(f"risk.{pattern_name}"):
             risk_flags.append(pattern_name)
             risk_score = max(risk_score, score)
     
     # Intent detection (simplified)
     intent = "information"
-    if any(word in text_lower for word in ["hello", "hi", "greeting"]):
+    if scan.has("intent.greeting"):
         intent = "greeting"
-    elif any(word in text_lower for word in ["how", "what", "why", "explain"]):
+    elif scan.has("intent.question"):
         intent = "question"
-    elif any(word in text_lower for word in ["create", "make", "generate", "write"]):
+    elif scan.has("intent.generation"):
         intent = "generation"
     
     return {
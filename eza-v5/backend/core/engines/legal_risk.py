@@ -5,9 +5,15 @@ Analyzes legal compliance risks
 """
 
 from typing import Dict, Any, List
-import re
+from backend.core.engines.scanner import scan_text
+from backend.telemetry.tracing import traced
 
 
+# Legal categories (see scanner.WORD_CATEGORIES)
+LEGAL_CATEGORIES = ["copyright", "privacy", "defamation", "fraud"]
+
+
+@traced("engine.analyze_legal_risk")
 def analyze_legal_risk(
     input_analysis: Dict[str, Any],
     output_analysis: Dict[str, Any],
@@ -20,37 +26,24 @@ def analyze_legal_risk(
     risk_categories = []
     risk_score = 0.0
     
-    # Check for illegal content patterns
-    illegal_patterns = {
-        "copyright": r"\b(copyright|pirate|illegal.download)\b",
-        "privacy": r"\b(personal.data|gdpr|privacy.violation)\b",
-        "defamation": r"\b(defame|slander|libel)\b",
-        "fraud": r"\b(fraud|scam|phishing)\b"
-    }
-    
     input_text = report.get("input", {}).get("raw_text", "")
     output_text = report.get("output", {}).get("raw_text", "")
     
-    combined_text = (input_text + " " + output_text).lower()
+    # Input and output are scanned separately so the cached scans from
+    # the input/output analyzers are reused
+    scans = [scan_text(input_text), scan_text(output_text)]
     
-    for category, pattern in illegal_patterns.items():
-        if re.search(pattern, combined_text, re.IGNORECASE):
+    # Check for illegal content patterns
+    for category in LEGAL_CATEGORIES:
+        if any(scan.has(f"legal.{category}") for scan in scans):
             risk_categories.append(category)
             risk_score = max(risk_score, 0.5)
     
     # Check for personal data exposure
     # Simplified check - in production, use proper PII detection
-    pii_patterns = [
-        r"\b\d{4}[\s-]?\d{4}[\s-]?\d{4}[\s-]?\d{4}\b",  # Credit card
-        r"\b\d{3}-\d{2}-\d{4}\b",  # SSN
-        r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b"  # Email
-    ]
-    
-    for pattern in pii_patterns:
-        if re.search(pattern, combined_text):
-            risk_categories.append("pii_exposure")
-            risk_score = max(risk_score, 0.7)
-            break
+    if any(scan.has("legal.pii_exposure") for scan in scans):
+        risk_categories.append("pii_exposure")
+        risk_score = max(risk_score, 0.7)
     
     return {
         "ok": True,
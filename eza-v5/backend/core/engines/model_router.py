@@ -39,16 +39,32 @@ bu dosyanın içine genişletilerek eklenecek.
 
 from __future__ import annotations
 
+import asyncio
+import logging
 import os
 import time
-from typing import Literal, Optional, Dict, Any
+from contextlib import aclosing
+from typing import Literal, Optional, Dict, Any, AsyncIterator, Awaitable, Callable
 
 import httpx
 
 from backend.core.utils.telemetry import log_llm_call
 from backend.config import get_settings
 from backend.gateway.router_adapter import call_llm_provider as gateway_call_llm
+from backend.gateway.router_adapter import call_llm_hedged as gateway_call_llm_hedged
+from backend.gateway.router_adapter import stream_llm_provider as gateway_stream_llm
 from backend.gateway.error_mapping import LLMProviderError as GatewayLLMProviderError
+from backend.gateway.http_clients import get_provider_client
+from backend.core.utils.response_cache import (
+    ResponseCache,
+    get_response_cache,
+    make_cache_key,
+    normalize_prompt,
+)
+from backend.telemetry.metrics import increment_metric
+from backend.telemetry.tracing import traced
+
+logger = logging.getLogger("eza.model_router")
 
 
 # ---------------------------------------------------------------------------
@@ -133,123 +149,123 @@ async def _call_openai_chat(
     error_msg = None
     
     try:
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            resp = await client.post(
-                OPENAI_BASE_URL,
-                headers=headers,
-                json=payload,
+        client = get_provider_client("openai")
+        resp = await client.post(
+            OPENAI_BASE_URL,
+            headers=headers,
+            json=payload,
+            timeout=timeout,
+        )
+        
+        # Calculate duration
+        duration_ms = (time.perf_counter() - t0) * 1000
+        
+        # Handle HTTP errors
+        if resp.status_code >= 500:
+            # Server errors - retryable
+            error_msg = f"Server error: {resp.status_code}"
+            log_llm_call(
+                provider="openai",
+                model=LLM_MODEL,
+                duration_ms=duration_ms,
+                ok=False,
+                error=error_msg,
+                mode=mode
             )
-            
-            # Calculate duration
-            duration_ms = (time.perf_counter() - t0) * 1000
-            
-            # Handle HTTP errors
-            if resp.status_code >= 500:
-                # Server errors - retryable
-                error_msg = f"Server error: {resp.status_code}"
-                log_llm_call(
-                    provider="openai",
-                    model=LLM_MODEL,
-                    duration_ms=duration_ms,
-                    ok=False,
-                    error=error_msg,
-                    mode=mode
-                )
-                raise LLMProviderError(
-                    provider="openai",
-                    message=f"OpenAI server error: {resp.status_code}",
-                    is_retryable=True
-                )
-            
-            elif resp.status_code == 429:
-                # Rate limit - retryable
-                error_msg = "Rate limit exceeded"
-                log_llm_call(
-                    provider="openai",
-                    model=LLM_MODEL,
-                    duration_ms=duration_ms,
-                    ok=False,
-                    error=error_msg,
-                    mode=mode
-                )
-                raise LLMProviderError(
-                    provider="openai",
-                    message="Rate limit exceeded. Please retry later.",
-                    is_retryable=True
-                )
-            
-            elif resp.status_code in (401, 403):
-                # Auth/config errors - not retryable
-                error_msg = f"Authentication error: {resp.status_code}"
-                log_llm_call(
-                    provider="openai",
-                    model=LLM_MODEL,
-                    duration_ms=duration_ms,
-                    ok=False,
-                    error=error_msg,
-                    mode=mode
-                )
-                raise LLMProviderError(
-                    provider="openai",
-                    message="Authentication or configuration error. Check API key.",
-                    is_retryable=False
-                )
-            
-            elif resp.status_code >= 400:
-                # Other client errors - not retryable
-                error_msg = f"Client error: {resp.status_code}"
-                try:
-                    error_data = resp.json()
-                    error_detail = error_data.get("error", {}).get("message", "Unknown error")
-                except:
-                    error_detail = resp.text[:200]
-                
-                log_llm_call(
-                    provider="openai",
-                    model=LLM_MODEL,
-                    duration_ms=duration_ms,
-                    ok=False,
-                    error=error_msg,
-                    mode=mode
-                )
-                raise LLMProviderError(
-                    provider="openai",
-                    message=f"Client error: {error_detail}",
-                    is_retryable=False
-                )
-            
-            # Success - parse response
-            resp.raise_for_status()
-            data = resp.json()
-            
-            # Log successful call
+            raise LLMProviderError(
+                provider="openai",
+                message=f"OpenAI server error: {resp.status_code}",
+                is_retryable=True
+            )
+        
+        elif resp.status_code == 429:
+            # Rate limit - retryable
+            error_msg = "Rate limit exceeded"
             log_llm_call(
                 provider="openai",
                 model=LLM_MODEL,
                 duration_ms=duration_ms,
-                ok=True,
-                error=None,
+                ok=False,
+                error=error_msg,
                 mode=mode
             )
+            raise LLMProviderError(
+                provider="openai",
+                message="Rate limit exceeded. Please retry later.",
+                is_retryable=True
+            )
+        
+        elif resp.status_code in (401, 403):
+            # Auth/config errors - not retryable
+            error_msg = f"Authentication error: {resp.status_code}"
+            log_llm_call(
+                provider="openai",
+                model=LLM_MODEL,
+                duration_ms=duration_ms,
+                ok=False,
+                error=error_msg,
+                mode=mode
+            )
+            raise LLMProviderError(
+                provider="openai",
+                message="Authentication or configuration error. Check API key.",
+                is_retryable=False
+            )
+        
+        elif resp.status_code >= 400:
+            # Other client errors - not retryable
+            error_msg = f"Client error: {resp.status_code}"
+            try:
+                error_data = resp.json()
+                error_detail = error_data.get("error", {}).get("message", "Unknown error")
+            except:
+                error_detail = resp.text[:200]
             
-            # Extract response content
-            if "choices" not in data or len(data["choices"]) == 0:
-                error_msg = "No choices in response"
-                log_llm_call(
-                    provider="openai",
-                    model=LLM_MODEL,
-                    duration_ms=duration_ms,
-                    ok=False,
-                    error=error_msg,
-                    mode=mode
-                )
-                raise LLMProviderError(
-                    provider="openai",
-                    message="No response choices from OpenAI",
-                    is_retryable=True
-                )
-            
-            return data["choices"][0]["message"]["content"]
+            log_llm_call(
+                provider="openai",
+                model=LLM_MODEL,
+                duration_ms=duration_ms,
+                ok=False,
+                error=error_msg,
+                mode=mode
+            )
+            raise LLMProviderError(
+                provider="openai",
+                message=f"Client error: {error_detail}",
+                is_retryable=False
+            )
+        
+        # Success - parse response
+        resp.raise_for_status()
+        data = resp.json()
+        
+        # Extract response content
+        if "choices" not in data or len(data["choices"]) == 0:
+            error_msg = "No choices in response"
+            log_llm_call(
+                provider="openai",
+                model=LLM_MODEL,
+                duration_ms=duration_ms,
+                ok=False,
+                error=error_msg,
+                mode=mode
+            )
+            raise LLMProviderError(
+                provider="openai",
+                message="No response choices from OpenAI",
+                is_retryable=True
+            )
+        
+        # Log successful call (only once the response is known to be usable)
+        log_llm_call(
+            provider="openai",
+            model=LLM_MODEL,
+            duration_ms=duration_ms,
+            ok=True,
+            error=None,
+            mode=mode
+        )
+        return data["choices"][0]["message"]["content"]
     
     except httpx.TimeoutException as e:
         duration_ms = (time.perf_counter() - t0) * 1000
@@ -308,10 +324,88 @@ async def _call_openai_chat(
         ) from e
 
 
+# ---------------------------------------------------------------------------
+# SINGLE-FLIGHT (request coalescing)
+# ---------------------------------------------------------------------------
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into one shared task.
+
+    The shared call runs as its own task and each caller awaits it through
+    asyncio.shield, so a caller being cancelled (client disconnect) does
+    not cancel the call for the others. Only when every waiter is gone is
+    the shared call cancelled, since nobody needs its result anymore.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._waiters: Dict[str, int] = {}
+        self.calls = 0
+        self.coalesced = 0
+        self.cancelled = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        joined = task is not None
+        if task is None:
+            task = asyncio.create_task(fn())
+            self._inflight[key] = task
+            self._waiters[key] = 0
+            task.add_done_callback(lambda t: self._done(key, t))
+            self.calls += 1
+        else:
+            self.coalesced += 1
+        # Counted before any await, so the key cannot be dropped under us
+        self._waiters[key] += 1
+        
+        try:
+            if joined:
+                await increment_metric("llm_singleflight_coalesced")
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.done() and self._inflight.get(key) is task and self._waiters[key] == 1:
+                # Unregister first: a caller arriving before the task has
+                # finished cancelling must start a new call, not join this one
+                del self._inflight[key]
+                del self._waiters[key]
+                task.cancel()
+                self.cancelled += 1
+            raise
+        finally:
+            if self._inflight.get(key) is task:
+                self._waiters[key] -= 1
+    
+    def _done(self, key: str, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+            del self._waiters[key]
+        # Mark the exception as retrieved when every waiter has gone
+        if not task.cancelled():
+            task.exception()
+    
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": len(self._inflight),
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "cancelled": self.cancelled,
+        }
+
+
+_single_flight = SingleFlight()
+
+
+def get_single_flight_stats() -> Dict[str, int]:
+    """Single-flight counters (calls issued, calls coalesced, shared calls cancelled)"""
+    return _single_flight.stats()
+
+
 # ---------------------------------------------------------------------------
 # HIGH LEVEL ROUTER (ŞU AN TEK SAĞLAYICI)
 # ---------------------------------------------------------------------------
 
+@traced("engine.route_model")
 async def route_model(
     prompt: str,
     *,
@@ -320,6 +414,8 @@ async def route_model(
     max_tokens: int = 512,
     mode: str = "standalone",
     use_gateway: bool = True,  # V6: Use gateway by default
+    use_cache: bool = False,
+    coalesce: bool = True,
 ) -> str:
     """
     EZA v6 için merkezi model router.
@@ -336,6 +432,10 @@ async def route_model(
       temperature, max_tokens: LLM ayarları
       mode:     Pipeline mode for telemetry ("standalone", "proxy_fast", "proxy_deep")
       use_gateway: Use V6 gateway adapter (default: True)
+      use_cache: Serve/store the raw answer via the response cache
+                 (callers still analyze and rewrite cached answers)
+      coalesce: Concurrent identical calls (same cache key) share one
+                provider request (single-flight)
 
     Döner:
       raw_model_output: str (ham LLM cevabı – üst katmanlar bunu analiz edip
@@ -346,6 +446,48 @@ async def route_model(
     """
     provider = LLM_PROVIDER
     
+    cache = get_response_cache() if use_cache else None
+    cache_params = dict(provider=provider, model=LLM_MODEL, temperature=temperature, max_tokens=max_tokens)
+    if cache is not None:
+        cached = await cache.get(prompt, **cache_params)
+        if cached is not None:
+            return cached
+    
+    async def call() -> str:
+        output = await _route_model_direct(
+            prompt,
+            depth=depth,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            mode=mode,
+            use_gateway=use_gateway,
+        )
+        # Stored by the shared call, so the answer is cached even if the
+        # caller that started it has disconnected
+        if cache is not None:
+            await cache.set(prompt, output, **cache_params)
+        return output
+    
+    if not coalesce:
+        return await call()
+    key = make_cache_key(ResponseCache.scope(**cache_params), normalize_prompt(prompt))
+    if not use_gateway:
+        key += ":legacy"
+    return await _single_flight.do(key, call)
+
+
+async def _route_model_direct(
+    prompt: str,
+    *,
+    depth: DepthMode = "fast",
+    temperature: float = 0.2,
+    max_tokens: int = 512,
+    mode: str = "standalone",
+    use_gateway: bool = True,
+) -> str:
+    """route_model without cache / single-flight: one provider call"""
+    provider = LLM_PROVIDER
+    
     # V6: Try gateway first if enabled
     if use_gateway:
         t0 = time.perf_counter()
@@ -353,7 +495,8 @@ async def route_model(
             settings = get_settings()
             gateway_provider = provider if provider in ["openai", "anthropic", "local"] else "openai"
             
-            output = await gateway_call_llm(
+            call = gateway_call_llm_hedged if settings.LLM_HEDGING_ENABLED else gateway_call_llm
+            output = await call(
                 provider_name=gateway_provider,
                 prompt=prompt,
                 settings=settings,
@@ -391,8 +534,9 @@ async def route_model(
                 is_retryable=e.status_code is None or e.status_code >= 500
             )
         except Exception as e:
-            # Fallback to legacy implementation on any error
-            pass  # Continue to legacy code below
+            # Fallback to legacy implementation on any error; the legacy
+            # call logs the LLM call, so this attempt is not logged again
+            logger.debug("Gateway call failed, falling back to legacy client: %r", e)
 
     # Legacy implementation (fallback or if use_gateway=False)
     if provider == "openai":
@@ -413,6 +557,62 @@ async def route_model(
     )
 
 
+async def stream_model(
+    prompt: str,
+    *,
+    depth: DepthMode = "fast",
+    temperature: float = 0.2,
+    max_tokens: int = 512,
+    mode: str = "standalone",
+) -> AsyncIterator[str]:
+    """
+    route_model'in streaming karşılığı: LLM cevabını parça parça (delta) döner.
+
+    Sadece gateway üzerinden çalışır (legacy fallback yok). Generator
+    kapatıldığında (ör. güvenlik kesmesi veya istemci bağlantıyı kapattığında)
+    sağlayıcıdaki HTTP stream de kapatılır.
+
+    Raises:
+        LLMProviderError: For provider-specific errors (before or during streaming)
+    """
+    provider = LLM_PROVIDER
+    gateway_provider = provider if provider in ["openai", "anthropic", "local"] else "openai"
+    
+    t0 = time.perf_counter()
+    ok = False
+    # Overwritten below unless the consumer closes or cancels the stream early
+    error: Optional[str] = "stream closed by consumer"
+    stream = gateway_stream_llm(
+        provider_name=gateway_provider,
+        prompt=prompt,
+        settings=get_settings(),
+        model=LLM_MODEL if provider == "openai" else None,
+        temperature=temperature,
+        max_tokens=max_tokens
+    )
+    try:
+        async with aclosing(stream):
+            async for delta in stream:
+                yield delta
+        ok, error = True, None
+    except GatewayLLMProviderError as e:
+        error = str(e)
+        raise LLMProviderError(
+            provider=e.provider,
+            message=e.message,
+            is_retryable=e.status_code is None or e.status_code >= 500
+        )
+    finally:
+        log_llm_call(
+            provider=gateway_provider,
+            model=LLM_MODEL,
+            duration_ms=(time.perf_counter() - t0) * 1000,
+            ok=ok,
+            error=error,
+            mode=f"{mode}_stream"
+        )
+
+
 # ---------------------------------------------------------------------------
 # COMPATIBILITY WRAPPER (for existing callers)
 # ---------------------------------------------------------------------------
@@ -4,9 +4,15 @@ Output Analyzer Engine (Light version for Fast Pipeline)
 """
 
 from typing import Dict, Any, List
-import re
+from backend.core.engines.scanner import scan_text, scan_fragment, MAX_TERM_LENGTH
+from backend.telemetry.tracing import traced
 
 
+# Harmful categories checked in output (see scanner.WORD_CATEGORIES)
+HARMFUL_CATEGORIES = ["violence", "illegal", "harmful"]
+
+
+@traced("engine.analyze_output")
 def analyze_output(output_text: str, input_analysis: Dict[str, Any] = None) -> Dict[str, Any]:
     """
     Light output analysis for Fast Core Pipeline
@@ -16,16 +22,10 @@ def analyze_output(output_text: str, input_analysis: Dict[str, Any] = None) -> D
     risk_score = 0.0
     
     # Check for harmful content in output
-    harmful_patterns = {
-        "violence": r"\b(kill|murder|harm|attack|violence)\b",
-        "illegal": r"\b(illegal|drug|weapon|hack|steal)\b",
-        "harmful": r"\b(suicide|self.harm|dangerous)\b",
-    }
-    
-    output_lower = output_text.lower()
+    scan = scan_text(output_text)
     
-    for pattern_name, pattern in harmful_patterns.items():
-        if re.search(pattern, output_lower, re.IGNORECASE):
+    for pattern_name in HARMFUL_CATEGORIES:
+        if scan.has(f"risk.{pattern_name}"):
             risk_flags.append(f"output_{pattern_name}")
             risk_score = max(risk_score, 0.6)
     
@@ -45,3 +45,97 @@ def analyze_output(output_text: str, input_analysis: Dict[str, Any] = None) -> D
         "output_length": len(output_text)
     }
 
+
+
+
+# Longest word run kept in the stream tail; longer runs are cut mid-word
+MAX_TAIL_WORD = 64
+
+
+class StreamingOutputAnalyzer:
+    """
+    Incremental analyze_output over a token stream.
+
+    Each delta is scanned together with a short tail of the previous text
+    (sliding window), so the cost per delta stays constant instead of
+    re-scanning the whole answer. Keyword hits that touch the end of the
+    window are not reported yet (the word may still grow, e.g. "kill" ->
+    "killer"), and the trailing partial word is held back from release
+    so a risky term is cut before it is forwarded.
+    """
+
+    def __init__(self, input_analysis: Dict[str, Any] = None):
+        self.input_analysis = input_analysis
+        self.risk_flags: List[str] = []
+        self._chunks: List[str] = []
+        self._pending = ""  # received but not yet released
+        self._tail = ""  # start of the next scan window
+        self._tail_cut = False  # tail starts in the middle of a word
+        self._overlap = MAX_TERM_LENGTH + 1
+
+    @property
+    def text(self) -> str:
+        """Full text received so far"""
+        return "".join(self._chunks)
+
+    @property
+    def blocked(self) -> bool:
+        """True once a harmful output category has fired"""
+        return bool(self.risk_flags)
+
+    def feed(self, delta: str) -> str:
+        """
+        Analyze a new delta.
+        Returns the text that is now safe to forward (may be empty).
+        """
+        if not delta or self.blocked:
+            return ""
+        self._chunks.append(delta)
+        self._pending += delta
+
+        window = self._tail + delta
+        scan = scan_fragment(window)
+        for name in HARMFUL_CATEGORIES:
+            flag = f"output_{name}"
+            if flag in self.risk_flags:
+                continue
+            for start, end in scan.spans(f"risk.{name}"):
+                if end < len(window) and not (start == 0 and self._tail_cut):
+                    self.risk_flags.append(flag)
+                    break
+        if self.blocked:
+            return ""
+
+        # Next window starts at a word start at least `overlap` chars back
+        tail_start = _word_start(window, max(0, len(window) - self._overlap))
+        self._tail = window[tail_start:]
+        self._tail_cut = tail_start > 0 and _is_word_char(window[tail_start - 1])
+
+        # Hold back the trailing partial word, release the rest
+        held = len(window) - _word_start(window, len(window))
+        if held >= len(self._pending):
+            return ""
+        released = self._pending[:len(self._pending) - held]
+        self._pending = self._pending[len(released):]
+        return released
+
+    def finish(self) -> Dict[str, Any]:
+        """Run the full analyze_output once the stream has ended"""
+        return analyze_output(self.text, self.input_analysis)
+
+    def remainder(self) -> str:
+        """Held-back text not yet released (call after finish() approves it)"""
+        released, self._pending = self._pending, ""
+        return released
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+def _word_start(text: str, index: int) -> int:
+    """Start of the word run ending at index (bounded by MAX_TAIL_WORD)"""
+    limit = max(0, index - MAX_TAIL_WORD)
+    while index > limit and _is_word_char(text[index - 1]):
+        index -= 1
+    return index
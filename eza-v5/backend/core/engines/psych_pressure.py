@@ -5,9 +5,21 @@ Detects psychological manipulation and pressure tactics
 """
 
 from typing import Dict, Any, List
-import re
+from backend.core.engines.scanner import scan_text
+from backend.telemetry.tracing import traced
 
 
+# Pressure categories (see scanner.WORD_CATEGORIES)
+PRESSURE_CATEGORIES = [
+    "guilt_trip",
+    "fear_appeal",
+    "social_proof",
+    "scarcity",
+    "reciprocity",
+]
+
+
+@traced("engine.analyze_psychological_pressure")
 def analyze_psychological_pressure(
     text: str,
     memory: List[Dict[str, Any]] = None
@@ -20,18 +32,10 @@ def analyze_psychological_pressure(
     score = 0.0
     
     # Pressure patterns
-    pressure_patterns = {
-        "guilt_trip": r"\b(you.owe|you.should.feel|disappointed)\b",
-        "fear_appeal": r"\b(danger|threat|consequences|punishment)\b",
-        "social_proof": r"\b(everyone.is|all.people|most.users)\b",
-        "scarcity": r"\b(limited|only.few|last.chance)\b",
-        "reciprocity": r"\b(I.did.for.you|I.helped.you)\b"
-    }
-    
-    text_lower = text.lower()
+    scan = scan_text(text)
     
-    for pattern_name, pattern in pressure_patterns.items():
-        matches = len(re.findall(pattern, text_lower, re.IGNORECASE))
+    for pattern_name in PRESSURE_CATEGORIES:
+        matches = scan.count(f"pressure.{pattern_name}")
         if matches > 0:
             patterns.append({
                 "type": pattern_name,
@@ -5,8 +5,10 @@ Determines if request should be redirected to safe response or blocked
 """
 
 from typing import Dict, Any, Optional
+from backend.telemetry.tracing import traced
 
 
+@traced("engine.should_redirect")
 def should_redirect(
     input_analysis: Dict[str, Any],
     output_analysis: Dict[str, Any],
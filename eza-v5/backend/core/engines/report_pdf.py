@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""
+Report PDF Renderer
+Renders eza_report_engine report payloads (RTÜK, BTK, EU AI, platform) as PDF
+
+Dependency-free PDF 1.4 writer: text pages in the standard Helvetica
+fonts (WinAnsiEncoding), A4, wrapped lines. Pure function of the report
+dict, so it can run in a worker process.
+"""
+
+import textwrap
+from typing import Dict, Any, List, Tuple
+from backend.telemetry.tracing import traced
+
+PAGE_WIDTH = 595  # A4, points
+PAGE_HEIGHT = 842
+MARGIN = 50
+FONT_SIZE = 10
+LEADING = 14
+WRAP_COLUMNS = 95
+CASE_TEXT_LIMIT = 400
+
+REPORT_TITLES = {
+    "rtuk": "RTÜK Regulatory Compliance Report",
+    "btk": "BTK Network Compliance Report",
+    "eu_ai": "EU AI Act Compliance Report",
+    "platform": "Platform Content Moderation Report",
+}
+
+# Turkish letters missing from WinAnsi (cp1252); ç, ö, ü are encodable
+_TRANSLITERATION = str.maketrans({"ğ": "g", "Ğ": "G", "ş": "s", "Ş": "S", "ı": "i", "İ": "I"})
+
+# (text, bold) per line; "" is a blank line
+Line = Tuple[str, bool]
+
+
+def _pdf_string(text: str) -> bytes:
+    encoded = text.translate(_TRANSLITERATION).encode("cp1252", errors="replace")
+    return b"(" + encoded.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+
+def _wrap(text: str, bold: bool = False, indent: str = "") -> List[Line]:
+    text = " ".join(str(text).split())
+    if not text:
+        return [("", False)]
+    return [(line, bold) for line in textwrap.wrap(text, WRAP_COLUMNS, initial_indent=indent, subsequent_indent=indent)]
+
+
+def report_lines(report: Dict[str, Any]) -> List[Line]:
+    """Report payload -> printable lines"""
+    metadata = report.get("metadata", {})
+    content = report.get("content", {})
+    statistics = metadata.get("statistics", {})
+    report_type = metadata.get("report_type", "report")
+
+    lines: List[Line] = [(REPORT_TITLES.get(report_type, f"{report_type.upper()} Report"), True), ("", False)]
+    lines += _wrap(f"Generated at: {metadata.get('generated_at', '-')}")
+    lines += _wrap(f"Total cases: {metadata.get('total_cases', 0)}")
+    lines += _wrap(
+        f"High risk: {statistics.get('high_risk_count', 0)}   "
+        f"Medium risk: {statistics.get('medium_risk_count', 0)}   "
+        f"Low risk: {statistics.get('low_risk_count', 0)}   "
+        f"Average risk score: {statistics.get('average_risk_score', 0.0)}"
+    )
+    sources = statistics.get("sources") or {}
+    if sources:
+        lines += _wrap("Sources: " + ", ".join(f"{name}: {count}" for name, count in sorted(sources.items())))
+
+    lines += [("", False), ("Summary", True)]
+    lines += _wrap(content.get("summary", ""))
+
+    lines += [("", False), ("Recommendations", True)]
+    for recommendation in content.get("recommendations", []):
+        lines += _wrap(f"- {recommendation}")
+
+    high_risk_cases = content.get("high_risk_cases", [])
+    if high_risk_cases:
+        lines += [("", False), ("High risk cases", True)]
+        for case in high_risk_cases:
+            lines += _wrap(
+                f"#{case.get('id')}  score {case.get('risk_score', 0.0):.3f}  {case.get('risk_level', '')}  "
+                f"{case.get('source', '')}  {case.get('created_at') or ''}"
+            )
+            text = case.get("text")
+            if text:
+                if len(text) > CASE_TEXT_LIMIT:
+                    text = text[:CASE_TEXT_LIMIT] + "..."
+                lines += _wrap(text, indent="    ")
+
+    case_summary = content.get("case_summary", [])
+    if case_summary:
+        lines += [("", False), ("Case summary", True)]
+        for case in case_summary:
+            lines += _wrap(
+                f"#{case.get('id')}  {case.get('source', '')}  score {case.get('risk_score') or 0.0:.3f}  "
+                f"{case.get('risk_level', '')}  {case.get('created_at') or ''}"
+            )
+    return lines
+
+
+def _page_stream(lines: List[Line], page_number: int, page_count: int) -> bytes:
+    out = [b"BT", f"{LEADING} TL".encode(), f"{MARGIN} {PAGE_HEIGHT - MARGIN} Td".encode()]
+    current_font = None
+    for text, bold in lines:
+        font = b"/F2" if bold else b"/F1"
+        if font != current_font:
+            out.append(font + f" {FONT_SIZE} Tf".encode())
+            current_font = font
+        out.append(_pdf_string(text) + b" Tj T*")
+    out.append(b"ET")
+    footer = f"Page {page_number} / {page_count}"
+    out.append(b"BT /F1 8 Tf " + f"{PAGE_WIDTH - MARGIN - 50} {MARGIN - 20} Td ".encode() + _pdf_string(footer) + b" Tj ET")
+    return b"\n".join(out)
+
+
+@traced("engine.render_report_pdf")
+def render_report_pdf(report: Dict[str, Any]) -> bytes:
+    """Render a report payload (see eza_report_engine.generate_report) as PDF bytes"""
+    lines = report_lines(report)
+    per_page = (PAGE_HEIGHT - 2 * MARGIN) // LEADING
+    pages = [lines[i:i + per_page] for i in range(0, len(lines), per_page)] or [[]]
+
+    # Objects: 1 catalog, 2 pages, 3 Helvetica, 4 Helvetica-Bold, then (page, content) pairs
+    objects: List[bytes] = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"",  # pages tree, filled in below
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>",
+    ]
+    page_refs = []
+    for number, page_lines in enumerate(pages, start=1):
+        stream = _page_stream(page_lines, number, len(pages))
+        page_id = len(objects) + 1
+        content_id = page_id + 1
+        page_refs.append(f"{page_id} 0 R")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+            f"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents {content_id} 0 R >>".encode()
+        )
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n".encode() + stream + b"\nendstream")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(page_refs)}] /Count {len(pages)} >>".encode()
+
+    pdf = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for object_id, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += f"{object_id} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref_offset = len(pdf)
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        pdf += f"{offset:010d} 00000 n \n".encode()
+    pdf += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode()
+    return bytes(pdf)
@@ -6,8 +6,10 @@ Only rewriting, never hallucinating new facts.
 """
 
 from typing import Dict, Any
+from backend.telemetry.tracing import traced
 
 
+@traced("engine.safe_rewrite")
 def safe_rewrite(
     user_message: str,
     llm_output: str,
@@ -5,8 +5,10 @@ Builds context safety graph with nodes and edges
 """
 
 from typing import Dict, Any, List
+from backend.telemetry.tracing import traced
 
 
+@traced("engine.build_safety_graph")
 def build_safety_graph(
     input_analysis: Dict[str, Any],
     output_analysis: Dict[str, Any],
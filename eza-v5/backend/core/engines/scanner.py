@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+"""
+Risk Scanner (Shared)
+Single-pass keyword/pattern scanner used by all text engines.
+
+All category patterns are compiled once at import into one combined,
+prefix-factored (trie) alternation. A text is scanned once and every
+engine (input, output, deception, psychological pressure, legal risk)
+reads its hits from the same ScanResult instead of re-running its own
+regexes on its own lowercased copy.
+"""
+
+from typing import Dict, List, Tuple, Optional
+from functools import lru_cache
+import re
+
+
+# ---------------------------------------------------------------------------
+# CATEGORY PATTERNS
+# ---------------------------------------------------------------------------
+
+# Word terms: matched case-insensitively between word boundaries (\b...\b).
+# "." inside a term matches any single character (e.g. "self.harm").
+WORD_CATEGORIES: Dict[str, List[str]] = {
+    # Input / output risk (analyze_input, analyze_output)
+    "risk.violence": ["kill", "murder", "harm", "attack", "violence"],
+    "risk.illegal": ["illegal", "drug", "weapon", "hack", "steal"],
+    "risk.harmful": ["suicide", "self.harm", "dangerous"],
+    "risk.manipulation": ["manipulate", "trick", "deceive", "scam"],
+    # Deception (analyze_deception)
+    "deception.false_urgency": ["urgent", "immediately", "now", "limited.time"],
+    "deception.authority_claim": ["official", "government", "verified", "certified"],
+    "deception.emotional_manipulation": ["you.must", "you.should", "everyone.is"],
+    "deception.withholding_info": ["secret", "confidential", "don't.tell"],
+    # Psychological pressure (analyze_psychological_pressure)
+    "pressure.guilt_trip": ["you.owe", "you.should.feel", "disappointed"],
+    "pressure.fear_appeal": ["danger", "threat", "consequences", "punishment"],
+    "pressure.social_proof": ["everyone.is", "all.people", "most.users"],
+    "pressure.scarcity": ["limited", "only.few", "last.chance"],
+    "pressure.reciprocity": ["I.did.for.you", "I.helped.you"],
+    # Legal risk (analyze_legal_risk)
+    "legal.copyright": ["copyright", "pirate", "illegal.download"],
+    "legal.privacy": ["personal.data", "gdpr", "privacy.violation"],
+    "legal.defamation": ["defame", "slander", "libel"],
+    "legal.fraud": ["fraud", "scam", "phishing"],
+}
+
+# Number patterns (carry their own anchors). They start with a digit, so
+# they never share a start offset with the keyword terms above.
+REGEX_CATEGORIES: Dict[str, List[str]] = {
+    "legal.pii_exposure": [
+        r"\b\d{4}[\s-]?\d{4}[\s-]?\d{4}[\s-]?\d{4}\b",  # Credit card
+        r"\b\d{3}-\d{2}-\d{4}\b",  # SSN
+    ],
+}
+
+# Email PII is anchored on "@" and only searched when the text contains one
+EMAIL_PATTERN = re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b")
+
+# Substring terms: presence checks anywhere in the text (no word
+# boundaries). Only the first hit of each term is recorded.
+SUBSTRING_CATEGORIES: Dict[str, List[str]] = {
+    "intent.greeting": ["hello", "hi", "greeting"],
+    "intent.question": ["how", "what", "why", "explain"],
+    "intent.generation": ["create", "make", "generate", "write"],
+}
+
+CATEGORIES: List[str] = (
+    list(WORD_CATEGORIES) + list(REGEX_CATEGORIES) + list(SUBSTRING_CATEGORIES)
+)
+
+
+# ---------------------------------------------------------------------------
+# COMPILATION (once at import)
+# ---------------------------------------------------------------------------
+
+class _Term:
+    """A distinct term shared by one or more categories"""
+
+    __slots__ = ("group", "source", "kind", "categories", "regex", "family")
+
+    def __init__(self, group: str, source: str, kind: str):
+        self.group = group
+        self.source = source
+        self.kind = kind  # "word" | "regex"
+        self.categories: List[str] = []
+        self.regex: Optional[re.Pattern] = None
+        self.family: List["_Term"] = []
+
+
+def _may_start_together(a: _Term, b: _Term) -> bool:
+    """
+    True if both terms can match at the same start offset.
+    The combined alternation only reports one term per position, so such
+    terms are re-checked explicitly at every hit.
+    """
+    if a.kind == "regex" or b.kind == "regex":
+        return a.kind == b.kind
+    for ca, cb in zip(a.source.lower(), b.source.lower()):
+        if ca != cb and ca != "." and cb != ".":
+            return False
+    return True
+
+
+def _build_terms() -> List[_Term]:
+    terms: Dict[Tuple[str, str], _Term] = {}
+    ordered: List[_Term] = []
+
+    def add(kind: str, category: str, source: str):
+        key = (kind, source.lower())
+        term = terms.get(key)
+        if term is None:
+            term = _Term(f"t{len(ordered)}", source, kind)
+            terms[key] = term
+            ordered.append(term)
+        term.categories.append(category)
+
+    for category, words in WORD_CATEGORIES.items():
+        for word in words:
+            add("word", category, word)
+    for category, patterns in REGEX_CATEGORIES.items():
+        for pattern in patterns:
+            add("regex", category, pattern)
+
+    for term in ordered:
+        if term.kind == "word":
+            term.regex = re.compile(rf"\b(?:{term.source})\b", re.IGNORECASE)
+        else:
+            term.regex = re.compile(term.source, re.IGNORECASE)
+        term.family = [
+            other for other in ordered
+            if other is not term and _may_start_together(term, other)
+        ]
+
+    return ordered
+
+
+def _trie_pattern(terms: List[_Term]) -> str:
+    """
+    Build a prefix-factored alternation over word terms.
+    The re module tries alternatives one by one, so sharing prefixes
+    ("k|m|h..." at the top instead of every full word) keeps the cost per
+    word boundary close to constant. An empty named group marks the end
+    of each term, so Match.lastgroup identifies which term matched.
+    """
+    trie: Dict[str, dict] = {}
+    for term in terms:
+        node = trie
+        for ch in term.source.lower():
+            node = node.setdefault(ch, {})
+        node.setdefault("", term.group)
+
+    def emit(node: Dict[str, dict]) -> str:
+        alternatives = []
+        for ch, child in node.items():
+            if ch == "":
+                alternatives.append(f"(?P<{child}>)")
+            else:
+                token = "." if ch == "." else re.escape(ch)
+                alternatives.append(token + emit(child))
+        if len(alternatives) == 1:
+            return alternatives[0]
+        return "(?:" + "|".join(alternatives) + ")"
+
+    return emit(trie)
+
+
+_TERMS: List[_Term] = _build_terms()
+_TERMS_BY_GROUP: Dict[str, _Term] = {t.group: t for t in _TERMS}
+
+# Longest keyword term ("." counts as one character); sliding windows over
+# streamed text keep at least this much overlap so no term is split
+MAX_TERM_LENGTH: int = max(len(t.source) for t in _TERMS if t.kind == "word")
+
+_combined_source = r"\b{words}\b|{regexes}".format(
+    words=_trie_pattern([t for t in _TERMS if t.kind == "word"]),
+    regexes="|".join(f"(?P<{t.group}>{t.source})" for t in _TERMS if t.kind == "regex"),
+)
+# Texts are scanned lowercased, as the engines did with re.IGNORECASE on
+# text.lower(). Only "ı" and "ſ" still differ from a term under
+# IGNORECASE once lowercased (they match "i" and "s"), so the plain
+# variant is used for texts without them.
+_COMBINED = re.compile(_combined_source)
+_COMBINED_IGNORECASE = re.compile(_combined_source, re.IGNORECASE)
+_IGNORECASE_ONLY_CHARS = ("\u0131", "\u017f")
+
+
+# ---------------------------------------------------------------------------
+# SCAN
+# ---------------------------------------------------------------------------
+
+class ScanResult:
+    """Per-category hit spans for one text"""
+
+    __slots__ = ("text_length", "_spans")
+
+    def __init__(self, text_length: int, spans: Dict[str, List[Tuple[int, int]]]):
+        self.text_length = text_length
+        self._spans = spans
+
+    def has(self, category: str) -> bool:
+        """True if the category matched at least once"""
+        return category in self._spans
+
+    def count(self, category: str) -> int:
+        """Number of non-overlapping hits for the category"""
+        return len(self._spans.get(category, ()))
+
+    def spans(self, category: str) -> List[Tuple[int, int]]:
+        """(start, end) offsets of the category's hits"""
+        return list(self._spans.get(category, ()))
+
+    def hit_categories(self, prefix: str = "") -> List[str]:
+        """Matched categories (in definition order), optionally filtered by prefix"""
+        return [c for c in CATEGORIES if c in self._spans and c.startswith(prefix)]
+
+    def to_dict(self) -> Dict[str, int]:
+        """Per-category hit counts"""
+        return {c: len(s) for c, s in self._spans.items()}
+
+
+def _scan(text: str) -> ScanResult:
+    spans: Dict[str, List[Tuple[int, int]]] = {}
+    last_end: Dict[str, int] = {}
+
+    haystack = text.lower()
+    origin: Optional[List[int]] = None
+    if len(haystack) != len(text):
+        # Some characters lowercase to several (Turkish "İ" -> "i" + U+0307):
+        # origin maps each offset in haystack back to the original text
+        origin = [index for index, ch in enumerate(text) for _ in ch.lower()]
+        origin.append(len(text))
+
+    def span(start: int, end: int) -> Tuple[int, int]:
+        if origin is None:
+            return start, end
+        return origin[start], origin[end - 1] + 1
+
+    def record(term: _Term, start: int, end: int):
+        for category in term.categories:
+            # Mirror re.findall: hits of one category never overlap
+            if start < last_end.get(category, 0):
+                continue
+            spans.setdefault(category, []).append(span(start, end))
+            last_end[category] = end
+
+    if any(ch in haystack for ch in _IGNORECASE_ONLY_CHARS):
+        combined = _COMBINED_IGNORECASE
+    else:
+        combined = _COMBINED
+
+    # Restart one character after each hit (not after its end) so terms
+    # starting inside another hit ("harm" in "self-harm") are still seen
+    m = combined.search(haystack)
+    while m is not None:
+        term = _TERMS_BY_GROUP[m.lastgroup]
+        start = m.start()
+        record(term, start, m.end())
+        for other in term.family:
+            fm = other.regex.match(haystack, start)
+            if fm is not None:
+                record(other, start, fm.end())
+        m = combined.search(haystack, start + 1)
+
+    if "@" in text:
+        emails = [span(*em.span()) for em in EMAIL_PATTERN.finditer(haystack)]
+        if emails:
+            pii_spans = spans.setdefault("legal.pii_exposure", [])
+            pii_spans.extend(emails)
+            pii_spans.sort()
+
+    for category, words in SUBSTRING_CATEGORIES.items():
+        for word in words:
+            index = haystack.find(word)
+            if index >= 0:
+                spans.setdefault(category, []).append(span(index, index + len(word)))
+
+    return ScanResult(len(text), spans)
+
+
+def scan_fragment(text: str) -> ScanResult:
+    """
+    Scan a short-lived fragment (e.g. a stream window) without caching it,
+    so fragments do not evict whole messages from the scan cache.
+    """
+    return _scan(text or "")
+
+
+@lru_cache(maxsize=128)
+def scan_text(text: str) -> ScanResult:
+    """
+    Scan text once for every risk category.
+    Results are cached per text, so engines analysing the same message
+    in one request share a single pass.
+    """
+    return _scan(text or "")
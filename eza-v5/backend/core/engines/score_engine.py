@@ -5,8 +5,10 @@ Computes overall safety score
 """
 
 from typing import Dict, Any
+from backend.telemetry.tracing import traced
 
 
+@traced("engine.compute_score")
 def compute_score(
     input_analysis: Dict[str, Any],
     output_analysis: Dict[str, Any],
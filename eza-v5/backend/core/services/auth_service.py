@@ -8,7 +8,7 @@ from sqlalchemy import select
 from datetime import timedelta
 from backend.models.user import User
 from backend.models.role import Role
-from backend.core.utils.security import verify_password, create_access_token, get_password_hash
+from backend.core.utils.security import verify_password_async, create_access_token, get_password_hash
 from backend.core.schemas.auth import LoginRequest, TokenResponse
 
 
@@ -26,7 +26,8 @@ async def authenticate_user(
     if not user:
         return None
     
-    if not verify_password(password, user.hashed_password):
+    # bcrypt runs on the auth thread pool, not the event loop
+    if not await verify_password_async(password, user.hashed_password):
         return None
     
     if not user.is_active:
@@ -3,7 +3,7 @@
 FastAPI Dependencies
 """
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
@@ -58,17 +58,58 @@ async def get_redis():
     return redis_client
 
 
+def _set_identity(request: Request, user_id: int, tenant_id: Optional[int], api_key_id: Optional[int] = None):
+    """Record the verified caller on request.state (per-identity rate limits)"""
+    request.state.user_id = user_id
+    request.state.tenant_id = tenant_id
+    if api_key_id is not None:
+        request.state.api_key_id = api_key_id
+
+
+async def identify_request(request: Request, db: AsyncSession):
+    """
+    Verify an optional bearer credential (JWT, else API key) and record
+    the caller on request.state. Endpoints without an auth dependency
+    call this before enforce_rate_limit; a credential that does not
+    verify leaves the request anonymous (per-IP limits).
+    """
+    from backend.core.utils.security import decode_access_token_cached
+    from backend.core.utils.principal import load_principal
+    from backend.services.api_key_service import authenticate_api_key
+
+    auth_header = request.headers.get("Authorization", "")
+    if not auth_header.startswith("Bearer "):
+        return
+    credential = auth_header[len("Bearer "):].strip()
+    if not credential:
+        return
+
+    payload = decode_access_token_cached(credential)
+    if payload is not None:
+        try:
+            user = await load_principal(db, int(payload["sub"]))
+        except (KeyError, TypeError, ValueError):
+            return
+        if user is not None and user.is_active:
+            _set_identity(request, user.id, user.institution_id)
+        return
+
+    api_key_obj = await authenticate_api_key(db, credential)
+    if api_key_obj is not None and not api_key_obj.is_expired():
+        _set_identity(request, api_key_obj.user_id, api_key_obj.institution_id, api_key_obj.id)
+
+
 async def get_current_user(
+    request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get current authenticated user from JWT token"""
-    from backend.core.utils.security import decode_access_token
-    from backend.models.user import User
-    from backend.models.role import Role
+    """Get current authenticated user (Principal) from JWT token"""
+    from backend.core.utils.security import decode_access_token_cached
+    from backend.core.utils.principal import load_principal
     
     token = credentials.credentials
-    payload = decode_access_token(token)
+    payload = decode_access_token_cached(token)
     
     if payload is None:
         raise HTTPException(
@@ -83,10 +124,8 @@ async def get_current_user(
             detail="Invalid token payload"
         )
     
-    result = await db.execute(
-        select(User).join(Role).where(User.id == int(user_id))
-    )
-    user = result.scalar_one_or_none()
+    # Cached per user id; a DB query only on a miss
+    user = await load_principal(db, int(user_id))
     
     if user is None:
         raise HTTPException(
@@ -100,13 +139,14 @@ async def get_current_user(
             detail="User is inactive"
         )
     
+    _set_identity(request, user.id, user.institution_id)
     return user
 
 
 def require_role(allowed_roles: List[str]):
     """Dependency factory for role-based access control"""
     async def role_checker(current_user = Depends(get_current_user)):
-        if current_user.role.name not in allowed_roles:
+        if not current_user.has_any_role(allowed_roles):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Access denied. Required roles: {allowed_roles}"
@@ -138,42 +178,33 @@ def require_institution_auditor():
 
 
 async def get_api_key_user(
+    request: Request,
     api_key: str,
     db: AsyncSession = Depends(get_db)
 ):
     """Get user from API key (for B2B corporate clients)"""
-    from backend.models.api_key import APIKey
-    from backend.models.user import User
-    from backend.core.utils.security import hash_api_key
+    from backend.core.utils.principal import load_principal
+    from backend.services.api_key_service import authenticate_api_key
     
-    # Hash the provided key and search
-    # In production, store hashed keys and compare
-    hashed_key = hash_api_key(api_key)
-    result = await db.execute(
-        select(APIKey).where(APIKey.key_hash == hashed_key)
-    )
-    api_key_obj = result.scalar_one_or_none()
+    # HMAC fingerprint lookup (indexed), cached per worker;
+    # last_used_at is written in batches by the background flush
+    api_key_obj = await authenticate_api_key(db, api_key)
     
-    if api_key_obj is None or not api_key_obj.is_active:
+    if api_key_obj is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid API key"
         )
     
     # Check expiration
-    if api_key_obj.expires_at and api_key_obj.expires_at < datetime.utcnow():
+    if api_key_obj.is_expired():
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="API key expired"
         )
     
-    # Update last used
-    api_key_obj.last_used_at = datetime.utcnow()
-    await db.commit()
-    
     # Get user
-    result = await db.execute(select(User).where(User.id == api_key_obj.user_id))
-    user = result.scalar_one_or_none()
+    user = await load_principal(db, api_key_obj.user_id)
     
     if not user or not user.is_active:
         raise HTTPException(
@@ -181,6 +212,7 @@ async def get_api_key_user(
             detail="User not found or inactive"
         )
     
+    _set_identity(request, user.id, api_key_obj.institution_id or user.institution_id, api_key_obj.id)
     return user
 
 
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Keyset Pagination
+Newest-first paging on (created_at, id) with opaque cursors
+
+A cursor encodes the (created_at, id) of the last row of a page; the next
+page is the rows strictly before it in (created_at DESC, id DESC) order.
+With a composite (created_at, id) index (optionally prefixed by the
+equality filter column) every page is an index range scan, however deep.
+LIMIT/OFFSET is still accepted when no cursor is given.
+
+Routers take the cursor through the cursor_param dependency and return
+the next one in the X-Next-Cursor header, so list bodies are unchanged.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple, Sequence, Any
+
+from fastapi import HTTPException, Query, Response, status
+from sqlalchemy import Select, desc, tuple_
+
+# Response header carrying the cursor of the next page (absent on the last page)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class InvalidCursorError(ValueError):
+    """Cursor is malformed or was not issued by encode_cursor"""
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    payload = json.dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except Exception as e:
+        raise InvalidCursorError(f"Invalid pagination cursor: {cursor!r}") from e
+
+
+def paginate(
+    query: Select,
+    created_at_column,
+    id_column,
+    limit: int,
+    cursor: Optional[str] = None,
+    offset: int = 0
+) -> Select:
+    """
+    Newest-first page of query: keyset when cursor is given, else LIMIT/OFFSET
+
+    Raises:
+        InvalidCursorError: cursor cannot be decoded
+    """
+    query = query.order_by(desc(created_at_column), desc(id_column)).limit(limit)
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        return query.where(tuple_(created_at_column, id_column) < tuple_(created_at, row_id))
+    if offset:
+        query = query.offset(offset)
+    return query
+
+
+def next_cursor(rows: Sequence[Any], limit: int) -> Optional[str]:
+    """Cursor after the last row of a full page (None when the page is short)"""
+    if not rows or len(rows) < limit or rows[-1].created_at is None:
+        return None
+    return encode_cursor(rows[-1].created_at, rows[-1].id)
+
+
+def cursor_param(
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page")
+) -> Optional[str]:
+    """FastAPI dependency: validated cursor query parameter (400 if malformed)"""
+    if cursor:
+        try:
+            decode_cursor(cursor)
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return cursor
+
+
+def set_next_cursor(response: Response, rows: Sequence[Any], limit: int):
+    """Expose the next page's cursor on the response, if there may be one"""
+    cursor = next_cursor(rows, limit)
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
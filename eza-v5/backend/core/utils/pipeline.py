@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""
+Pipeline DAG Executor
+Runs pipeline steps as a dependency graph with asyncio
+
+Each node declares the results it needs via Ref("node_name") in its
+arguments. A node starts as soon as its dependencies are done, so work
+that only depends on the input (input analysis, deep engines on the user
+message, policy setup) runs while the LLM call is still in flight.
+
+Sync engine functions run inline on the event loop (they are short CPU
+steps); async functions (LLM calls) are awaited. Per-node timings and
+the critical path (the chain of nodes that actually bounded the total
+latency) are recorded for telemetry.
+
+Example:
+    dag = PipelineDAG("standalone")
+    dag.add("llm", route_model, prompt=text, mode="standalone")
+    dag.add("input_analysis", analyze_input, text)
+    dag.add("output_analysis", analyze_output, Ref("llm"), Ref("input_analysis"))
+    results = await dag.run()
+"""
+
+import asyncio
+import inspect
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from backend.core.utils.telemetry import log_pipeline_event
+from backend.telemetry.metrics import observe_latency
+from backend.telemetry.tracing import span
+
+
+class Ref:
+    """Placeholder for the result of another node"""
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __repr__(self) -> str:
+        return f"Ref({self.name!r})"
+
+
+class _Node:
+    __slots__ = ("name", "fn", "args", "kwargs", "deps", "optional", "start", "end", "error")
+
+    def __init__(self, name: str, fn: Callable, args: tuple, kwargs: dict, optional: bool):
+        self.name = name
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.optional = optional
+        self.deps: List[str] = [
+            v.name for v in list(args) + list(kwargs.values()) if isinstance(v, Ref)
+        ]
+        self.start: Optional[float] = None
+        self.end: Optional[float] = None
+        self.error: Optional[str] = None
+
+
+class PipelineDAG:
+    """Dependency-graph executor for one pipeline run"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._nodes: Dict[str, _Node] = {}
+        self._results: Dict[str, Any] = {}
+        self._t0: Optional[float] = None
+        self._total: Optional[float] = None
+
+    def add(self, name: str, fn: Callable, *args, optional: bool = False, **kwargs) -> "PipelineDAG":
+        """
+        Add a node. Ref("other") arguments are replaced by that node's result.
+        optional=True: a failure is recorded in errors and the result is None
+        instead of failing the whole run.
+        """
+        if name in self._nodes:
+            raise ValueError(f"Duplicate pipeline node: {name}")
+        node = _Node(name, fn, args, kwargs, optional)
+        for dep in node.deps:
+            if dep not in self._nodes:
+                raise ValueError(f"Node {name!r} depends on unknown node {dep!r}")
+        self._nodes[name] = node
+        return self
+
+    def add_value(self, name: str, value: Any) -> "PipelineDAG":
+        """Add a node whose result is already known (e.g. computed before the run)"""
+        if name in self._nodes:
+            raise ValueError(f"Duplicate pipeline node: {name}")
+        self._nodes[name] = _Node(name, None, (), {}, False)
+        self._results[name] = value
+        return self
+
+    async def run(self) -> Dict[str, Any]:
+        """
+        Run all nodes and return {node_name: result}.
+        If a required node fails, pending nodes are cancelled and the
+        error is re-raised.
+        """
+        # Node tasks inherit the pipeline span (engine spans nest under it)
+        with span(f"pipeline.{self.name}", mode=self.name):
+            return await self._run()
+
+    async def _run(self) -> Dict[str, Any]:
+        self._t0 = time.perf_counter()
+        done: Dict[str, asyncio.Future] = {}
+        loop = asyncio.get_running_loop()
+        for name, node in self._nodes.items():
+            done[name] = loop.create_future()
+            if node.fn is None:
+                done[name].set_result(self._results[name])
+
+        async def run_node(node: _Node):
+            for dep in node.deps:
+                await done[dep]
+            args = [self._resolve(v) for v in node.args]
+            kwargs = {k: self._resolve(v) for k, v in node.kwargs.items()}
+            node.start = time.perf_counter()
+            try:
+                result = node.fn(*args, **kwargs)
+                if inspect.isawaitable(result):
+                    result = await result
+            except Exception as e:
+                node.end = time.perf_counter()
+                if not node.optional:
+                    done[node.name].set_exception(e)
+                    raise
+                node.error = str(e)
+                result = None
+            node.end = time.perf_counter()
+            self._results[node.name] = result
+            done[node.name].set_result(result)
+
+        # I/O nodes (coroutine functions) are started first so their
+        # requests are in flight before sync nodes occupy the loop
+        ordered = sorted(self._nodes.values(), key=lambda n: not inspect.iscoroutinefunction(n.fn))
+        tasks = [
+            asyncio.create_task(run_node(node), name=f"{self.name}:{node.name}")
+            for node in ordered if node.fn is not None
+        ]
+        ok = False
+        try:
+            await asyncio.gather(*tasks)
+            ok = True
+        finally:
+            for task in tasks:
+                task.cancel()
+            # Retrieve exceptions of dependency futures nobody awaited
+            for future in done.values():
+                if future.done() and not future.cancelled():
+                    future.exception()
+            self._total = time.perf_counter()
+            observe_latency("pipeline", (self._total - self._t0) * 1000, mode=self.name, outcome="ok" if ok else "error")
+            log_pipeline_event(
+                event_type=f"{self.name}_dag",
+                mode=self.name,
+                duration_ms=(self._total - self._t0) * 1000,
+                ok=ok,
+                details=lambda: "critical_path=" + ">".join(self.critical_path()),
+            )
+        return dict(self._results)
+
+    def _resolve(self, value: Any) -> Any:
+        return self._results[value.name] if isinstance(value, Ref) else value
+
+    @property
+    def errors(self) -> Dict[str, str]:
+        """Errors of failed optional nodes"""
+        return {name: n.error for name, n in self._nodes.items() if n.error is not None}
+
+    def critical_path(self) -> List[str]:
+        """
+        Chain of nodes that bounded the total latency: start from the node
+        that finished last and follow the dependency that finished last.
+        """
+        finished = [n for n in self._nodes.values() if n.end is not None]
+        if not finished:
+            return []
+        node = max(finished, key=lambda n: n.end)
+        path = [node.name]
+        while node.deps:
+            deps = [self._nodes[d] for d in node.deps if self._nodes[d].end is not None]
+            if not deps:
+                break
+            node = max(deps, key=lambda n: n.end)
+            path.append(node.name)
+        path.reverse()
+        return path
+
+    def timings(self) -> Dict[str, Any]:
+        """Per-node timings (ms, relative to run start) and critical path breakdown"""
+        def ms(value: float) -> float:
+            return round((value - self._t0) * 1000, 3)
+
+        nodes = {
+            name: {
+                "start_ms": ms(n.start),
+                "end_ms": ms(n.end),
+                "ms": round((n.end - n.start) * 1000, 3),
+            }
+            for name, n in self._nodes.items()
+            if n.start is not None and n.end is not None
+        }
+        path = self.critical_path()
+        return {
+            "total_ms": ms(self._total) if self._total is not None else None,
+            "nodes": nodes,
+            "critical_path": path,
+            "critical_path_ms": {name: nodes[name]["ms"] for name in path},
+        }
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+Authenticated Principal - Cached user/role/tenant lookups
+
+get_current_user, require_role, get_api_key_user and resolve_tenant all
+need the same few fields of a user: id, institution, role names and the
+active flag. They are loaded with one projection query and cached per
+user id with a TTL, so authenticated requests normally skip the
+database entirely.
+
+Invalidation: call invalidate_principal(user_id) after changing a user's
+role, institution or active flag, and invalidate_institution(...) after
+tenant-wide changes. Other workers pick up changes when the TTL expires.
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.config import get_settings
+
+
+@dataclass(frozen=True)
+class Principal:
+    """The authenticated user as seen by authorization checks"""
+    id: int
+    email: str
+    institution_id: Optional[int]
+    roles: Tuple[str, ...]
+    is_active: bool
+
+    @property
+    def role_name(self) -> Optional[str]:
+        return self.roles[0] if self.roles else None
+
+    def has_any_role(self, allowed_roles) -> bool:
+        return any(role in allowed_roles for role in self.roles)
+
+
+class PrincipalCache:
+    """user id -> Principal, LRU with TTL"""
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, Tuple[Principal, float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: int) -> Optional[Principal]:
+        entry = self._entries.get(user_id)
+        if entry is None or entry[1] <= time.monotonic():
+            if entry is not None:
+                del self._entries[user_id]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(user_id)
+        self.hits += 1
+        return entry[0]
+
+    def set(self, principal: Principal):
+        self._entries[principal.id] = (principal, time.monotonic() + self.ttl)
+        self._entries.move_to_end(principal.id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int):
+        self._entries.pop(user_id, None)
+
+    def invalidate_institution(self, institution_id: int):
+        stale = [uid for uid, (p, _) in self._entries.items() if p.institution_id == institution_id]
+        for user_id in stale:
+            del self._entries[user_id]
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+_principal_cache: Optional[PrincipalCache] = None
+
+
+def get_principal_cache() -> PrincipalCache:
+    global _principal_cache
+    if _principal_cache is None:
+        settings = get_settings()
+        _principal_cache = PrincipalCache(
+            settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS,
+            settings.AUTH_PRINCIPAL_CACHE_MAX_ENTRIES,
+        )
+    return _principal_cache
+
+
+def invalidate_principal(user_id: int):
+    """Drop a user's cached principal (role, institution or active flag changed)"""
+    get_principal_cache().invalidate(user_id)
+
+
+def invalidate_institution(institution_id: int):
+    """Drop the cached principals of every user in an institution"""
+    get_principal_cache().invalidate_institution(institution_id)
+
+
+async def load_principal(db: AsyncSession, user_id: int) -> Optional[Principal]:
+    """Cached principal for a user id, or None if the user does not exist"""
+    cache = get_principal_cache()
+    principal = cache.get(user_id)
+    if principal is not None:
+        return principal
+
+    from backend.models.user import User
+    from backend.models.role import Role
+
+    result = await db.execute(
+        select(User.id, User.email, User.institution_id, User.is_active, Role.name)
+        .join(Role, User.role_id == Role.id)
+        .where(User.id == user_id)
+    )
+    row = result.first()
+    if row is None:
+        return None
+
+    principal = Principal(
+        id=row.id,
+        email=row.email,
+        institution_id=row.institution_id,
+        roles=(row.name,),
+        is_active=bool(row.is_active),
+    )
+    cache.set(principal)
+    return principal
@@ -2,52 +2,252 @@
 """
 Rate Limiting Utilities
 Production-ready rate limiting for Standalone mode
+
+GCRA (generic cell rate algorithm): each key stores a single timestamp,
+the theoretical arrival time (TAT) of its next request, so a check is
+O(1) in time and memory. "limit requests per window" allows bursts of
+up to `limit` requests, then one request every window/limit seconds.
+
+Backends (RATE_LIMIT_BACKEND):
+- memory: per-process dict, idle keys are evicted as they expire
+- redis:  shared by all workers, one atomic Lua script per check
+          (falls back to memory while Redis is unreachable)
 """
 
-from fastapi import HTTPException, status
+import logging
+import math
 import time
-from typing import Dict, List
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, Request, status
+
+from backend.config import get_settings
+
+logger = logging.getLogger("eza.rate_limit")
+
+REDIS_PREFIX = "ratelimit:"
+
+# After a Redis error the memory backend is used for this long (seconds)
+REDIS_RETRY_AFTER = 30.0
+
+
+@dataclass
+class RateLimitResult:
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float  # seconds until the next request is allowed (0 if allowed)
+    reset_after: float  # seconds until the bucket is full again
+
+    def headers(self) -> Dict[str, str]:
+        headers = {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Reset": str(math.ceil(self.reset_after)),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(max(1, math.ceil(self.retry_after)))
+        return headers
+
+
+def _gcra(tat: float, now: float, limit: int, window: float) -> Tuple[RateLimitResult, float]:
+    """One GCRA step; returns (result, new TAT to store if allowed)"""
+    interval = window / limit
+    tat = max(tat, now)
+    new_tat = tat + interval
+    allow_at = new_tat - window
+    if now < allow_at:
+        return RateLimitResult(False, limit, 0, allow_at - now, tat - now), tat
+    remaining = int((now - allow_at) / interval + 1e-9)
+    return RateLimitResult(True, limit, remaining, 0.0, new_tat - now), new_tat
+
+
+class MemoryRateLimiter:
+    """In-process GCRA limiter with idle-key eviction"""
+
+    # Keys examined for eviction per check (amortized cleanup)
+    EVICT_PER_CHECK = 8
+
+    def __init__(self):
+        self._tat: "OrderedDict[str, float]" = OrderedDict()
+
+    def check(self, key: str, limit: int, window: float) -> RateLimitResult:
+        now = time.monotonic()
+        result, new_tat = _gcra(self._tat.get(key, now), now, limit, window)
+        if result.allowed:
+            self._tat[key] = new_tat
+            self._tat.move_to_end(key)
+        self._evict(now)
+        return result
+
+    def _evict(self, now: float):
+        # Least recently updated keys first; a key whose TAT has passed is
+        # back to a full bucket and carries no state
+        for _ in range(self.EVICT_PER_CHECK):
+            if not self._tat:
+                return
+            key, tat = next(iter(self._tat.items()))
+            if tat > now:
+                return
+            del self._tat[key]
+
+    def reset(self, key: str):
+        self._tat.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._tat)
+
+
+# KEYS[1] = bucket key; ARGV = limit, window_ms
+# Returns {allowed, remaining, retry_after_ms, reset_after_ms}
+GCRA_LUA = """
+if redis.replicate_commands then redis.replicate_commands() end
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local interval = window / limit
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then tat = now end
+local new_tat = tat + interval
+local allow_at = new_tat - window
+if now < allow_at then
+  return {0, 0, math.ceil(allow_at - now), math.ceil(tat - now)}
+end
+redis.call('SET', KEYS[1], new_tat, 'PX', math.ceil(new_tat - now))
+return {1, math.floor((now - allow_at) / interval), 0, math.ceil(new_tat - now)}
+"""
+
 
+class RedisRateLimiter:
+    """GCRA limiter shared across workers (one Lua script call per check)"""
 
-# In-memory rate limit storage
-# In production, use Redis for distributed rate limiting
-RATE_LIMIT: Dict[str, List[float]] = {}
+    def __init__(self, fallback: MemoryRateLimiter):
+        self.fallback = fallback
+        self._script = None
+        self._down_until = 0.0
+
+    async def check(self, key: str, limit: int, window: float) -> RateLimitResult:
+        if time.monotonic() < self._down_until:
+            return self.fallback.check(key, limit, window)
+        try:
+            if self._script is None:
+                from backend.core.utils.dependencies import get_redis
+                redis = await get_redis()
+                self._script = redis.register_script(GCRA_LUA)
+            allowed, remaining, retry_ms, reset_ms = await self._script(
+                keys=[REDIS_PREFIX + key], args=[limit, int(window * 1000)]
+            )
+        except Exception as e:
+            logger.warning(f"Redis rate limiter unavailable, using in-memory limits for {REDIS_RETRY_AFTER:.0f}s: {e}")
+            self._script = None
+            self._down_until = time.monotonic() + REDIS_RETRY_AFTER
+            return self.fallback.check(key, limit, window)
+        return RateLimitResult(bool(allowed), limit, int(remaining), retry_ms / 1000.0, reset_ms / 1000.0)
+
+
+_memory_limiter = MemoryRateLimiter()
+_redis_limiter: Optional[RedisRateLimiter] = None
+
+
+async def rate_limit(key: str, limit: int, window: float) -> RateLimitResult:
+    """Check one bucket with the configured backend"""
+    global _redis_limiter
+    if get_settings().RATE_LIMIT_BACKEND == "redis":
+        if _redis_limiter is None:
+            _redis_limiter = RedisRateLimiter(_memory_limiter)
+        return await _redis_limiter.check(key, limit, window)
+    return _memory_limiter.check(key, limit, window)
+
+
+def _parse_limit(value: str) -> Tuple[int, float]:
+    """ "100/60" -> (100, 60.0) """
+    limit, window = value.split("/")
+    return int(limit), float(window)
+
+
+def rate_limit_buckets(request: Request, scope: str) -> List[Tuple[str, int, float]]:
+    """
+    Buckets that apply to a request: (key, limit, window)
+    - client: per API key if a verified one was used, otherwise per IP
+    - tenant: per institution of the verified caller
+
+    Identity comes only from request.state (api_key_id, tenant_id), which
+    is set by verified auth (get_current_user, get_api_key_user,
+    identify_request, resolve_tenant) - never from client-supplied
+    headers, which would let a client pick another tenant's bucket or a
+    fresh one per request.
+    """
+    settings = get_settings()
+    buckets = []
+
+    api_key_id = getattr(request.state, "api_key_id", None)
+    if api_key_id is not None:
+        limit, window = _parse_limit(settings.RATE_LIMIT_API_KEY)
+        buckets.append((f"{scope}:key:{api_key_id}", limit, window))
+    else:
+        host = request.client.host if request.client else "unknown"
+        limit, window = _parse_limit(settings.RATE_LIMIT_IP)
+        buckets.append((f"{scope}:ip:{host}", limit, window))
+
+    tenant_id = getattr(request.state, "tenant_id", None)
+    if tenant_id is not None:
+        tenant_id = str(tenant_id)
+        tenant_limit = settings.RATE_LIMIT_TENANT_OVERRIDES.get(tenant_id, settings.RATE_LIMIT_TENANT)
+        limit, window = _parse_limit(tenant_limit)
+        buckets.append((f"{scope}:tenant:{tenant_id}", limit, window))
+
+    return buckets
+
+
+async def enforce_rate_limit(
+    request: Request,
+    scope: str = "standalone",
+) -> RateLimitResult:
+    """
+    Check every bucket for the request (identify the caller first, see
+    rate_limit_buckets).
+
+    Raises:
+        HTTPException: 429 with Retry-After / X-RateLimit-* headers
+    """
+    tightest: Optional[RateLimitResult] = None
+    for key, limit, window in rate_limit_buckets(request, scope):
+        result = await rate_limit(key, limit, window)
+        if not result.allowed:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests. Please slow down.",
+                headers=result.headers(),
+            )
+        if tightest is None or result.remaining < tightest.remaining:
+            tightest = result
+    return tightest
 
 
 def check_rate_limit(client_id: str, limit: int = 5, window: int = 3):
     """
-    Check if client has exceeded rate limit.
-    
+    Check if client has exceeded rate limit (in-memory backend).
+
     Args:
         client_id: Client identifier (IP address or user ID)
         limit: Maximum number of requests allowed
         window: Time window in seconds
-    
+
     Raises:
         HTTPException: If rate limit exceeded
     """
-    now = time.time()
-    
-    # Get existing calls for this client
-    calls = RATE_LIMIT.get(client_id, [])
-    
-    # Filter out calls outside the time window
-    calls = [c for c in calls if now - c < window]
-    
-    # Check if limit exceeded
-    if len(calls) >= limit:
+    result = _memory_limiter.check(client_id, limit, window)
+    if not result.allowed:
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail="Too many requests. Please slow down."
+            detail="Too many requests. Please slow down.",
+            headers=result.headers(),
         )
-    
-    # Add current call
-    calls.append(now)
-    RATE_LIMIT[client_id] = calls
 
 
 def reset_rate_limit(client_id: str):
     """Reset rate limit for a client (for testing/admin purposes)"""
-    if client_id in RATE_LIMIT:
-        del RATE_LIMIT[client_id]
-
+    _memory_limiter.reset(client_id)
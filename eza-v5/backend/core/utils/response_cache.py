@@ -0,0 +1,326 @@
+# -*- coding: utf-8 -*-
+"""
+LLM Response Cache
+Two-tier cache for raw LLM answers in front of route_model
+
+Tiers:
+- memory: in-process LRU with TTL and a byte-size budget
+- redis:  shared across workers via get_redis() (optional, best effort)
+- near:   optional near-duplicate lookup (SimHash over word shingles),
+          in-process only
+
+Keys cover (provider, model, temperature, max_tokens, normalized prompt).
+Only the raw model answer is cached: callers still run analyze_output /
+safe_rewrite on every answer, cached or not.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple, Set, List
+
+from backend.config import Settings, get_settings
+from backend.telemetry.metrics import record_cache_lookup
+
+logger = logging.getLogger("eza.cache")
+
+CACHE_NAME = "llm_response"
+REDIS_PREFIX = "llm_cache:"
+
+# After a Redis error the tier is skipped for this long (seconds)
+REDIS_RETRY_AFTER = 30.0
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Collapse whitespace and case so trivially different prompts share a key"""
+    return " ".join(prompt.split()).casefold()
+
+
+def make_cache_key(scope: str, normalized_prompt: str) -> str:
+    """Cache key for a request scope (see ResponseCache.scope) and normalized prompt"""
+    return hashlib.sha256(f"{scope}\x00{normalized_prompt}".encode("utf-8")).hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# MEMORY TIER
+# ---------------------------------------------------------------------------
+
+class LRUTTLCache:
+    """In-process LRU cache with per-entry TTL and a total byte budget"""
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[str, float, int]]" = OrderedDict()
+        self._bytes = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at, _ = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: str):
+        size = len(key) + len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (value, time.monotonic() + self.ttl, size)
+        self._bytes += size
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def __contains__(self, key: str) -> bool:
+        # No LRU promotion: membership checks are not uses
+        entry = self._entries.get(key)
+        return entry is not None and entry[1] > time.monotonic()
+
+    def _remove(self, key: str):
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+        }
+
+
+# ---------------------------------------------------------------------------
+# NEAR-DUPLICATE TIER (SimHash)
+# ---------------------------------------------------------------------------
+
+SIMHASH_BITS = 64
+SIMHASH_BANDS = 4  # 4 x 16-bit bands: any pair within 3 bits shares a band
+
+
+def simhash(text: str, shingle: int = 2) -> int:
+    """64-bit SimHash over word n-gram shingles"""
+    words = _WORD.findall(text)
+    if len(words) >= shingle:
+        features = [" ".join(words[i:i + shingle]) for i in range(len(words) - shingle + 1)]
+    else:
+        features = words or [text]
+    weights = [0] * SIMHASH_BITS
+    for feature in features:
+        h = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if h >> bit & 1 else -1
+    value = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            value |= 1 << bit
+    return value
+
+
+class NearDuplicateIndex:
+    """
+    Banded SimHash index mapping signatures to exact-cache keys.
+    With SIMHASH_BANDS bands, every signature within SIMHASH_BANDS - 1 bits
+    shares at least one band with the query, so candidates come from
+    bucket lookups instead of a scan.
+    """
+
+    def __init__(self, max_distance: int = 3):
+        self.max_distance = min(max_distance, SIMHASH_BANDS - 1)
+        self._band_bits = SIMHASH_BITS // SIMHASH_BANDS
+        self._buckets: Dict[Tuple[str, int, int], Set[str]] = {}
+        self._signatures: Dict[str, Tuple[str, int]] = {}
+
+    def _bands(self, signature: int) -> List[Tuple[int, int]]:
+        mask = (1 << self._band_bits) - 1
+        return [(band, signature >> (band * self._band_bits) & mask) for band in range(SIMHASH_BANDS)]
+
+    def add(self, scope: str, signature: int, key: str):
+        self._signatures[key] = (scope, signature)
+        for band, value in self._bands(signature):
+            self._buckets.setdefault((scope, band, value), set()).add(key)
+
+    def discard(self, key: str):
+        entry = self._signatures.pop(key, None)
+        if entry is None:
+            return
+        scope, signature = entry
+        for band, value in self._bands(signature):
+            bucket = self._buckets.get((scope, band, value))
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[(scope, band, value)]
+
+    def find(self, scope: str, signature: int) -> List[str]:
+        """Keys within max_distance bits, closest first"""
+        candidates: Set[str] = set()
+        for band, value in self._bands(signature):
+            candidates |= self._buckets.get((scope, band, value), set())
+        matches = []
+        for key in candidates:
+            distance = bin(self._signatures[key][1] ^ signature).count("1")
+            if distance <= self.max_distance:
+                matches.append((distance, key))
+        return [key for _, key in sorted(matches)]
+
+    def prune(self, alive) -> int:
+        """Drop keys for which alive(key) is false, returns the number dropped"""
+        stale = [key for key in self._signatures if not alive(key)]
+        for key in stale:
+            self.discard(key)
+        return len(stale)
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+
+# ---------------------------------------------------------------------------
+# RESPONSE CACHE
+# ---------------------------------------------------------------------------
+
+class ResponseCache:
+    """Memory + Redis (+ optional near-duplicate) cache for LLM answers"""
+
+    def __init__(self, settings: Optional[Settings] = None):
+        settings = settings or get_settings()
+        self.ttl = settings.LLM_CACHE_TTL_SECONDS
+        self.memory = LRUTTLCache(
+            max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+            max_bytes=settings.LLM_CACHE_MAX_BYTES,
+            ttl_seconds=self.ttl,
+        )
+        self.use_redis = settings.LLM_CACHE_REDIS
+        self.near = NearDuplicateIndex(settings.LLM_CACHE_NEAR_MAX_DISTANCE) if settings.LLM_CACHE_NEAR_DUPLICATES else None
+        self._redis_down_until = 0.0
+
+    @staticmethod
+    def scope(provider: str, model: str, temperature: float, max_tokens: int) -> str:
+        """Request parameters that must match for an answer to be reused"""
+        return json.dumps([provider, model, round(float(temperature), 3), max_tokens])
+
+    async def get(
+        self,
+        prompt: str,
+        *,
+        provider: str,
+        model: str,
+        temperature: float,
+        max_tokens: int,
+    ) -> Optional[str]:
+        """Cached answer for this request, or None"""
+        scope = self.scope(provider, model, temperature, max_tokens)
+        normalized = normalize_prompt(prompt)
+        key = make_cache_key(scope, normalized)
+
+        value = self.memory.get(key)
+        if value is not None:
+            record_cache_lookup(CACHE_NAME, "memory")
+            return value
+
+        value = await self._redis_get(key)
+        if value is not None:
+            self.memory.set(key, value)
+            record_cache_lookup(CACHE_NAME, "redis")
+            return value
+
+        if self.near is not None:
+            for candidate in self.near.find(scope, simhash(normalized)):
+                value = self.memory.get(candidate)
+                if value is not None:
+                    record_cache_lookup(CACHE_NAME, "near")
+                    return value
+                # Expired or evicted from memory
+                self.near.discard(candidate)
+
+        record_cache_lookup(CACHE_NAME, "miss")
+        return None
+
+    async def set(
+        self,
+        prompt: str,
+        value: str,
+        *,
+        provider: str,
+        model: str,
+        temperature: float,
+        max_tokens: int,
+    ):
+        """Store an answer in all tiers"""
+        scope = self.scope(provider, model, temperature, max_tokens)
+        normalized = normalize_prompt(prompt)
+        key = make_cache_key(scope, normalized)
+
+        self.memory.set(key, value)
+        if self.near is not None:
+            self.near.add(scope, simhash(normalized), key)
+            # Keep the index bounded by the memory tier
+            if len(self.near) > 2 * self.memory.max_entries:
+                self.near.prune(lambda k: k in self.memory)
+        await self._redis_set(key, value)
+
+    async def _redis(self):
+        if not self.use_redis or time.monotonic() < self._redis_down_until:
+            return None
+        from backend.core.utils.dependencies import get_redis
+        return await get_redis()
+
+    def _redis_failed(self, error: Exception):
+        logger.warning(f"LLM cache Redis tier unavailable, retrying in {REDIS_RETRY_AFTER:.0f}s: {error}")
+        self._redis_down_until = time.monotonic() + REDIS_RETRY_AFTER
+
+    async def _redis_get(self, key: str) -> Optional[str]:
+        try:
+            redis = await self._redis()
+            if redis is None:
+                return None
+            return await redis.get(REDIS_PREFIX + key)
+        except Exception as e:
+            self._redis_failed(e)
+            return None
+
+    async def _redis_set(self, key: str, value: str):
+        try:
+            redis = await self._redis()
+            if redis is None:
+                return
+            await redis.set(REDIS_PREFIX + key, value, ex=int(self.ttl))
+        except Exception as e:
+            self._redis_failed(e)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "memory": self.memory.stats(),
+            "near_duplicates": len(self.near) if self.near is not None else None,
+            "redis": self.use_redis and time.monotonic() >= self._redis_down_until,
+        }
+
+
+# Global cache instance
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Global response cache (None when LLM_CACHE_ENABLED is off)"""
+    global _response_cache
+    if _response_cache is None and get_settings().LLM_CACHE_ENABLED:
+        _response_cache = ResponseCache()
+    return _response_cache
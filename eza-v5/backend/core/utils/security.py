@@ -4,10 +4,19 @@ Security Utilities
 """
 
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Callable, TypeVar
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+import asyncio
+import hashlib
+import hmac
 import secrets
+import threading
+import time
+
+T = TypeVar("T")
 
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -28,6 +37,64 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+# ---------------------------------------------------------------------------
+# BCRYPT EXECUTION (off the event loop)
+# ---------------------------------------------------------------------------
+
+class AuthBusyError(Exception):
+    """Too many password hashes queued; the caller should answer 503"""
+
+
+_bcrypt_executor: Optional[ThreadPoolExecutor] = None
+_bcrypt_slots: Optional[threading.BoundedSemaphore] = None
+
+
+def _bcrypt_pool():
+    global _bcrypt_executor, _bcrypt_slots
+    if _bcrypt_executor is None:
+        from backend.config import get_settings
+        settings = get_settings()
+        _bcrypt_executor = ThreadPoolExecutor(max_workers=settings.AUTH_BCRYPT_WORKERS, thread_name_prefix="bcrypt")
+        _bcrypt_slots = threading.BoundedSemaphore(settings.AUTH_BCRYPT_MAX_PENDING)
+    return _bcrypt_executor, _bcrypt_slots
+
+
+async def run_bcrypt(fn: Callable[..., T], *args) -> T:
+    """
+    Run a bcrypt call on the bounded auth thread pool.
+
+    Raises:
+        AuthBusyError: AUTH_BCRYPT_MAX_PENDING calls are already queued or running
+    """
+    executor, slots = _bcrypt_pool()
+    if not slots.acquire(blocking=False):
+        raise AuthBusyError("Authentication is busy, retry shortly")
+    # The slot is held until the thread finishes, even if the awaiting
+    # request is cancelled, so abandoned hashes still count
+    future = executor.submit(fn, *args)
+    future.add_done_callback(lambda _: slots.release())
+    return await asyncio.wrap_future(future)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password on the bcrypt pool"""
+    return await run_bcrypt(pwd_context.verify, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash on the bcrypt pool"""
+    return await run_bcrypt(pwd_context.hash, password)
+
+
+def shutdown_bcrypt_pool():
+    """Stop the bcrypt threads (lifespan shutdown)"""
+    global _bcrypt_executor, _bcrypt_slots
+    if _bcrypt_executor is not None:
+        _bcrypt_executor.shutdown(wait=False, cancel_futures=True)
+        _bcrypt_executor = None
+        _bcrypt_slots = None
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token"""
     to_encode = data.copy()
@@ -50,12 +117,89 @@ def decode_access_token(token: str) -> Optional[dict]:
         return None
 
 
+class ClaimsCache:
+    """
+    LRU of decoded JWT claims keyed by SHA-256 of the token.
+    Entries are only served until the token's exp, so a cached token
+    expires exactly like a verified one.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[bytes, tuple[dict, float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, digest: bytes) -> Optional[dict]:
+        entry = self._entries.get(digest)
+        if entry is None:
+            self.misses += 1
+            return None
+        claims, exp = entry
+        if exp <= time.time():
+            del self._entries[digest]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(digest)
+        self.hits += 1
+        return dict(claims)
+
+    def set(self, digest: bytes, claims: dict, exp: float):
+        self._entries[digest] = (dict(claims), exp)
+        self._entries.move_to_end(digest)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+_claims_cache: Optional[ClaimsCache] = None
+
+
+def get_claims_cache() -> ClaimsCache:
+    global _claims_cache
+    if _claims_cache is None:
+        from backend.config import get_settings
+        _claims_cache = ClaimsCache(get_settings().AUTH_JWT_CACHE_MAX_ENTRIES)
+    return _claims_cache
+
+
+def decode_access_token_cached(token: str) -> Optional[dict]:
+    """decode_access_token, skipping signature verification for tokens already verified"""
+    cache = get_claims_cache()
+    digest = hashlib.sha256(token.encode("utf-8")).digest()
+    claims = cache.get(digest)
+    if claims is not None:
+        return claims
+    claims = decode_access_token(token)
+    # Tokens without exp are verified every time (nothing bounds a cache entry)
+    if claims is not None and isinstance(claims.get("exp"), (int, float)):
+        cache.set(digest, claims, float(claims["exp"]))
+    return claims
+
+
 def generate_api_key() -> str:
     """Generate a secure API key"""
     return f"eza_{secrets.token_urlsafe(32)}"
 
 
 def hash_api_key(key: str) -> str:
-    """Hash an API key for storage"""
+    """Hash an API key for storage (bcrypt; legacy API key rows and client secrets)"""
     return pwd_context.hash(key)
 
+
+def api_key_fingerprint(key: str) -> str:
+    """
+    Deterministic HMAC-SHA256 fingerprint of an API key (hex).
+    Unlike bcrypt it can be looked up through an index; the server-side
+    secret keeps a leaked table from being brute-forced offline.
+    """
+    from backend.config import get_settings
+    settings = get_settings()
+    secret = settings.API_KEY_HMAC_SECRET or settings.JWT_SECRET_KEY
+    return hmac.new(secret.encode("utf-8"), key.encode("utf-8"), hashlib.sha256).hexdigest()
+
@@ -2,11 +2,14 @@
 """
 Telemetry Module
 Production-grade logging for LLM calls and system events
+
+Records carry their values as structured fields (extra={"fields": ...});
+callable fields are only evaluated by the log writer thread, for
+records actually written (telemetry.logger.configure_logging).
 """
 
-import time
 import logging
-from typing import Optional
+from typing import Optional, Union, Callable
 
 logger = logging.getLogger("eza.telemetry")
 
@@ -20,7 +23,7 @@ def log_llm_call(
     mode: str = "standalone",
 ):
     """
-    Log LLM call telemetry data.
+    Log LLM call telemetry data (once per model call).
     
     Args:
         provider: LLM provider name (e.g., "openai")
@@ -31,10 +34,21 @@ def log_llm_call(
         mode: Pipeline mode ("standalone", "proxy_fast", "proxy_deep")
     """
     level = logging.INFO if ok else logging.WARNING
+    if not logger.isEnabledFor(level):
+        return
     logger.log(
         level,
-        f"[LLM_CALL] provider={provider} model={model} mode={mode} "
-        f"duration_ms={duration_ms:.1f} ok={ok} error={error or '-'}",
+        "[LLM_CALL] provider=%s model=%s mode=%s duration_ms=%.1f ok=%s error=%s",
+        provider, model, mode, duration_ms, ok, error or "-",
+        extra={"fields": {
+            "event": "llm_call",
+            "provider": provider,
+            "model": model,
+            "mode": mode,
+            "duration_ms": round(duration_ms, 1),
+            "ok": ok,
+            "error": error,
+        }},
     )
 
 
@@ -43,7 +57,7 @@ def log_pipeline_event(
     mode: str,
     duration_ms: float,
     ok: bool,
-    details: Optional[str] = None,
+    details: Optional[Union[str, Callable[[], str]]] = None,
 ):
     """
     Log pipeline-level events.
@@ -53,12 +67,25 @@ def log_pipeline_event(
         mode: Pipeline mode
         duration_ms: Total pipeline duration
         ok: Whether pipeline completed successfully
-        details: Additional details (optional)
+        details: Additional details (optional); a callable is evaluated
+                 only if the record is written
     """
     level = logging.INFO if ok else logging.ERROR
+    if not logger.isEnabledFor(level):
+        return
+    fields = {
+        "event": "pipeline",
+        "event_type": event_type,
+        "mode": mode,
+        "duration_ms": round(duration_ms, 1),
+        "ok": ok,
+        "details": details,
+    }
+    # details stays out of the message: as a field it may be lazy
     logger.log(
         level,
-        f"[PIPELINE] event={event_type} mode={mode} "
-        f"duration_ms={duration_ms:.1f} ok={ok} details={details or '-'}",
+        "[PIPELINE] event=%s mode=%s duration_ms=%.1f ok=%s",
+        event_type, mode, duration_ms, ok,
+        extra={"fields": fields},
     )
 
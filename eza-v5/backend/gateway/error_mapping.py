@@ -9,13 +9,34 @@ from typing import Optional
 
 class LLMProviderError(Exception):
     """Unified LLM provider error"""
-    def __init__(self, message: str, provider: str, status_code: Optional[int] = None):
+    def __init__(
+        self,
+        message: str,
+        provider: str,
+        status_code: Optional[int] = None,
+        error_type: str = "other",
+    ):
         self.message = message
         self.provider = provider
         self.status_code = status_code
+        # "http" | "timeout" | "connection" | "config" | "unavailable" | "other"
+        self.error_type = error_type
         super().__init__(self.message)
 
 
+def is_provider_failure(error: LLMProviderError) -> bool:
+    """
+    True if the error says the provider itself is unhealthy (timeouts,
+    connection errors, 5xx, 429), as opposed to a bad request or missing
+    configuration on our side. Drives the circuit breakers.
+    """
+    if error.error_type in ("timeout", "connection"):
+        return True
+    if error.error_type == "http" and error.status_code is not None:
+        return error.status_code >= 500 or error.status_code == 429
+    return False
+
+
 def map_provider_error(error: Exception, provider: str) -> LLMProviderError:
     """Map provider-specific errors to LLMProviderError"""
     if isinstance(error, httpx.HTTPStatusError):
@@ -28,13 +49,32 @@ def map_provider_error(error: Exception, provider: str) -> LLMProviderError:
         return LLMProviderError(
             message=f"{provider} API error: {error_detail}",
             provider=provider,
-            status_code=status_code
+            status_code=status_code,
+            error_type="http"
+        )
+    elif isinstance(error, httpx.TimeoutException):
+        return LLMProviderError(
+            message=f"{provider} timeout: {str(error)}",
+            provider=provider,
+            status_code=None,
+            error_type="timeout"
         )
     elif isinstance(error, httpx.RequestError):
         return LLMProviderError(
             message=f"{provider} connection error: {str(error)}",
             provider=provider,
-            status_code=None
+            status_code=None,
+            error_type="connection"
+        )
+    elif isinstance(error, LLMProviderError):
+        return error
+    elif isinstance(error, ValueError):
+        # Missing API key / URL
+        return LLMProviderError(
+            message=f"{provider} error: {str(error)}",
+            provider=provider,
+            status_code=None,
+            error_type="config"
         )
     else:
         return LLMProviderError(
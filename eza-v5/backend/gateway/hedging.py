@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+Gateway Hedging - Per-provider latency tracking and hedge budget
+
+A hedged call fires a second request when the primary has not answered
+within the primary's observed p95 latency, and takes the first good
+answer. The budget caps hedges to a fraction of primary calls, so a
+slow provider cannot double the traffic.
+"""
+
+import math
+from collections import deque
+from typing import Deque, Dict, Optional, Any
+
+
+class LatencyTracker:
+    """Recent successful call latencies per provider (sliding window)"""
+
+    def __init__(self, window: int = 500):
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, provider: str, latency_ms: float):
+        samples = self._samples.get(provider)
+        if samples is None:
+            samples = self._samples[provider] = deque(maxlen=self.window)
+        samples.append(latency_ms)
+
+    def percentile(self, provider: str, q: float, min_samples: int = 20) -> Optional[float]:
+        """q-th percentile (0-100) or None while there are too few samples"""
+        samples = self._samples.get(provider)
+        if not samples or len(samples) < min_samples:
+            return None
+        ordered = sorted(samples)
+        index = max(0, math.ceil(q / 100.0 * len(ordered)) - 1)
+        return ordered[index]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            provider: {"samples": len(samples), "p95_ms": self.percentile(provider, 95, min_samples=1)}
+            for provider, samples in self._samples.items()
+        }
+
+
+class HedgeBudget:
+    """
+    Token bucket limiting hedges to `ratio` of primary calls.
+    Every primary call earns `ratio` tokens (up to `burst`), every hedge
+    spends one.
+    """
+
+    def __init__(self, ratio: float, burst: float = 10.0):
+        self.ratio = ratio
+        self.burst = burst
+        self._tokens = burst if ratio > 0 else 0.0
+        self.primary_calls = 0
+        self.hedges = 0
+        self.denied = 0
+
+    def on_primary(self):
+        self.primary_calls += 1
+        self._tokens = min(self.burst, self._tokens + self.ratio)
+
+    def try_acquire(self) -> bool:
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            self.hedges += 1
+            return True
+        self.denied += 1
+        return False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ratio": self.ratio,
+            "primary_calls": self.primary_calls,
+            "hedges": self.hedges,
+            "denied": self.denied,
+            "hedge_fraction": self.hedges / self.primary_calls if self.primary_calls else 0.0,
+        }
+
+
+# Global instances
+provider_latency = LatencyTracker()
+_hedge_budget: Optional[HedgeBudget] = None
+
+
+def get_hedge_budget(ratio: float) -> HedgeBudget:
+    """Global hedge budget (recreated if the configured ratio changes)"""
+    global _hedge_budget
+    if _hedge_budget is None or _hedge_budget.ratio != ratio:
+        _hedge_budget = HedgeBudget(ratio)
+    return _hedge_budget
+
+
+def hedge_delay_ms(provider: str, default_ms: float, min_ms: float) -> float:
+    """Delay before hedging: the provider's observed p95, or default_ms until enough samples exist"""
+    p95 = provider_latency.percentile(provider, 95)
+    return max(min_ms, p95 if p95 is not None else default_ms)
+
+
+def get_hedging_stats() -> Dict[str, Any]:
+    """Provider latency percentiles and hedge budget counters"""
+    return {
+        "latency": provider_latency.stats(),
+        "budget": _hedge_budget.stats() if _hedge_budget is not None else None,
+    }
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+Provider HTTP Clients - Shared pooled httpx.AsyncClient per LLM provider
+
+Each provider gets one long-lived client with its own keep-alive
+connection pool, so LLM calls reuse open TCP/TLS connections instead of
+paying a new handshake per request. Clients are created in the FastAPI
+lifespan (main.py) and closed on shutdown.
+"""
+
+import logging
+from typing import Dict, Any, Optional
+import httpx
+from backend.config import Settings, get_settings
+
+logger = logging.getLogger("eza.gateway")
+
+# Default request timeouts per provider (seconds)
+PROVIDER_TIMEOUTS: Dict[str, float] = {
+    "openai": 60.0,
+    "anthropic": 60.0,
+    "local": 120.0,
+}
+
+
+def _http2_available() -> bool:
+    """HTTP/2 needs the optional 'h2' package (httpx[http2])"""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class ProviderClientRegistry:
+    """Registry of pooled httpx clients, one per provider"""
+
+    def __init__(self, settings: Optional[Settings] = None):
+        self.settings = settings or get_settings()
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self.http2 = self.settings.LLM_HTTP2
+        if self.http2 and not _http2_available():
+            logger.warning("LLM_HTTP2 enabled but 'h2' is not installed, using HTTP/1.1")
+            self.http2 = False
+
+    def _build_client(self, provider: str) -> httpx.AsyncClient:
+        """Create a pooled client for a provider"""
+        limits = httpx.Limits(
+            max_connections=self.settings.LLM_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=self.settings.LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=self.settings.LLM_HTTP_KEEPALIVE_EXPIRY,
+        )
+        timeout = httpx.Timeout(PROVIDER_TIMEOUTS.get(provider, 60.0))
+        return httpx.AsyncClient(limits=limits, timeout=timeout, http2=self.http2)
+
+    def get(self, provider: str) -> httpx.AsyncClient:
+        """Get (or lazily create) the pooled client for a provider"""
+        client = self._clients.get(provider)
+        if client is None or client.is_closed:
+            client = self._build_client(provider)
+            self._clients[provider] = client
+        return client
+
+    async def aclose(self):
+        """Close all clients and their connection pools"""
+        for provider, client in list(self._clients.items()):
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"Failed to close HTTP client for {provider}: {e}")
+        self._clients.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool configuration and open clients"""
+        return {
+            "providers": sorted(self._clients),
+            "http2": self.http2,
+            "max_connections": self.settings.LLM_HTTP_MAX_CONNECTIONS,
+            "max_keepalive_connections": self.settings.LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            "keepalive_expiry": self.settings.LLM_HTTP_KEEPALIVE_EXPIRY,
+        }
+
+
+# Global registry instance
+_registry: Optional[ProviderClientRegistry] = None
+
+
+def init_provider_clients(settings: Optional[Settings] = None) -> ProviderClientRegistry:
+    """Create the global client registry (called from lifespan startup)"""
+    global _registry
+    _registry = ProviderClientRegistry(settings)
+    return _registry
+
+
+def get_provider_client(provider: str) -> httpx.AsyncClient:
+    """Get the pooled client for a provider"""
+    if _registry is None:
+        init_provider_clients()
+    return _registry.get(provider)
+
+
+async def close_provider_clients():
+    """Close the global client registry (called from lifespan shutdown)"""
+    global _registry
+    if _registry is not None:
+        await _registry.aclose()
+        _registry = None
@@ -3,24 +3,24 @@
 Anthropic Provider
 """
 
-import httpx
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, AsyncIterator
 from backend.config import Settings
+from backend.gateway.http_clients import get_provider_client
+from backend.gateway.providers.sse import iter_sse_json, raise_for_stream_status
 
+ANTHROPIC_MESSAGES_URL = "https://api.anthropic.com/v1/messages"
 
-async def generate_anthropic(
+
+def _build_request(
     prompt: str,
     settings: Settings,
-    model: str = "claude-3-opus-20240229",
-    temperature: float = 0.7,
-    max_tokens: Optional[int] = 1000,
-    **kwargs
-) -> str:
-    """Generate text using Anthropic API"""
+    model: str,
+    temperature: float,
+    max_tokens: Optional[int],
+):
     if not settings.ANTHROPIC_API_KEY:
         raise ValueError("ANTHROPIC_API_KEY not configured")
     
-    url = "https://api.anthropic.com/v1/messages"
     headers = {
         "x-api-key": settings.ANTHROPIC_API_KEY,
         "anthropic-version": "2023-06-01",
@@ -34,9 +34,48 @@ async def generate_anthropic(
         "temperature": temperature,
     }
     
-    async with httpx.AsyncClient(timeout=60.0) as client:
-        response = await client.post(url, json=payload, headers=headers)
-        response.raise_for_status()
-        data = response.json()
-        return data["content"][0]["text"]
+    return headers, payload
+
+
+async def generate_anthropic(
+    prompt: str,
+    settings: Settings,
+    model: str = "claude-3-opus-20240229",
+    temperature: float = 0.7,
+    max_tokens: Optional[int] = 1000,
+    **kwargs
+) -> str:
+    """Generate text using Anthropic API"""
+    headers, payload = _build_request(prompt, settings, model, temperature, max_tokens)
+    
+    client = get_provider_client("anthropic")
+    response = await client.post(ANTHROPIC_MESSAGES_URL, json=payload, headers=headers)
+    response.raise_for_status()
+    data = response.json()
+    return data["content"][0]["text"]
+
 
+async def stream_anthropic(
+    prompt: str,
+    settings: Settings,
+    model: str = "claude-3-opus-20240229",
+    temperature: float = 0.7,
+    max_tokens: Optional[int] = 1000,
+    **kwargs
+) -> AsyncIterator[str]:
+    """Stream text deltas from Anthropic API (SSE)"""
+    headers, payload = _build_request(prompt, settings, model, temperature, max_tokens)
+    payload["stream"] = True
+    
+    client = get_provider_client("anthropic")
+    async with client.stream("POST", ANTHROPIC_MESSAGES_URL, json=payload, headers=headers) as response:
+        await raise_for_stream_status(response)
+        async for event in iter_sse_json(response):
+            if event.get("type") == "content_block_delta":
+                delta = (event.get("delta") or {}).get("text")
+                if delta:
+                    yield delta
+            elif event.get("type") == "message_stop":
+                break
+            elif event.get("type") == "error":
+                raise RuntimeError((event.get("error") or {}).get("message", "Stream error"))
@@ -3,20 +3,19 @@
 Local LLM Provider (for self-hosted models)
 """
 
-import httpx
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, AsyncIterator
 from backend.config import Settings
+from backend.gateway.http_clients import get_provider_client
+from backend.gateway.providers.sse import iter_sse_json, raise_for_stream_status
 
 
-async def generate_local_llm(
+def _build_request(
     prompt: str,
     settings: Settings,
-    model: Optional[str] = None,
-    temperature: float = 0.7,
-    max_tokens: Optional[int] = None,
-    **kwargs
-) -> str:
-    """Generate text using local LLM API"""
+    model: Optional[str],
+    temperature: float,
+    max_tokens: Optional[int],
+):
     if not settings.LOCAL_LLM_URL:
         raise ValueError("LOCAL_LLM_URL not configured")
     
@@ -31,9 +30,45 @@ async def generate_local_llm(
     if max_tokens:
         payload["max_tokens"] = max_tokens
     
-    async with httpx.AsyncClient(timeout=120.0) as client:
-        response = await client.post(url, json=payload)
-        response.raise_for_status()
-        data = response.json()
-        return data["choices"][0]["message"]["content"]
+    return url, payload
 
+
+async def generate_local_llm(
+    prompt: str,
+    settings: Settings,
+    model: Optional[str] = None,
+    temperature: float = 0.7,
+    max_tokens: Optional[int] = None,
+    **kwargs
+) -> str:
+    """Generate text using local LLM API"""
+    url, payload = _build_request(prompt, settings, model, temperature, max_tokens)
+    
+    client = get_provider_client("local")
+    response = await client.post(url, json=payload)
+    response.raise_for_status()
+    data = response.json()
+    return data["choices"][0]["message"]["content"]
+
+
+async def stream_local_llm(
+    prompt: str,
+    settings: Settings,
+    model: Optional[str] = None,
+    temperature: float = 0.7,
+    max_tokens: Optional[int] = None,
+    **kwargs
+) -> AsyncIterator[str]:
+    """Stream text deltas from local LLM API (OpenAI-compatible SSE)"""
+    url, payload = _build_request(prompt, settings, model, temperature, max_tokens)
+    payload["stream"] = True
+    
+    client = get_provider_client("local")
+    async with client.stream("POST", url, json=payload) as response:
+        await raise_for_stream_status(response)
+        async for chunk in iter_sse_json(response):
+            choices = chunk.get("choices") or []
+            if choices:
+                delta = (choices[0].get("delta") or {}).get("content")
+                if delta:
+                    yield delta
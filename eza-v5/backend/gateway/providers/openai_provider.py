@@ -3,24 +3,24 @@
 OpenAI Provider
 """
 
-import httpx
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, AsyncIterator
 from backend.config import Settings
+from backend.gateway.http_clients import get_provider_client
+from backend.gateway.providers.sse import iter_sse_json, raise_for_stream_status
 
+OPENAI_CHAT_URL = "https://api.openai.com/v1/chat/completions"
 
-async def generate_openai(
+
+def _build_request(
     prompt: str,
     settings: Settings,
-    model: str = "gpt-4",
-    temperature: float = 0.7,
-    max_tokens: Optional[int] = None,
-    **kwargs
-) -> str:
-    """Generate text using OpenAI API"""
+    model: str,
+    temperature: float,
+    max_tokens: Optional[int],
+):
     if not settings.OPENAI_API_KEY:
         raise ValueError("OPENAI_API_KEY not configured")
     
-    url = "https://api.openai.com/v1/chat/completions"
     headers = {
         "Authorization": f"Bearer {settings.OPENAI_API_KEY}",
         "Content-Type": "application/json"
@@ -35,9 +35,45 @@ async def generate_openai(
     if max_tokens:
         payload["max_tokens"] = max_tokens
     
-    async with httpx.AsyncClient(timeout=60.0) as client:
-        response = await client.post(url, json=payload, headers=headers)
-        response.raise_for_status()
-        data = response.json()
-        return data["choices"][0]["message"]["content"]
+    return headers, payload
+
+
+async def generate_openai(
+    prompt: str,
+    settings: Settings,
+    model: str = "gpt-4",
+    temperature: float = 0.7,
+    max_tokens: Optional[int] = None,
+    **kwargs
+) -> str:
+    """Generate text using OpenAI API"""
+    headers, payload = _build_request(prompt, settings, model, temperature, max_tokens)
+    
+    client = get_provider_client("openai")
+    response = await client.post(OPENAI_CHAT_URL, json=payload, headers=headers)
+    response.raise_for_status()
+    data = response.json()
+    return data["choices"][0]["message"]["content"]
+
 
+async def stream_openai(
+    prompt: str,
+    settings: Settings,
+    model: str = "gpt-4",
+    temperature: float = 0.7,
+    max_tokens: Optional[int] = None,
+    **kwargs
+) -> AsyncIterator[str]:
+    """Stream text deltas from OpenAI API (SSE)"""
+    headers, payload = _build_request(prompt, settings, model, temperature, max_tokens)
+    payload["stream"] = True
+    
+    client = get_provider_client("openai")
+    async with client.stream("POST", OPENAI_CHAT_URL, json=payload, headers=headers) as response:
+        await raise_for_stream_status(response)
+        async for chunk in iter_sse_json(response):
+            choices = chunk.get("choices") or []
+            if choices:
+                delta = (choices[0].get("delta") or {}).get("content")
+                if delta:
+                    yield delta
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""
+Server-Sent Events helpers for streaming provider responses
+"""
+
+import json
+from typing import AsyncIterator, Dict, Any
+import httpx
+
+
+async def iter_sse_json(response: httpx.Response) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Yield the JSON payload of each 'data:' line of an SSE response.
+    Stops at the OpenAI-style "[DONE]" sentinel.
+    """
+    async for line in response.aiter_lines():
+        if not line.startswith("data:"):
+            continue
+        data = line[5:].strip()
+        if not data:
+            continue
+        if data == "[DONE]":
+            break
+        yield json.loads(data)
+
+
+async def raise_for_stream_status(response: httpx.Response):
+    """raise_for_status() for streamed responses (reads the error body first)"""
+    if response.is_error:
+        await response.aread()
+        response.raise_for_status()
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""
+Gateway Resilience - Per-provider circuit breaker and concurrency limiter
+
+CircuitBreaker (closed / open / half-open):
+    Opens after LLM_BREAKER_FAILURE_THRESHOLD consecutive provider
+    failures (see error_mapping.is_provider_failure). While open, calls
+    fail immediately instead of waiting out the provider timeout. After
+    LLM_BREAKER_OPEN_SECONDS one probe call is let through (half-open):
+    success closes the breaker, failure opens it again.
+
+AIMDLimiter:
+    Adaptive cap on in-flight calls. Each good call raises the limit by
+    1/limit (about +1 per limit's worth of calls), each provider failure
+    or slow call halves it. Calls over the limit are rejected at once
+    (fast fallback) instead of queueing behind a degraded provider.
+"""
+
+import time
+from typing import Dict, Any, Optional
+
+from backend.config import Settings, get_settings
+from backend.gateway.error_mapping import LLMProviderError, is_provider_failure
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class ProviderUnavailableError(LLMProviderError):
+    """Call rejected by the circuit breaker or the concurrency limiter"""
+
+    def __init__(self, message: str, provider: str):
+        super().__init__(message=message, provider=provider, status_code=503, error_type="unavailable")
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker"""
+
+    def __init__(self, failure_threshold: int = 5, open_seconds: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.times_opened = 0
+        self._probe_in_flight = False
+
+    def allow(self) -> bool:
+        """Whether a call may go out now (moves open -> half-open when the wait is over)"""
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and time.monotonic() - self.opened_at >= self.open_seconds:
+            self.state = HALF_OPEN
+            self._probe_in_flight = False
+        if self.state == HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def on_success(self):
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+
+    def on_failure(self):
+        self.consecutive_failures += 1
+        if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self._open()
+
+    def on_neutral(self):
+        """Call ended without a health signal (cancelled, bad request)"""
+        if self.state == HALF_OPEN:
+            self._probe_in_flight = False
+
+    def _open(self):
+        if self.state != OPEN:
+            self.times_opened += 1
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        self._probe_in_flight = False
+
+    def stats(self) -> Dict[str, Any]:
+        retry_in = None
+        if self.state == OPEN:
+            retry_in = max(0.0, self.open_seconds - (time.monotonic() - self.opened_at))
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "times_opened": self.times_opened,
+            "retry_in_seconds": retry_in,
+        }
+
+
+class AIMDLimiter:
+    """Additive-increase / multiplicative-decrease in-flight call limit"""
+
+    def __init__(self, initial: int, min_limit: int, max_limit: int, slow_call_ms: float, backoff: float = 0.5):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.slow_call_ms = slow_call_ms
+        self.backoff = backoff
+        self.limit = float(max(min_limit, min(initial, max_limit)))
+        self.in_flight = 0
+        self.rejected = 0
+
+    def try_acquire(self) -> bool:
+        if self.in_flight >= int(self.limit):
+            self.rejected += 1
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(self, latency_ms: Optional[float] = None, failed: bool = False):
+        """Release a slot; latency/failed adjust the limit (None: no signal)"""
+        self.in_flight = max(0, self.in_flight - 1)
+        if failed or (latency_ms is not None and latency_ms > self.slow_call_ms):
+            self.limit = max(float(self.min_limit), self.limit * self.backoff)
+        elif latency_ms is not None:
+            self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "rejected": self.rejected,
+        }
+
+
+class ProviderGuard:
+    """Circuit breaker + concurrency limiter for one provider"""
+
+    def __init__(self, provider: str, settings: Settings):
+        self.provider = provider
+        self.breaker = CircuitBreaker(
+            failure_threshold=settings.LLM_BREAKER_FAILURE_THRESHOLD,
+            open_seconds=settings.LLM_BREAKER_OPEN_SECONDS,
+        )
+        self.limiter = AIMDLimiter(
+            initial=settings.LLM_LIMIT_INITIAL,
+            min_limit=settings.LLM_LIMIT_MIN,
+            max_limit=settings.LLM_LIMIT_MAX,
+            slow_call_ms=settings.LLM_LIMIT_SLOW_CALL_MS,
+        )
+
+    def acquire(self):
+        """
+        Admit a call or raise ProviderUnavailableError right away.
+        Every admitted call must end with on_success/on_error/on_cancel.
+        """
+        if not self.limiter.try_acquire():
+            raise ProviderUnavailableError(
+                message=f"{self.provider} concurrency limit reached ({int(self.limiter.limit)} in flight)",
+                provider=self.provider,
+            )
+        if not self.breaker.allow():
+            self.limiter.release()
+            raise ProviderUnavailableError(
+                message=f"{self.provider} circuit breaker is open",
+                provider=self.provider,
+            )
+
+    def on_success(self, latency_ms: float):
+        self.breaker.on_success()
+        self.limiter.release(latency_ms)
+
+    def on_error(self, error: LLMProviderError, latency_ms: float):
+        if is_provider_failure(error):
+            self.breaker.on_failure()
+            self.limiter.release(latency_ms, failed=True)
+        else:
+            self.breaker.on_neutral()
+            self.limiter.release()
+
+    def on_cancel(self):
+        self.breaker.on_neutral()
+        self.limiter.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "circuit": self.breaker.stats(),
+            "concurrency": self.limiter.stats(),
+        }
+
+
+# Global guards, one per provider
+_guards: Dict[str, ProviderGuard] = {}
+
+
+def get_provider_guard(provider: str) -> ProviderGuard:
+    """Get (or lazily create) the guard for a provider"""
+    guard = _guards.get(provider)
+    if guard is None:
+        guard = _guards[provider] = ProviderGuard(provider, get_settings())
+    return guard
+
+
+def get_provider_health() -> Dict[str, Any]:
+    """Breaker and limiter state per provider (for /health)"""
+    return {provider: guard.stats() for provider, guard in sorted(_guards.items())}
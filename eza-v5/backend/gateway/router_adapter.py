@@ -3,12 +3,21 @@
 Gateway Router Adapter - Unified interface for LLM providers
 """
 
-from typing import Optional, Dict, Any
+import asyncio
+import time
+from contextlib import aclosing
+from typing import Optional, Dict, Any, AsyncIterator
 from backend.config import Settings, get_settings
-from backend.gateway.providers.openai_provider import generate_openai
-from backend.gateway.providers.anthropic_provider import generate_anthropic
-from backend.gateway.providers.local_llm_provider import generate_local_llm
+from backend.gateway.providers.openai_provider import generate_openai, stream_openai
+from backend.gateway.providers.anthropic_provider import generate_anthropic, stream_anthropic
+from backend.gateway.providers.local_llm_provider import generate_local_llm, stream_local_llm
 from backend.gateway.error_mapping import map_provider_error, LLMProviderError
+from backend.gateway.hedging import provider_latency, get_hedge_budget, hedge_delay_ms
+from backend.gateway.resilience import get_provider_guard
+from backend.telemetry.metrics import observe_latency
+from backend.telemetry.tracing import span, SPAN_KIND_CLIENT
+
+PROVIDERS = ("openai", "anthropic", "local")
 
 
 async def call_llm_provider(
@@ -36,8 +45,50 @@ async def call_llm_provider(
         Generated text
     
     Raises:
-        LLMProviderError: If provider call fails
+        LLMProviderError: If provider call fails (ProviderUnavailableError
+            right away while the provider's circuit breaker is open or its
+            concurrency limit is reached)
     """
+    if provider_name not in PROVIDERS:
+        raise LLMProviderError(
+            message=f"Unknown provider: {provider_name}",
+            provider=provider_name
+        )
+    
+    # Circuit breaker + concurrency limiter: fail fast instead of queueing
+    guard = get_provider_guard(provider_name)
+    guard.acquire()
+    t0 = time.perf_counter()
+    try:
+        with span("gateway.provider_call", kind=SPAN_KIND_CLIENT, provider=provider_name, model=model or "default"):
+            output = await _call_provider(
+                provider_name, prompt, settings, model, temperature, max_tokens, metadata
+            )
+    except LLMProviderError as e:
+        latency_ms = (time.perf_counter() - t0) * 1000
+        guard.on_error(e, latency_ms)
+        observe_latency("provider_call", latency_ms, provider=provider_name, outcome="error")
+        raise
+    except BaseException:
+        guard.on_cancel()
+        raise
+    latency_ms = (time.perf_counter() - t0) * 1000
+    guard.on_success(latency_ms)
+    observe_latency("provider_call", latency_ms, provider=provider_name, outcome="ok")
+    # Successful latencies drive the hedge delay (p95 per provider)
+    provider_latency.record(provider_name, latency_ms)
+    return output
+
+
+async def _call_provider(
+    provider_name: str,
+    prompt: str,
+    settings: Optional[Settings] = None,
+    model: Optional[str] = None,
+    temperature: float = 0.7,
+    max_tokens: Optional[int] = None,
+    metadata: Optional[Dict[str, Any]] = None,
+) -> str:
     if settings is None:
         settings = get_settings()
     
@@ -84,3 +135,150 @@ async def call_llm_provider(
             provider=provider_name
         )
 
+
+
+async def call_llm_hedged(
+    provider_name: str,
+    prompt: str,
+    settings: Optional[Settings] = None,
+    model: Optional[str] = None,
+    temperature: float = 0.7,
+    max_tokens: Optional[int] = None,
+    metadata: Optional[Dict[str, Any]] = None,
+    hedge_provider: Optional[str] = None,
+) -> str:
+    """
+    Call LLM provider with request hedging
+    
+    If the primary has not answered within its p95 latency, a second
+    request goes to hedge_provider (default: FALLBACK_LLM_PROVIDER; the
+    same provider again acts as a second replica). The first good answer
+    wins and the other request is cancelled. Hedges are capped by the
+    budget (LLM_HEDGE_MAX_RATIO of primary calls).
+    
+    Raises:
+        LLMProviderError: If every request fails (the primary's error)
+    """
+    if settings is None:
+        settings = get_settings()
+    hedge_provider = hedge_provider or settings.FALLBACK_LLM_PROVIDER or provider_name
+    # Model names are provider specific: a different provider uses its default
+    hedge_model = model if hedge_provider == provider_name else None
+    
+    budget = get_hedge_budget(settings.LLM_HEDGE_MAX_RATIO)
+    budget.on_primary()
+    
+    t0 = time.perf_counter()
+    primary = asyncio.create_task(call_llm_provider(
+        provider_name, prompt, settings, model, temperature, max_tokens, metadata
+    ))
+    hedge: Optional[asyncio.Task] = None
+    delay = hedge_delay_ms(
+        provider_name,
+        default_ms=settings.LLM_HEDGE_DEFAULT_DELAY_MS,
+        min_ms=settings.LLM_HEDGE_MIN_DELAY_MS,
+    ) / 1000.0
+    
+    try:
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done or not budget.try_acquire():
+            return await primary
+        
+        hedge = asyncio.create_task(call_llm_provider(
+            hedge_provider, prompt, settings, hedge_model, temperature, max_tokens, metadata
+        ))
+        pending = {primary, hedge}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+        # Both failed: report the primary's error
+        return primary.result()
+    finally:
+        if not primary.done():
+            # Losing primary: its latency is at least the time waited so far.
+            # Recording it keeps slow calls in the p95 instead of dropping them.
+            provider_latency.record(provider_name, (time.perf_counter() - t0) * 1000)
+        for task in (primary, hedge):
+            if task is not None and not task.done():
+                task.cancel()
+
+
+async def stream_llm_provider(
+    provider_name: str,
+    prompt: str,
+    settings: Optional[Settings] = None,
+    model: Optional[str] = None,
+    temperature: float = 0.7,
+    max_tokens: Optional[int] = None,
+    metadata: Optional[Dict[str, Any]] = None,
+) -> AsyncIterator[str]:
+    """
+    Stream text deltas from an LLM provider with unified interface
+    
+    Same arguments as call_llm_provider. Closing the returned generator
+    closes the upstream HTTP stream, which stops generation at the provider.
+    
+    Yields:
+        Text deltas as they arrive
+    
+    Raises:
+        LLMProviderError: If provider call fails (before or during streaming)
+    """
+    if settings is None:
+        settings = get_settings()
+    
+    if provider_name == "openai":
+        stream = stream_openai(
+            prompt=prompt,
+            settings=settings,
+            model=model or "gpt-4",
+            temperature=temperature,
+            max_tokens=max_tokens
+        )
+    elif provider_name == "anthropic":
+        stream = stream_anthropic(
+            prompt=prompt,
+            settings=settings,
+            model=model or "claude-3-opus-20240229",
+            temperature=temperature,
+            max_tokens=max_tokens
+        )
+    elif provider_name == "local":
+        stream = stream_local_llm(
+            prompt=prompt,
+            settings=settings,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens
+        )
+    else:
+        raise LLMProviderError(
+            message=f"Unknown provider: {provider_name}",
+            provider=provider_name
+        )
+    
+    guard = get_provider_guard(provider_name)
+    guard.acquire()
+    t0 = time.perf_counter()
+    try:
+        with span("gateway.provider_stream", kind=SPAN_KIND_CLIENT, activate=False, provider=provider_name, model=model or "default"):
+            async with aclosing(stream):
+                try:
+                    async for delta in stream:
+                        yield delta
+                except Exception as e:
+                    raise map_provider_error(e, provider_name)
+    except LLMProviderError as e:
+        latency_ms = (time.perf_counter() - t0) * 1000
+        guard.on_error(e, latency_ms)
+        observe_latency("provider_stream", latency_ms, provider=provider_name, outcome="error")
+        raise
+    except BaseException:
+        # Closed early by the consumer (safety cutoff, disconnect)
+        guard.on_cancel()
+        raise
+    latency_ms = (time.perf_counter() - t0) * 1000
+    guard.on_success(latency_ms)
+    observe_latency("provider_stream", latency_ms, provider=provider_name, outcome="ok")
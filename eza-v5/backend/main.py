@@ -14,24 +14,39 @@ project_root = backend_dir.parent
 sys.path.insert(0, str(project_root))
 
 from fastapi import FastAPI
+from fastapi.responses import Response
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from backend.routers import (
     auth, standalone, proxy, proxy_lite, admin, media, autonomy,
     institution, gateway, regulator_router, btk_router, eu_ai_router,
-    platform_router, corporate_router, internal_proxy, multimodal
+    platform_router, corporate_router, internal_proxy, internal_profiler, multimodal
 )
-from backend.core.utils.dependencies import init_db, init_redis, init_vector_db
+from backend.core.utils.dependencies import init_db, init_redis, init_vector_db, AsyncSessionLocal
 from backend.learning.vector_store import VectorStore
+from backend.gateway.http_clients import init_provider_clients, close_provider_clients
+from backend.gateway.resilience import get_provider_health
+from backend.services.api_key_service import start_last_used_flusher, stop_last_used_flusher
+from backend.core.utils.security import shutdown_bcrypt_pool
+from backend.services.pdf_report_service import shutdown_pdf_renderer
+from backend.services.case_ingest_service import shutdown_case_scoring
+from backend.services.risk_service import ensure_risk_rollup
+from backend.telemetry.metrics import (
+    LatencyMiddleware,
+    OPENMETRICS_CONTENT_TYPE,
+    render_openmetrics,
+    start_metrics_snapshots,
+    stop_metrics_snapshots,
+)
+from backend.telemetry.profiler import shutdown_profiler
+from backend.telemetry.tracing import TracingMiddleware, start_trace_exporter, stop_trace_exporter
+from backend.telemetry.logger import configure_logging, stop_logging, get_logging_stats
+from backend.telemetry.audit_sink import start_audit_sink, stop_audit_sink, get_audit_sink_stats
 from backend.config import get_settings
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s %(levelname)s [%(name)s] %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S"
-)
+# Configure logging (records are written by a background thread)
+configure_logging()
 
 
 @asynccontextmanager
@@ -44,6 +59,15 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logging.warning(f"Database initialization failed (optional): {e}")
     
+    # One-time risk rollup backfill, before the first case is counted into it
+    try:
+        async with AsyncSessionLocal() as db:
+            rows = await ensure_risk_rollup(db)
+        if rows is not None:
+            logging.info(f"Risk rollup backfilled: {rows} rows")
+    except Exception as e:
+        logging.warning(f"Risk rollup backfill failed: {e}")
+    
     try:
         await init_redis()
         logging.info("Redis initialized")
@@ -64,10 +88,36 @@ async def lifespan(app: FastAPI):
         logging.warning(f"Vector store initialization failed (optional): {e}")
         app.state.vector_store = None
     
+    # Pooled HTTP clients for LLM providers (keep-alive connections)
+    init_provider_clients(get_settings())
+    logging.info("Gateway provider clients initialized")
+    
+    # Batched API key last_used_at writes
+    start_last_used_flusher()
+    
+    # Batched audit log writes
+    start_audit_sink()
+    
+    # Per-worker metrics snapshots for /metrics aggregation
+    start_metrics_snapshots()
+    
+    # Sampled request traces (OTLP/JSON file sink)
+    start_trace_exporter()
+    
     yield
     
     # Shutdown
-    # Cleanup if needed
+    await stop_trace_exporter()
+    await stop_metrics_snapshots()
+    await stop_audit_sink()
+    await stop_last_used_flusher()
+    shutdown_bcrypt_pool()
+    shutdown_pdf_renderer()
+    shutdown_case_scoring()
+    shutdown_profiler()
+    await close_provider_clients()
+    logging.info("Gateway provider clients closed")
+    stop_logging()
 
 
 settings = get_settings()
@@ -88,6 +138,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request latency histograms per route (/metrics)
+app.add_middleware(LatencyMiddleware)
+
+# Root span per request (sampled by TELEMETRY_SAMPLE_RATE)
+app.add_middleware(TracingMiddleware)
+
 # Include routers
 app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(standalone.router, prefix="/api/standalone", tags=["Standalone"])
@@ -99,6 +155,8 @@ app.include_router(autonomy.router, prefix="/api/autonomy", tags=["Autonomy"])
 app.include_router(institution.router, prefix="/api/institution", tags=["Institution"])
 app.include_router(gateway.router, prefix="/api/gateway", tags=["Gateway"])
 app.include_router(internal_proxy.router, tags=["Proxy-Internal"])
+if settings.PROFILER_ENABLED:
+    app.include_router(internal_profiler.router, tags=["Proxy-Internal"])
 app.include_router(multimodal.router, tags=["Multimodal"])
 
 # EZA-Regulation-API v1.0 routers
@@ -112,7 +170,20 @@ app.include_router(corporate_router.router, prefix="/api/corporate", tags=["Corp
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "ok", "version": "6.0.0", "env": settings.ENV}
+    return {
+        "status": "ok",
+        "version": "6.0.0",
+        "env": settings.ENV,
+        "providers": get_provider_health(),
+        "audit_sink": get_audit_sink_stats(),
+        "logging": get_logging_stats(),
+    }
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Counters and latency histograms of all workers (OpenMetrics text format)"""
+    return Response(content=render_openmetrics(), media_type=OPENMETRICS_CONTENT_TYPE)
 
 
 @app.get("/")
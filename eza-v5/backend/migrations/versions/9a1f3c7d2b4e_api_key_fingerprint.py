@@ -0,0 +1,48 @@
+"""api_key_fingerprint
+
+Revision ID: 9a1f3c7d2b4e
+Revises: 4c2bee92df6f
+Create Date: 2026-10-18 10:00:00.000000
+
+Adds api_keys.key_fingerprint (HMAC-SHA256 of the key, unique index).
+Existing rows keep their bcrypt key_hash and a NULL fingerprint; the
+plain key is needed to compute the fingerprint, so legacy rows are
+backfilled offline from the plain keys by
+scripts/migrate_legacy_api_keys.py (until then they do not authenticate).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a1f3c7d2b4e'
+down_revision: Union[str, None] = '4c2bee92df6f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_api_keys_table() -> bool:
+    # Tables are created by init_db (create_all) and may already carry the column
+    inspector = sa.inspect(op.get_bind())
+    return inspector.has_table('api_keys')
+
+
+def _has_fingerprint_column() -> bool:
+    inspector = sa.inspect(op.get_bind())
+    return any(column['name'] == 'key_fingerprint' for column in inspector.get_columns('api_keys'))
+
+
+def upgrade() -> None:
+    if not _has_api_keys_table() or _has_fingerprint_column():
+        return
+    op.add_column('api_keys', sa.Column('key_fingerprint', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_api_keys_key_fingerprint'), 'api_keys', ['key_fingerprint'], unique=True)
+
+
+def downgrade() -> None:
+    if not _has_api_keys_table() or not _has_fingerprint_column():
+        return
+    op.drop_index(op.f('ix_api_keys_key_fingerprint'), table_name='api_keys')
+    op.drop_column('api_keys', 'key_fingerprint')
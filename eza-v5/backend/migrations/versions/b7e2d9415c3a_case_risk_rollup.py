@@ -0,0 +1,74 @@
+"""case_risk_rollup
+
+Revision ID: b7e2d9415c3a
+Revises: 9a1f3c7d2b4e
+Create Date: 2026-10-18 11:00:00.000000
+
+Adds case_risk_rollup (case counts per source, UTC day and risk matrix
+cell) and backfills it from existing cases. The application's
+create_all (init_db) may already have created the table, and cases may
+have been counted into it since, so whether the backfill is done is
+recorded in case_risk_rollup_backfill, not inferred from the rollup
+being empty (same marker as services.risk_service.ensure_risk_rollup).
+Buckets must match core.engines.eza_risk_engine.matrix_severity /
+matrix_likelihood.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2d9415c3a'
+down_revision: Union[str, None] = '9a1f3c7d2b4e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BACKFILL = """
+INSERT INTO case_risk_rollup (source, day, severity, likelihood, case_count)
+SELECT
+    source,
+    date(timezone('UTC', created_at)),
+    CASE WHEN risk_score >= 0.7 THEN 'high' WHEN risk_score >= 0.4 THEN 'medium' ELSE 'low' END,
+    CASE WHEN risk_level IN ('critical', 'high') THEN 'high' WHEN risk_level = 'medium' THEN 'medium' ELSE 'low' END,
+    count(*)
+FROM cases
+GROUP BY 1, 2, 3, 4
+"""
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if not inspector.has_table('case_risk_rollup'):
+        op.create_table(
+            'case_risk_rollup',
+            sa.Column('source', sa.String(length=50), nullable=False),
+            sa.Column('day', sa.Date(), nullable=False),
+            sa.Column('severity', sa.String(length=10), nullable=False),
+            sa.Column('likelihood', sa.String(length=10), nullable=False),
+            sa.Column('case_count', sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint('source', 'day', 'severity', 'likelihood'),
+        )
+    if not inspector.has_table('case_risk_rollup_backfill'):
+        op.create_table(
+            'case_risk_rollup_backfill',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('completed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+            sa.PrimaryKeyConstraint('id'),
+        )
+    done = bind.execute(sa.text("SELECT 1 FROM case_risk_rollup_backfill LIMIT 1")).first() is not None
+    if done:
+        return
+    if inspector.has_table('cases'):
+        op.execute("LOCK TABLE cases IN SHARE ROW EXCLUSIVE MODE")
+        op.execute("DELETE FROM case_risk_rollup")
+        op.execute(BACKFILL)
+    op.execute("INSERT INTO case_risk_rollup_backfill (id) VALUES (1)")
+
+
+def downgrade() -> None:
+    op.drop_table('case_risk_rollup_backfill')
+    op.drop_table('case_risk_rollup')
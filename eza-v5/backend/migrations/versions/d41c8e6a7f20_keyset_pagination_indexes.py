@@ -0,0 +1,50 @@
+"""keyset_pagination_indexes
+
+Revision ID: d41c8e6a7f20
+Revises: b7e2d9415c3a
+Create Date: 2026-10-18 12:00:00.000000
+
+Composite (created_at, id) indexes for keyset pagination of cases,
+audit logs and API keys (see core.utils.pagination), with the equality
+filter column first where listings filter on one.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41c8e6a7f20'
+down_revision: Union[str, None] = 'b7e2d9415c3a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ('idx_cases_created_at_id', 'cases', ['created_at', 'id']),
+    ('idx_cases_source_created_at_id', 'cases', ['source', 'created_at', 'id']),
+    ('idx_audit_logs_created_at_id', 'audit_logs', ['created_at', 'id']),
+    ('idx_audit_logs_endpoint_created_at_id', 'audit_logs', ['endpoint', 'created_at', 'id']),
+    ('idx_api_keys_user_created_at_id', 'api_keys', ['user_id', 'created_at', 'id']),
+    ('idx_api_keys_institution_created_at_id', 'api_keys', ['institution_id', 'created_at', 'id']),
+]
+
+
+def _existing_indexes(inspector, table: str) -> set:
+    return {index['name'] for index in inspector.get_indexes(table)}
+
+
+def upgrade() -> None:
+    # Tables are created by init_db (create_all) and may already carry the indexes
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns in INDEXES:
+        if inspector.has_table(table) and name not in _existing_indexes(inspector, table):
+            op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns in reversed(INDEXES):
+        if inspector.has_table(table) and name in _existing_indexes(inspector, table):
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,59 @@
+"""case_meta_data_jsonb
+
+Revision ID: e5a90b3c1d74
+Revises: d41c8e6a7f20
+Create Date: 2026-10-18 13:00:00.000000
+
+Converts cases.meta_data from a JSON string (TEXT) to JSONB, so the
+driver decodes it instead of json.loads per row. Empty strings become
+NULL.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a90b3c1d74'
+down_revision: Union[str, None] = 'd41c8e6a7f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _meta_data_type():
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('cases'):
+        return None
+    for column in inspector.get_columns('cases'):
+        if column['name'] == 'meta_data':
+            return column['type']
+    return None
+
+
+def upgrade() -> None:
+    # Tables are created by init_db (create_all) and may already use JSONB
+    column_type = _meta_data_type()
+    if column_type is None or isinstance(column_type, postgresql.JSONB):
+        return
+    op.alter_column(
+        'cases',
+        'meta_data',
+        type_=postgresql.JSONB(),
+        existing_nullable=True,
+        postgresql_using="NULLIF(meta_data, '')::jsonb",
+    )
+
+
+def downgrade() -> None:
+    column_type = _meta_data_type()
+    if column_type is None or not isinstance(column_type, postgresql.JSONB):
+        return
+    op.alter_column(
+        'cases',
+        'meta_data',
+        type_=sa.Text(),
+        existing_nullable=True,
+        postgresql_using="meta_data::text",
+    )
@@ -1,8 +1,9 @@
 # Database Models Package
 
 from backend.models.case import Case
+from backend.models.case_risk_rollup import CaseRiskRollup, CaseRiskRollupBackfill
 from backend.models.model_registry import ModelRegistry
 from backend.models.corporate_policy import CorporatePolicy
 
-__all__ = ["Case", "ModelRegistry", "CorporatePolicy"]
+__all__ = ["Case", "CaseRiskRollup", "CaseRiskRollupBackfill", "ModelRegistry", "CorporatePolicy"]
 
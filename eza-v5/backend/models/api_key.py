@@ -3,7 +3,7 @@
 API Key Model
 """
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from backend.core.utils.dependencies import Base
@@ -14,6 +14,7 @@ class APIKey(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     key_hash = Column(String, unique=True, index=True, nullable=False)
+    key_fingerprint = Column(String(64), unique=True, index=True, nullable=True)  # HMAC-SHA256, NULL on legacy bcrypt rows
     name = Column(String, nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     institution_id = Column(Integer, ForeignKey("institutions.id"), nullable=True)
@@ -25,6 +26,12 @@ class APIKey(Base):
     revoked_at = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
+    # Keyset pagination (created_at, id) per user / institution
+    __table_args__ = (
+        Index('idx_api_keys_user_created_at_id', 'user_id', 'created_at', 'id'),
+        Index('idx_api_keys_institution_created_at_id', 'institution_id', 'created_at', 'id'),
+    )
+    
     # Relationships
     user = relationship("User", back_populates="api_keys")
     institution = relationship("Institution", back_populates="api_keys")
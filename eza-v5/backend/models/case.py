@@ -4,7 +4,8 @@ Case Model
 Stores regulatory cases with risk analysis
 """
 
-from sqlalchemy import Column, Integer, String, Float, Text, DateTime, Index
+from sqlalchemy import Column, Integer, String, Float, Text, DateTime, Index, JSON
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
 from backend.core.utils.dependencies import Base
 
@@ -17,7 +18,7 @@ class Case(Base):
     risk_score = Column(Float, nullable=False, default=0.0)
     risk_level = Column(String(50), nullable=False, default="low")  # low, medium, high, critical
     source = Column(String(50), nullable=False, index=True)  # rtuk, btk, corporate, eu-ai, platform
-    meta_data = Column(Text, nullable=True)  # JSON string for additional data (renamed from metadata to avoid SQLAlchemy conflict)
+    meta_data = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True)  # Additional data, decoded by the driver (renamed from metadata to avoid SQLAlchemy conflict)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
@@ -25,5 +26,8 @@ class Case(Base):
     __table_args__ = (
         Index('idx_cases_source_risk', 'source', 'risk_level'),
         Index('idx_cases_created_at', 'created_at'),
+        # Keyset pagination (created_at, id), unfiltered and per source
+        Index('idx_cases_created_at_id', 'created_at', 'id'),
+        Index('idx_cases_source_created_at_id', 'source', 'created_at', 'id'),
     )
 
@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+"""
+Case Risk Rollup Model
+Case counts per (source, day, risk matrix cell), maintained by create_case
+"""
+
+from sqlalchemy import Column, Integer, String, Date, DateTime
+from sqlalchemy.sql import func
+from backend.core.utils.dependencies import Base
+
+
+class CaseRiskRollup(Base):
+    __tablename__ = "case_risk_rollup"
+    
+    source = Column(String(50), primary_key=True)
+    day = Column(Date, primary_key=True)  # UTC day the case was created
+    severity = Column(String(10), primary_key=True)  # low, medium, high (from risk_score)
+    likelihood = Column(String(10), primary_key=True)  # low, medium, high (from risk_level)
+    case_count = Column(Integer, nullable=False, default=0)
+
+
+class CaseRiskRollupBackfill(Base):
+    """Marker row: case_risk_rollup was built from all cases existing at that time"""
+    __tablename__ = "case_risk_rollup_backfill"
+    
+    id = Column(Integer, primary_key=True)  # Always 1
+    completed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -21,7 +21,7 @@ async def admin_dashboard(
         "user": {
             "id": current_user.id,
             "email": current_user.email,
-            "role": current_user.role.name
+            "role": current_user.role_name
         }
     }
 
@@ -8,6 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from backend.core.schemas.auth import LoginRequest, TokenResponse
 from backend.core.services.auth_service import authenticate_user, create_token_response
 from backend.core.utils.dependencies import get_db
+from backend.core.utils.security import AuthBusyError
 
 router = APIRouter()
 
@@ -18,7 +19,14 @@ async def login(
     db: AsyncSession = Depends(get_db)
 ):
     """User login endpoint"""
-    user = await authenticate_user(db, request.email, request.password)
+    try:
+        user = await authenticate_user(db, request.email, request.password)
+    except AuthBusyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"}
+        )
     
     if not user:
         raise HTTPException(
@@ -4,13 +4,14 @@ BTK Router
 Network traffic risk evaluation endpoints
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from pydantic import BaseModel
 from backend.core.utils.dependencies import get_db
 from backend.services import traffic_service, audit_service
 from backend.services.audit_service import log_operation
+from backend.core.utils.pagination import cursor_param, set_next_cursor
 
 router = APIRouter()
 
@@ -81,19 +82,23 @@ async def evaluate_traffic_risk(
 
 @router.get("/audit-log", response_model=List[AuditLogResponse])
 async def get_audit_log(
+    response: Response,
     endpoint: Optional[str] = Query(None, description="Filter by endpoint"),
     limit: int = Query(100, ge=1, le=1000),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Depends(cursor_param),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get audit logs"""
+    """Get audit logs (newest first; page with cursor or offset)"""
     try:
         logs = await audit_service.get_audit_logs(
             db=db,
             endpoint=endpoint,
             limit=limit,
-            offset=offset
+            offset=offset,
+            cursor=cursor
         )
+        set_next_cursor(response, logs, limit)
         
         # Log operation
         await log_operation(
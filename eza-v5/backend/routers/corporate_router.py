@@ -4,13 +4,14 @@ Corporate Router
 Corporate audit and policy management endpoints
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from pydantic import BaseModel
 from backend.core.utils.dependencies import get_db
 from backend.services import policy_service, audit_service
 from backend.services.audit_service import log_operation
+from backend.core.utils.pagination import cursor_param, set_next_cursor
 import json
 
 router = APIRouter()
@@ -47,17 +48,21 @@ class PolicyUpdateRequest(BaseModel):
 
 @router.get("/audit", response_model=List[AuditItemResponse])
 async def get_audit(
+    response: Response,
     limit: int = Query(100, ge=1, le=1000),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Depends(cursor_param),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get corporate audit logs"""
+    """Get corporate audit logs (newest first; page with cursor or offset)"""
     try:
         logs = await audit_service.get_audit_logs(
             db=db,
             limit=limit,
-            offset=offset
+            offset=offset,
+            cursor=cursor
         )
+        set_next_cursor(response, logs, limit)
         
         # Log operation
         await log_operation(
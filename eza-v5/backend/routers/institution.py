@@ -12,7 +12,7 @@ from backend.core.utils.dependencies import get_db, require_internal
 from backend.models.institution import Institution
 from backend.models.application import Application
 from backend.models.api_key import APIKey
-from backend.core.utils.security import hash_api_key
+from backend.core.utils.security import hash_api_key, api_key_fingerprint
 import secrets
 
 router = APIRouter()
@@ -152,11 +152,12 @@ async def create_api_key(
     
     # Generate API key
     api_key = secrets.token_urlsafe(32)
-    api_key_hash = hash_api_key(api_key)
+    api_key_hash = api_key_fingerprint(api_key)
     
     key_record = APIKey(
         name=name,
         key_hash=api_key_hash,
+        key_fingerprint=api_key_hash,
         user_id=current_user.id if current_user else 1,  # TODO: Fix when auth is enabled
         institution_id=institution_id,
         is_active=True
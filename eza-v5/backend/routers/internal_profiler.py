@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+Internal Profiler Router - On-demand CPU and allocation profiling of a worker
+(EZA internal team, see telemetry.profiler)
+"""
+
+import inspect
+from typing import Dict, Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import PlainTextResponse
+from fastapi.routing import APIRoute
+from pydantic import BaseModel, Field
+
+from backend.core.utils.dependencies import require_internal
+from backend.telemetry.profiler import (
+    MAX_SECONDS,
+    MIN_INTERVAL_MS,
+    ProfilerError,
+    start_cpu_profile,
+    stop_cpu_profile,
+    get_cpu_profile,
+    get_cpu_collapsed,
+    start_allocation_profile,
+    stop_allocation_profile,
+    get_allocation_profile,
+)
+
+router = APIRouter(prefix="/api/proxy/internal/profiler", tags=["proxy-internal"])
+
+
+class CpuProfileRequest(BaseModel):
+    seconds: float = Field(30.0, gt=0, le=MAX_SECONDS)
+    interval_ms: float = Field(10.0, ge=MIN_INTERVAL_MS, le=1000.0)
+
+
+class AllocationProfileRequest(BaseModel):
+    seconds: float = Field(30.0, gt=0, le=MAX_SECONDS)
+    endpoint: Optional[str] = Field(None, description="Route path, e.g. /api/standalone/chat (all allocations if omitted)")
+
+
+class ProfileResponse(BaseModel):
+    kind: str
+    pid: int
+    running: bool
+    seconds: float
+    started_at: float
+    stopped_at: Optional[float] = None
+    interval_ms: Optional[float] = None
+    samples: Optional[int] = None
+    stacks: Optional[int] = None
+    endpoint: Optional[str] = None
+    top: Optional[List[Dict[str, Any]]] = None
+
+
+def _not_found(kind: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"No {kind} profile on this worker")
+
+
+def _endpoint_file(request: Request, path: str) -> str:
+    """Source file of the endpoint function serving route path"""
+    for route in request.app.routes:
+        if isinstance(route, APIRoute) and route.path == path:
+            return inspect.getsourcefile(route.endpoint)
+    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Unknown endpoint: {path}")
+
+
+@router.post("/cpu/start", response_model=ProfileResponse, status_code=status.HTTP_202_ACCEPTED, response_model_exclude_none=True)
+async def start_cpu(
+    req: CpuProfileRequest,
+    current_user = Depends(require_internal())
+):
+    """Start sampling this worker's CPU for req.seconds"""
+    try:
+        return start_cpu_profile(req.seconds, req.interval_ms)
+    except ProfilerError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+
+@router.post("/cpu/stop", response_model=ProfileResponse, response_model_exclude_none=True)
+async def stop_cpu(
+    top: int = Query(30, ge=1, le=500),
+    current_user = Depends(require_internal())
+):
+    """Stop the CPU profile early and return its top functions"""
+    if stop_cpu_profile() is None:
+        raise _not_found("CPU")
+    return get_cpu_profile(top)
+
+
+@router.get("/cpu", response_model=ProfileResponse, response_model_exclude_none=True)
+async def get_cpu(
+    top: int = Query(30, ge=1, le=500),
+    current_user = Depends(require_internal())
+):
+    """Status and top functions by self time of the current or last CPU profile"""
+    profile = get_cpu_profile(top)
+    if profile is None:
+        raise _not_found("CPU")
+    return profile
+
+
+@router.get("/cpu/collapsed", response_class=PlainTextResponse)
+async def get_cpu_collapsed_stacks(
+    current_user = Depends(require_internal())
+):
+    """Collapsed stacks ("frame;frame count" lines) for flamegraph.pl / speedscope"""
+    collapsed = get_cpu_collapsed()
+    if collapsed is None:
+        raise _not_found("CPU")
+    return PlainTextResponse(collapsed)
+
+
+@router.post("/allocations/start", response_model=ProfileResponse, status_code=status.HTTP_202_ACCEPTED, response_model_exclude_none=True)
+async def start_allocations(
+    req: AllocationProfileRequest,
+    request: Request,
+    current_user = Depends(require_internal())
+):
+    """Start a tracemalloc session, optionally limited to one endpoint"""
+    filename = _endpoint_file(request, req.endpoint) if req.endpoint else None
+    try:
+        return start_allocation_profile(req.seconds, filename=filename, endpoint=req.endpoint)
+    except ProfilerError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+
+@router.post("/allocations/stop", response_model=ProfileResponse, response_model_exclude_none=True)
+async def stop_allocations(
+    top: int = Query(30, ge=1, le=500),
+    current_user = Depends(require_internal())
+):
+    """Stop the allocation profile early and return its top lines"""
+    if stop_allocation_profile() is None:
+        raise _not_found("allocation")
+    return get_allocation_profile(top)
+
+
+@router.get("/allocations", response_model=ProfileResponse, response_model_exclude_none=True)
+async def get_allocations(
+    top: int = Query(30, ge=1, le=500),
+    current_user = Depends(require_internal())
+):
+    """Status and top allocating lines of the current or last allocation profile"""
+    profile = get_allocation_profile(top)
+    if profile is None:
+        raise _not_found("allocation")
+    return profile
@@ -25,6 +25,8 @@ from backend.core.engines.deception_engine import analyze_deception
 from backend.core.engines.psych_pressure import analyze_psychological_pressure
 from backend.core.engines.legal_risk import analyze_legal_risk
 from backend.core.engines.safety_graph import build_safety_graph
+from backend.core.utils.pipeline import PipelineDAG, Ref
+from backend.telemetry.tracing import span, trace_summary
 
 router = APIRouter(prefix="/api/proxy/internal", tags=["proxy-internal"])
 
@@ -60,6 +62,54 @@ class HistoryItem(BaseModel):
     summary: str
 
 
+def _select_policy_pack(policy_pack: str):
+    """Policy pack instance for the requested pack name (default: EU AI)"""
+    policy_pack_map = {
+        "rtuk": RTUKPolicyPack,
+        "btk": BTKPolicyPack,
+        "eu_ai": EUAIPolicyPack,
+        "oecd": OECDPolicyPack
+    }
+    return policy_pack_map.get(policy_pack, EUAIPolicyPack)()
+
+
+def _evaluate_policy(
+    selected_policy,
+    input_text: str,
+    output_text: str,
+    input_analysis: Dict[str, Any],
+    output_analysis: Dict[str, Any],
+    alignment: Dict[str, Any],
+    eza_score: Dict[str, Any],
+) -> Dict[str, Any]:
+    meta = {
+        "eza_score": eza_score,
+        "input_analysis": input_analysis,
+        "output_analysis": output_analysis,
+        "alignment": alignment
+    }
+    return selected_policy.evaluate(
+        input_text=input_text,
+        output_text=output_text,
+        meta=meta
+    )
+
+
+def _build_report(
+    input_text: str,
+    output_text: str,
+    input_analysis: Dict[str, Any],
+    output_analysis: Dict[str, Any],
+    alignment: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Report structure consumed by the deep engines"""
+    return {
+        "input": {"raw_text": input_text, "analysis": input_analysis},
+        "output": {"raw_text": output_text, "analysis": output_analysis},
+        "alignment": alignment
+    }
+
+
 async def run_debug_pipeline(
     text: str,
     provider: str = "openai",
@@ -71,20 +121,8 @@ async def run_debug_pipeline(
     Returns complete debug payload
     """
     request_id = str(uuid.uuid4())
-    start_time = time.time()
-    timings = {
-        "model_calls": {},
-        "analysis_ms": {}
-    }
-    logs = []
-    
-    # Input processing
-    input_start = time.time()
+    start_time = time.perf_counter()
     normalized_text = text.strip()
-    input_analysis = analyze_input(normalized_text)
-    input_time = (time.time() - input_start) * 1000
-    timings["analysis_ms"]["input_analysis"] = input_time
-    logs.append({"step": "input_analysis", "ms": input_time})
     
     # Model routing decision (simplified)
     router_decision = {
@@ -93,120 +131,97 @@ async def run_debug_pipeline(
         "reason": "manual_selection"
     }
     used_models = [provider]
-    model_outputs = {}
-    
-    # LLM call
-    model_start = time.time()
-    try:
-        settings = get_settings()
-        output = await call_llm_provider(
-            provider_name=provider,
-            prompt=normalized_text,
-            settings=settings,
-            model=model
-        )
-        model_outputs[provider] = output
-        model_time = (time.time() - model_start) * 1000
-        timings["model_calls"][provider] = model_time
-        logs.append({"step": f"model_call_{provider}", "ms": model_time})
-    except Exception as e:
-        output = f"[Error: {str(e)}]"
-        model_outputs[provider] = output
-        logs.append({"step": f"model_call_{provider}", "error": str(e)})
-    
-    # Output analysis
-    output_start = time.time()
-    output_analysis = analyze_output(output, input_analysis)
-    output_time = (time.time() - output_start) * 1000
-    timings["analysis_ms"]["output_analysis"] = output_time
-    logs.append({"step": "output_analysis", "ms": output_time})
+    model_errors: Dict[str, str] = {}
     
-    # Alignment
-    alignment_start = time.time()
-    alignment_result = compute_alignment(input_analysis, output_analysis)
-    alignment_time = (time.time() - alignment_start) * 1000
-    timings["analysis_ms"]["alignment"] = alignment_time
-    logs.append({"step": "alignment", "ms": alignment_time})
+    async def call_model() -> str:
+        try:
+            return await call_llm_provider(
+                provider_name=provider,
+                prompt=normalized_text,
+                settings=get_settings(),
+                model=model
+            )
+        except Exception as e:
+            model_errors[provider] = str(e)
+            return f"[Error: {str(e)}]"
     
-    # EZA Score
-    score_start = time.time()
-    eza_score = compute_score(input_analysis, output_analysis, alignment_result)
-    score_time = (time.time() - score_start) * 1000
-    timings["analysis_ms"]["eza_score"] = score_time
-    logs.append({"step": "eza_score", "ms": score_time})
-    
-    # Policy pack evaluation
-    policy_start = time.time()
-    policy_pack_map = {
-        "rtuk": RTUKPolicyPack(),
-        "btk": BTKPolicyPack(),
-        "eu_ai": EUAIPolicyPack(),
-        "oecd": OECDPolicyPack()
-    }
-    selected_policy = policy_pack_map.get(policy_pack, EUAIPolicyPack())
-    meta = {
-        "eza_score": eza_score,
-        "input_analysis": input_analysis,
-        "output_analysis": output_analysis,
-        "alignment": alignment_result
-    }
-    policy_result = selected_policy.evaluate(
-        input_text=normalized_text,
-        output_text=output,
-        meta=meta
+    # Pipeline DAG: input analysis and policy pack setup run while the
+    # LLM call is in flight; deep engines (optional, can be slow) run in
+    # parallel once the output exists and never fail the pipeline.
+    dag = PipelineDAG("proxy_internal")
+    dag.add("model_call", call_model)
+    dag.add("input_analysis", analyze_input, normalized_text)
+    dag.add("policy_pack", _select_policy_pack, policy_pack)
+    dag.add("output_analysis", analyze_output, Ref("model_call"), Ref("input_analysis"))
+    dag.add("alignment", compute_alignment, Ref("input_analysis"), Ref("output_analysis"))
+    dag.add("eza_score", compute_score, Ref("input_analysis"), Ref("output_analysis"), Ref("alignment"))
+    dag.add(
+        "policy_evaluation",
+        _evaluate_policy,
+        Ref("policy_pack"), normalized_text, Ref("model_call"),
+        Ref("input_analysis"), Ref("output_analysis"), Ref("alignment"), Ref("eza_score"),
     )
-    policy_time = (time.time() - policy_start) * 1000
-    timings["analysis_ms"]["policy_evaluation"] = policy_time
-    logs.append({"step": "policy_evaluation", "ms": policy_time})
-    
-    # Deep analysis engines (optional, can be slow)
-    deception_result = None
-    psych_pressure_result = None
-    legal_risk_result = None
-    context_graph_result = None
-    
-    try:
-        deception_start = time.time()
-        deception_result = analyze_deception(output, {
-            "input": {"raw_text": normalized_text, "analysis": input_analysis},
-            "output": {"raw_text": output, "analysis": output_analysis},
-            "alignment": alignment_result
-        }, memory=None)
-        deception_time = (time.time() - deception_start) * 1000
-        timings["analysis_ms"]["deception"] = deception_time
-        logs.append({"step": "deception", "ms": deception_time})
-    except Exception as e:
-        logs.append({"step": "deception", "error": str(e)})
-    
-    try:
-        psych_start = time.time()
-        psych_pressure_result = analyze_psychological_pressure(output, memory=None)
-        psych_time = (time.time() - psych_start) * 1000
-        timings["analysis_ms"]["psychological_pressure"] = psych_time
-        logs.append({"step": "psychological_pressure", "ms": psych_time})
-    except Exception as e:
-        logs.append({"step": "psychological_pressure", "error": str(e)})
+    dag.add(
+        "report",
+        _build_report,
+        normalized_text, Ref("model_call"), Ref("input_analysis"), Ref("output_analysis"), Ref("alignment"),
+    )
+    dag.add("deception", analyze_deception, Ref("model_call"), Ref("report"), memory=None, optional=True)
+    dag.add("psychological_pressure", analyze_psychological_pressure, Ref("model_call"), memory=None, optional=True)
+    dag.add(
+        "legal_risk",
+        analyze_legal_risk, Ref("input_analysis"), Ref("output_analysis"), Ref("report"),
+        optional=True,
+    )
+    dag.add(
+        "context_graph",
+        build_safety_graph, Ref("input_analysis"), Ref("output_analysis"), Ref("alignment"),
+        optional=True,
+    )
+    # Debug runs are always traced, whatever TELEMETRY_SAMPLE_RATE says
+    with span("proxy_internal.debug_pipeline", force=True, request_id=request_id) as trace:
+        results = await dag.run()
     
-    try:
-        legal_start = time.time()
-        legal_risk_result = analyze_legal_risk(normalized_text, output)
-        legal_time = (time.time() - legal_start) * 1000
-        timings["analysis_ms"]["legal_risk"] = legal_time
-        logs.append({"step": "legal_risk", "ms": legal_time})
-    except Exception as e:
-        logs.append({"step": "legal_risk", "error": str(e)})
+    output = results["model_call"]
+    model_outputs = {provider: output}
+    input_analysis = results["input_analysis"]
+    output_analysis = results["output_analysis"]
+    alignment_result = results["alignment"]
+    eza_score = results["eza_score"]
+    deception_result = results["deception"]
+    psych_pressure_result = results["psychological_pressure"]
+    legal_risk_result = results["legal_risk"]
+    context_graph_result = results["context_graph"]
     
-    try:
-        graph_start = time.time()
-        context_graph_result = build_safety_graph(input_analysis, output_analysis, alignment_result)
-        graph_time = (time.time() - graph_start) * 1000
-        timings["analysis_ms"]["context_graph"] = graph_time
-        logs.append({"step": "context_graph", "ms": graph_time})
-    except Exception as e:
-        logs.append({"step": "context_graph", "error": str(e)})
+    # Timings and step logs (in completion order)
+    dag_timings = dag.timings()
+    timings = {
+        "model_calls": {},
+        "analysis_ms": {},
+        "critical_path": dag_timings["critical_path"],
+        "critical_path_ms": dag_timings["critical_path_ms"],
+        "trace_id": trace.trace_id,
+        "spans": trace_summary(trace.trace_id),
+    }
+    logs = []
+    errors = dict(dag.errors)
+    for step, node_timing in sorted(dag_timings["nodes"].items(), key=lambda item: item[1]["end_ms"]):
+        if step in ("policy_pack", "report"):
+            continue
+        if step == "model_call":
+            if provider in model_errors:
+                logs.append({"step": f"model_call_{provider}", "error": model_errors[provider]})
+            else:
+                timings["model_calls"][provider] = node_timing["ms"]
+                logs.append({"step": f"model_call_{provider}", "ms": node_timing["ms"]})
+        elif step in errors:
+            logs.append({"step": step, "error": errors[step]})
+        else:
+            timings["analysis_ms"][step] = node_timing["ms"]
+            logs.append({"step": step, "ms": node_timing["ms"]})
     
     # Calculate total time
-    total_time = (time.time() - start_time) * 1000
+    total_time = (time.perf_counter() - start_time) * 1000
     timings["total_ms"] = total_time
     
     # Determine risk level and safety level
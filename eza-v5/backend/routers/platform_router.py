@@ -4,13 +4,15 @@ Platform Router
 API key management and content stream endpoints
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from pydantic import BaseModel
 from backend.core.utils.dependencies import get_db
-from backend.services import api_key_service
+from backend.services import api_key_service, risk_service, report_service
 from backend.services.audit_service import log_operation
+from backend.core.utils.pagination import cursor_param, set_next_cursor
 from datetime import datetime
 
 router = APIRouter()
@@ -59,19 +61,33 @@ class StreamItem(BaseModel):
     timestamp: str
 
 
+class RiskMatrixResponse(BaseModel):
+    matrix: List[List[dict]]
+    total_cases: int
+    summary: dict
+
+
 @router.get("/api-keys", response_model=List[ApiKeyListResponse])
 async def list_api_keys(
+    response: Response,
     user_id: Optional[int] = Query(None, description="Filter by user ID"),
     institution_id: Optional[int] = Query(None, description="Filter by institution ID"),
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Depends(cursor_param),
     db: AsyncSession = Depends(get_db)
 ):
-    """List API keys"""
+    """List API keys (newest first; page with cursor or offset)"""
     try:
         api_keys = await api_key_service.list_api_keys(
             db=db,
             user_id=user_id,
-            institution_id=institution_id
+            institution_id=institution_id,
+            limit=limit,
+            offset=offset,
+            cursor=cursor
         )
+        set_next_cursor(response, api_keys, limit)
         
         # Log operation
         await log_operation(
@@ -214,20 +230,23 @@ async def revoke_api_key(
 
 @router.get("/stream", response_model=List[StreamItem])
 async def get_stream(
+    response: Response,
     limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Depends(cursor_param),
     db: AsyncSession = Depends(get_db)
 ):
     """Get content moderation stream (mock event stream)"""
     try:
         # Mock stream data - in production, this would be a real-time stream
-        from backend.services.case_service import list_cases
+        from backend.services.case_service import list_case_previews
         
-        cases = await list_cases(db=db, limit=limit)
+        cases = await list_case_previews(db=db, limit=limit, cursor=cursor, preview_chars=100)
+        set_next_cursor(response, cases, limit)
         
         stream_items = [
             StreamItem(
                 id=f"stream_{case.id}",
-                content=case.text[:100] + "..." if len(case.text) > 100 else case.text,
+                content=case.preview[:100] + "..." if len(case.preview) > 100 else case.preview,
                 risk_score=case.risk_score,
                 timestamp=case.created_at.isoformat() if case.created_at else datetime.utcnow().isoformat()
             )
@@ -259,3 +278,63 @@ async def get_stream(
             detail=f"Error fetching stream: {str(e)}"
         )
 
+
+
+@router.get("/risk-matrix", response_model=RiskMatrixResponse)
+async def get_risk_matrix(
+    source: Optional[str] = Query(None, description="Filter by source"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get 3x3 risk matrix heatmap"""
+    try:
+        matrix_data = await risk_service.compute_risk_matrix_from_db(
+            db=db,
+            source=source
+        )
+        
+        # Log operation
+        await log_operation(
+            db=db,
+            endpoint="/platform/risk-matrix",
+            method="GET",
+            actor="system",
+            result="success"
+        )
+        
+        return RiskMatrixResponse(**matrix_data)
+    except Exception as e:
+        await log_operation(
+            db=db,
+            endpoint="/platform/risk-matrix",
+            method="GET",
+            actor="system",
+            result="error",
+            meta={"error": str(e)}
+        )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error computing risk matrix: {str(e)}"
+        )
+
+
+@router.get("/reports/export")
+async def export_report(
+    format: str = Query("json", regex="^(json|ndjson|csv)$"),
+    source: Optional[str] = Query(None, description="Filter by source"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Stream the platform report with every case (JSON, NDJSON or CSV)"""
+    await log_operation(
+        db=db,
+        endpoint="/platform/reports/export",
+        method="GET",
+        actor="system",
+        result="success",
+        meta={"format": format, "source": source}
+    )
+    
+    return StreamingResponse(
+        report_service.export_report(report_type="platform", source=source, format=format),
+        media_type=report_service.EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="platform_report.{format}"'}
+    )
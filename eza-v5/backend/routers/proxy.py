@@ -8,6 +8,7 @@ Production-ready with detailed error reporting for EZA team
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
 from typing import Optional, Literal, Dict, Any
+from backend.config import get_settings
 from backend.core.utils.dependencies import require_internal
 from backend.core.engines.input_analyzer import analyze_input
 from backend.core.engines.model_router import route_model, LLMProviderError
@@ -19,6 +20,8 @@ from backend.core.engines.deception_engine import analyze_deception
 from backend.core.engines.psych_pressure import analyze_psychological_pressure
 from backend.core.engines.legal_risk import analyze_legal_risk
 from backend.core.engines.safe_rewrite import safe_rewrite
+from backend.core.engines.early_decision import early_decision
+from backend.core.utils.pipeline import PipelineDAG, Ref
 
 router = APIRouter()
 
@@ -40,6 +43,26 @@ class ProxyEvalResponse(BaseModel):
     error: Optional[Dict[str, Any]] = None
 
 
+def _build_input_report(message: str, input_analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """Input side of the report, available before the LLM answers"""
+    return {"input": {"raw_text": message, "analysis": input_analysis}}
+
+
+def _build_report(
+    message: str,
+    llm_output: str,
+    input_analysis: Dict[str, Any],
+    output_analysis: Dict[str, Any],
+    alignment: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Report structure consumed by the deep engines"""
+    return {
+        "input": {"raw_text": message, "analysis": input_analysis},
+        "output": {"raw_text": llm_output, "analysis": output_analysis},
+        "alignment": alignment
+    }
+
+
 @router.post("/eval", response_model=ProxyEvalResponse)
 async def proxy_eval(
     request: ProxyEvalRequest,
@@ -52,19 +75,80 @@ async def proxy_eval(
     mode = f"proxy_{request.depth}"
     
     try:
-        # 1. Input analysis
-        input_analysis = analyze_input(request.message)
-        
-        # 2. Get raw model output with error handling
+        # 1-7. Pipeline DAG: input-only work (input analysis, deep engines
+        # on the user message) runs while the LLM call is in flight
         depth_mode: Literal["fast", "deep"] = request.depth
-        try:
-            llm_output = await route_model(
-                prompt=request.message,
-                depth=depth_mode,
-                temperature=0.2,
-                max_tokens=512 if depth_mode == "fast" else 1024,
-                mode=mode,
+        dag = PipelineDAG(mode)
+        settings = get_settings()
+        if settings.EARLY_DECISION_PROXY != "off":
+            # Early decision needs the input analysis before the LLM call
+            input_analysis = analyze_input(request.message)
+            decision = early_decision(
+                request.message,
+                input_analysis,
+                policy=settings.EARLY_DECISION_PROXY,
+                risk_threshold=settings.EARLY_DECISION_RISK_THRESHOLD,
             )
+            if decision:
+                return ProxyEvalResponse(
+                    ok=True,
+                    mode=mode,
+                    raw_output=None,
+                    safe_output=decision["safe_output"],
+                    analysis={
+                        "input": input_analysis,
+                        "alignment": decision["alignment"],
+                        "early_decision": {k: v for k, v in decision.items() if k != "safe_output"},
+                    },
+                    safety="Blocked",
+                    confidence=0.95,
+                )
+            dag.add_value("input_analysis", input_analysis)
+        else:
+            dag.add("input_analysis", analyze_input, request.message)
+        dag.add(
+            "llm",
+            route_model,
+            prompt=request.message,
+            depth=depth_mode,
+            temperature=0.2,
+            max_tokens=512 if depth_mode == "fast" else 1024,
+            mode=mode,
+        )
+        if request.depth == "deep":
+            # Deep engines that only read the user message (the report they
+            # get carries the input side only, the output does not exist yet)
+            dag.add("input_report", _build_input_report, request.message, Ref("input_analysis"))
+            dag.add("deception", analyze_deception, request.message, Ref("input_report"))
+            dag.add("psychological_pressure", analyze_psychological_pressure, request.message)
+        dag.add("output_analysis", analyze_output, Ref("llm"), Ref("input_analysis"))
+        dag.add("alignment", compute_alignment, Ref("input_analysis"), Ref("output_analysis"))
+        dag.add("redirect", should_redirect, Ref("input_analysis"), Ref("output_analysis"), Ref("alignment"))
+        dag.add(
+            "score",
+            compute_score,
+            Ref("input_analysis"), Ref("output_analysis"), Ref("alignment"), Ref("redirect"),
+        )
+        # 7. Safe Rewrite - ALWAYS run safe_rewrite
+        dag.add(
+            "safe_output",
+            safe_rewrite,
+            user_message=request.message,
+            llm_output=Ref("llm"),
+            input_analysis=Ref("input_analysis"),
+            output_analysis=Ref("output_analysis"),
+            alignment=Ref("alignment"),
+        )
+        if request.depth == "deep":
+            dag.add(
+                "report",
+                _build_report,
+                request.message, Ref("llm"), Ref("input_analysis"), Ref("output_analysis"), Ref("alignment"),
+            )
+            dag.add("legal_risk", analyze_legal_risk, Ref("input_analysis"), Ref("output_analysis"), Ref("report"))
+        
+        try:
+            results = await dag.run()
         except LLMProviderError as e:
             # Return detailed error for EZA team
             return ProxyEvalResponse(
@@ -78,26 +162,13 @@ async def proxy_eval(
                 }
             )
         
-        # 3. Output analysis
-        output_analysis = analyze_output(llm_output, input_analysis)
-        
-        # 4. Alignment
-        alignment = compute_alignment(input_analysis, output_analysis)
-        
-        # 5. Redirect
-        redirect = should_redirect(input_analysis, output_analysis, alignment)
-        
-        # 6. Score
-        score_result = compute_score(input_analysis, output_analysis, alignment, redirect)
-        
-        # 7. Safe Rewrite - ALWAYS run safe_rewrite
-        safe_output = safe_rewrite(
-            user_message=request.message,
-            llm_output=llm_output,
-            input_analysis=input_analysis,
-            output_analysis=output_analysis,
-            alignment=alignment
-        )
+        llm_output = results["llm"]
+        input_analysis = results["input_analysis"]
+        output_analysis = results["output_analysis"]
+        alignment = results["alignment"]
+        redirect = results["redirect"]
+        score_result = results["score"]
+        safe_output = results["safe_output"]
         
         # 8. Build final decision
         final_decision = {
@@ -120,21 +191,15 @@ async def proxy_eval(
             "output": output_analysis,
             "alignment": alignment,
             "final": final_decision,
-            "eza_score": eza_score_breakdown
+            "eza_score": eza_score_breakdown,
+            "timings": dag.timings(),
         }
         
         # 11. Deep analysis if requested
         if request.depth == "deep":
-            report = {
-                "input": {"raw_text": request.message, "analysis": input_analysis},
-                "output": {"raw_text": llm_output, "analysis": output_analysis},
-                "alignment": alignment
-            }
-            
-            # Deep engines
-            deception = analyze_deception(request.message, report)
-            psych_pressure = analyze_psychological_pressure(request.message)
-            legal_risk = analyze_legal_risk(input_analysis, output_analysis, report)
+            deception = results["deception"]
+            psych_pressure = results["psychological_pressure"]
+            legal_risk = results["legal_risk"]
             
             # Placeholder functions for missing deep engines
             reasoning_shield: Dict[str, Any] = {}  # Placeholder
@@ -4,14 +4,17 @@ Regulator Router (RTÜK)
 Regulatory case management endpoints
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from fastapi.responses import StreamingResponse, FileResponse, JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Optional
+from typing import List, Optional, Any, Dict
 from pydantic import BaseModel
 from backend.core.utils.dependencies import get_db
-from backend.services import case_service, risk_service, report_service
+from backend.config import get_settings
+from backend.services import case_service, case_ingest_service, risk_service, report_service, pdf_report_service
 from backend.services.audit_service import log_operation
-import json
+from backend.core.utils.pagination import cursor_param, set_next_cursor
+import tempfile
 
 router = APIRouter()
 
@@ -30,6 +33,27 @@ class CaseResponse(BaseModel):
         from_attributes = True
 
 
+class BulkCaseRequest(BaseModel):
+    cases: List[Any]  # {"text", "source"?, "metadata"?}; validated per item
+    source: str = "rtuk"  # For items without a source
+
+
+class BulkCaseResult(BaseModel):
+    index: int
+    id: Optional[int] = None
+    risk_score: Optional[float] = None
+    risk_level: Optional[str] = None
+    created_at: Optional[str] = None
+    error: Optional[str] = None
+
+
+class BulkCaseResponse(BaseModel):
+    total: int
+    created: int
+    failed: int
+    results: List[BulkCaseResult]
+
+
 class RiskMatrixResponse(BaseModel):
     matrix: List[List[dict]]
     total_cases: int
@@ -41,23 +65,49 @@ class ReportResponse(BaseModel):
     content: dict
 
 
+class ReportJobResponse(BaseModel):
+    job_id: str
+    status: str
+    status_url: str
+    download_url: str
+    error: Optional[str] = None
+
+
+def _report_job_response(job: dict) -> ReportJobResponse:
+    return ReportJobResponse(
+        job_id=job["job_id"],
+        status=job["status"],
+        status_url=f"/api/regulator/reports/jobs/{job['job_id']}",
+        download_url=f"/api/regulator/reports/jobs/{job['job_id']}/download",
+        error=job.get("error")
+    )
+
+
+def _pdf_file_response(path) -> FileResponse:
+    return FileResponse(path, media_type="application/pdf", filename="rtuk_report.pdf")
+
+
 @router.get("/cases", response_model=List[CaseResponse])
 async def get_cases(
+    response: Response,
     source: Optional[str] = Query(None, description="Filter by source"),
     risk_level: Optional[str] = Query(None, description="Filter by risk level"),
     limit: int = Query(100, ge=1, le=1000),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Depends(cursor_param),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get regulatory cases"""
+    """Get regulatory cases (newest first; page with cursor or offset)"""
     try:
         cases = await case_service.list_cases(
             db=db,
             source=source,
             risk_level=risk_level,
             limit=limit,
-            offset=offset
+            offset=offset,
+            cursor=cursor
         )
+        set_next_cursor(response, cases, limit)
         
         # Log operation
         await log_operation(
@@ -76,7 +126,7 @@ async def get_cases(
                 risk_score=case.risk_score,
                 risk_level=case.risk_level,
                 source=case.source,
-                metadata=json.loads(case.meta_data) if case.meta_data else None,
+                metadata=case.meta_data or None,
                 created_at=case.created_at.isoformat() if case.created_at else ""
             )
             for case in cases
@@ -96,6 +146,72 @@ async def get_cases(
         )
 
 
+@router.post("/cases:bulk", response_model=BulkCaseResponse, response_model_exclude_none=True)
+async def create_cases_bulk(
+    request: BulkCaseRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Create many cases (risk-scored in chunks, one transaction per chunk).
+    Per-item errors are reported in results and do not fail the batch.
+    """
+    max_items = get_settings().CASE_BULK_MAX_ITEMS
+    if len(request.cases) > max_items:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {max_items} cases per request; use /cases:bulk-ndjson for larger feeds"
+        )
+    
+    results: List[Dict[str, Any]] = []
+    async for chunk_results in case_ingest_service.ingest_cases(db, request.cases, source=request.source):
+        results.extend(chunk_results)
+    summary = case_ingest_service.summarize(results)
+    
+    await log_operation(
+        db=db,
+        endpoint="/regulator/cases:bulk",
+        method="POST",
+        actor="system",
+        result="success" if not summary["failed"] else "partial",
+        meta=summary
+    )
+    
+    return BulkCaseResponse(**summary, results=results)
+
+
+@router.post("/cases:bulk-ndjson")
+async def create_cases_bulk_ndjson(
+    request: Request,
+    source: str = Query("rtuk", description="Source for items without one"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Create cases from an NDJSON body (one {"text", "source"?, "metadata"?}
+    per line, any number of lines). Responds with NDJSON: one result per
+    line (index = position among non-empty lines), then a summary line.
+    """
+    out = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    summary = await case_ingest_service.ingest_ndjson(db, request.stream(), out, source=source)
+    out.seek(0)
+    
+    await log_operation(
+        db=db,
+        endpoint="/regulator/cases:bulk-ndjson",
+        method="POST",
+        actor="system",
+        result="success" if not summary["failed"] else "partial",
+        meta=summary
+    )
+    
+    return StreamingResponse(_iter_file(out), media_type="application/x-ndjson")
+
+
+def _iter_file(file, chunk_size: int = 64 * 1024):
+    with file:
+        while chunk := file.read(chunk_size):
+            yield chunk
+
+
 @router.get("/risk-matrix", response_model=RiskMatrixResponse)
 async def get_risk_matrix(
     source: Optional[str] = Query(None, description="Filter by source"),
@@ -138,7 +254,15 @@ async def get_reports(
     format: str = Query("json", regex="^(json|pdf)$"),
     db: AsyncSession = Depends(get_db)
 ):
-    """Generate RTÜK regulatory report"""
+    """
+    Generate RTÜK regulatory report
+
+    format=pdf returns the cached PDF if the cases have not changed since
+    it was rendered, otherwise 202 with a render job to poll.
+    """
+    if format == "pdf":
+        return await _get_pdf_report(db)
+
     try:
         report = await report_service.generate_rtuk_report(
             db=db,
@@ -170,3 +294,76 @@ async def get_reports(
             detail=f"Error generating report: {str(e)}"
         )
 
+
+
+@router.get("/reports/export")
+async def export_report(
+    format: str = Query("json", regex="^(json|ndjson|csv)$"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Stream the RTÜK report with every case (JSON, NDJSON or CSV)"""
+    await log_operation(
+        db=db,
+        endpoint="/regulator/reports/export",
+        method="GET",
+        actor="system",
+        result="success",
+        meta={"format": format}
+    )
+    
+    return StreamingResponse(
+        report_service.export_report(report_type="rtuk", source="rtuk", format=format),
+        media_type=report_service.EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="rtuk_report.{format}"'}
+    )
+
+
+async def _get_pdf_report(db: AsyncSession):
+    try:
+        job = await pdf_report_service.request_pdf_report(db, report_type="rtuk", source="rtuk")
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error generating report: {str(e)}"
+        )
+
+    await log_operation(
+        db=db,
+        endpoint="/regulator/reports",
+        method="GET",
+        actor="system",
+        result="success",
+        meta={"format": "pdf", "job_id": job.job_id, "status": job.status}
+    )
+
+    path = pdf_report_service.cached_pdf_path(job.job_id)
+    if job.status == pdf_report_service.DONE and path is not None:
+        return _pdf_file_response(path)
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=_report_job_response(job.to_dict()).model_dump()
+    )
+
+
+@router.get("/reports/jobs/{job_id}", response_model=ReportJobResponse)
+async def get_report_job(job_id: str):
+    """Status of a PDF report render job"""
+    job = pdf_report_service.get_report_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Report job not found")
+    return _report_job_response(job)
+
+
+@router.get("/reports/jobs/{job_id}/download")
+async def download_report_job(job_id: str):
+    """Rendered PDF of a finished report job"""
+    path = pdf_report_service.cached_pdf_path(job_id)
+    if path is None:
+        job = pdf_report_service.get_report_job(job_id)
+        if job is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Report job not found")
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Report is not ready (status: {job['status']})"
+        )
+    return _pdf_file_response(path)
@@ -5,31 +5,35 @@ Fast Core Pipeline - Production-ready minimal response
 Only returns: answer, safety, confidence
 """
 
+import json
+import time
+from contextlib import aclosing
+from typing import AsyncIterator, Dict, Any, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from backend.core.schemas.standalone import StandaloneChatRequest, StandaloneChatResponse
-from backend.core.utils.dependencies import get_db
+from backend.config import get_settings
+from backend.core.utils.dependencies import get_db, identify_request, AsyncSessionLocal
 from backend.core.engines.input_analyzer import analyze_input
-from backend.core.engines.model_router import route_model, LLMProviderError
-from backend.core.engines.output_analyzer import analyze_output
+from backend.core.engines.model_router import route_model, stream_model, LLMProviderError
+from backend.core.engines.output_analyzer import analyze_output, StreamingOutputAnalyzer
 from backend.core.engines.alignment_engine import compute_alignment
 from backend.core.engines.safe_rewrite import safe_rewrite
-from backend.core.utils.rate_limit import check_rate_limit
+from backend.core.engines.early_decision import early_decision
+from backend.core.utils.rate_limit import enforce_rate_limit
+from backend.core.utils.pipeline import PipelineDAG, Ref
+from backend.core.utils.telemetry import log_pipeline_event
 
 router = APIRouter()
 
-
-def get_optional_api_key(request: Request) -> str | None:
-    """
-    Extract API key from Authorization header if present.
-    Returns None if not present (for regular user auth).
-    """
-    auth_header = request.headers.get("Authorization", "")
-    if auth_header.startswith("Bearer "):
-        # For now, treat Bearer token as potential API key
-        # In production, distinguish between JWT and API key
-        return auth_header.replace("Bearer ", "").strip()
-    return None
+# Üretimde kullanıcıya asla hata yansıtma - LLM hatasında güvenli fallback mesajı
+TECHNICAL_FALLBACK = (
+    "Şu anda teknik bir sorun yaşıyorum, bu nedenle bu soruya doğrudan yanıt "
+    "veremiyorum. Ancak güvenlik, etik ve yasal çerçeveye uygun şekilde "
+    "yardımcı olmaya devam edeceğim. Biraz sonra tekrar denemek istersen sorunu "
+    "yeniden sorabilirsin."
+)
 
 
 @router.post("/standalone_chat", response_model=StandaloneChatResponse)
@@ -45,14 +49,15 @@ async def standalone_chat(
     Production-ready with:
     - Rate limiting
     - Fast input/output analysis
+    - Pre-LLM early decision (no provider call when the input alone decides)
     - LLM integration with safe fallback
+    - Response cache for repeated prompts (cached answers are still analyzed)
     - SafeRewrite engine
     - No deep analysis (drift, deception, psych_pressure, etc.)
     """
     # 1) Rate limit check
-    api_key = get_optional_api_key(request)
-    client_id = api_key or (request.client.host if request.client else "unknown")
-    check_rate_limit(client_id=client_id, limit=5, window=3)
+    await identify_request(request, db)
+    await enforce_rate_limit(request)
     
     # 2) Input validation
     text = (payload.text or "").strip()
@@ -62,52 +67,80 @@ async def standalone_chat(
             detail="Text is required"
         )
     
-    # 3) Fast input analysis
+    # 3) Fast input analysis + pre-LLM early decision
     input_analysis = analyze_input(text)
+    decision = _early_decision(text, input_analysis, mode="standalone")
+    if decision:
+        return _final_response("", decision["safe_output"], decision["alignment"])
+    
+    # 4-7) Pipeline DAG
+    dag = PipelineDAG("standalone")
+    dag.add_value("input_analysis", input_analysis)
+    dag.add(
+        "llm",
+        route_model,
+        prompt=text,
+        depth="fast",
+        temperature=0.2,
+        max_tokens=180,
+        mode="standalone",
+        use_cache=True,
+    )
+    dag.add("output_analysis", analyze_output, Ref("llm"), Ref("input_analysis"))
+    dag.add("alignment", compute_alignment, Ref("input_analysis"), Ref("output_analysis"))
+    dag.add(
+        "safe_output",
+        safe_rewrite,
+        user_message=text,
+        llm_output=Ref("llm"),
+        input_analysis=Ref("input_analysis"),
+        output_analysis=Ref("output_analysis"),
+        alignment=Ref("alignment"),
+    )
     
-    # 4) LLM call (fast mode) + güvenli fallback
     try:
-        raw_llm_output = await route_model(
-            prompt=text,
-            depth="fast",
-            temperature=0.2,
-            max_tokens=180,
-            mode="standalone",
-        )
+        results = await dag.run()
     except LLMProviderError as e:
-        # Üretimde kullanıcıya asla hata yansıtma.
-        # Güvenli fallback mesajı:
-        safe_fallback = (
-            "Şu anda teknik bir sorun yaşıyorum, bu nedenle bu soruya doğrudan yanıt "
-            "veremiyorum. Ancak güvenlik, etik ve yasal çerçeveye uygun şekilde "
-            "yardımcı olmaya devam edeceğim. Biraz sonra tekrar denemek istersen sorunu "
-            "yeniden sorabilirsin."
-        )
-        
-        # Return safe fallback response
+        # LLM call (fast mode) failed: güvenli fallback
         return StandaloneChatResponse(
-            answer=safe_fallback,
+            answer=TECHNICAL_FALLBACK,
             safety="Warning",
             confidence=0.5,
         )
     
-    # 5) Fast output analysis
-    output_analysis = analyze_output(raw_llm_output, input_analysis)
-    
-    # 6) Fast alignment
-    alignment = compute_alignment(input_analysis, output_analysis)
-    label = alignment.get("label", "Safe")  # Safe | Warning | Blocked
+    raw_llm_output = results["llm"]
+    safe_output = results["safe_output"]
+    alignment = results["alignment"]
     
-    # 7) Safe rewrite
-    safe_output = safe_rewrite(
-        user_message=text,
-        llm_output=raw_llm_output,
-        input_analysis=input_analysis,
-        output_analysis=output_analysis,
-        alignment=alignment,
+    # 8-9) Final safety label + minimal response
+    return _final_response(raw_llm_output, safe_output, alignment)
+
+
+def _early_decision(text: str, input_analysis: Dict[str, Any], mode: str) -> Optional[Dict[str, Any]]:
+    """Pre-LLM short-circuit with the standalone endpoint policy"""
+    settings = get_settings()
+    t0 = time.perf_counter()
+    decision = early_decision(
+        text,
+        input_analysis,
+        policy=settings.EARLY_DECISION_STANDALONE,
+        risk_threshold=settings.EARLY_DECISION_RISK_THRESHOLD,
     )
+    if decision:
+        log_pipeline_event(
+            event_type="early_decision",
+            mode=mode,
+            duration_ms=(time.perf_counter() - t0) * 1000,
+            ok=True,
+            details=f"policy={decision['policy']} reason={decision['reason']}",
+        )
+    return decision
+
+
+def _final_response(raw_llm_output: str, safe_output: str, alignment: Dict[str, Any]) -> StandaloneChatResponse:
+    """Determine the final safety label and confidence"""
+    label = alignment.get("label", "Safe")  # Safe | Warning | Blocked
     
-    # 8) Determine final safety label
     # If safe_rewrite changed the output, it means risk was detected
     if safe_output != raw_llm_output:
         label = "Blocked"
@@ -119,9 +152,117 @@ async def standalone_chat(
         if label == "Safe" and confidence < 0.95:
             confidence = 0.95
     
-    # 9) Return minimal response
     return StandaloneChatResponse(
         answer=safe_output,
         safety=label,
         confidence=confidence,
     )
+
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@router.post("/standalone_chat/stream")
+async def standalone_chat_stream(
+    payload: StandaloneChatRequest,
+    request: Request,
+):
+    """
+    Standalone chat endpoint - streaming (Server-Sent Events)
+    
+    Same pipeline as /standalone_chat, but the answer is forwarded while
+    the LLM generates it. Output analysis runs incrementally on the
+    stream; as soon as a risk category fires the provider stream is
+    closed and the SafeRewrite fallback is sent instead.
+    
+    Events:
+    - delta:   {"text": "..."}  answer text, in order
+    - done:    StandaloneChatResponse - final answer (authoritative)
+    - blocked: StandaloneChatResponse - replaces any text already shown
+    """
+    # 1) Rate limit check
+    # Short-lived session: the response stream must not hold a connection
+    async with AsyncSessionLocal() as db:
+        await identify_request(request, db)
+    await enforce_rate_limit(request)
+    
+    # 2) Input validation
+    text = (payload.text or "").strip()
+    if not text:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Text is required"
+        )
+    
+    # 3) Fast input analysis
+    input_analysis = analyze_input(text)
+    
+    return StreamingResponse(
+        _stream_chat(text, input_analysis),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _stream_chat(text: str, input_analysis: Dict[str, Any]) -> AsyncIterator[str]:
+    """Stream LLM deltas through the incremental safety guard"""
+    guard = StreamingOutputAnalyzer(input_analysis)
+    
+    def rewrite(llm_output: str, output_analysis: Dict[str, Any]) -> StandaloneChatResponse:
+        alignment = compute_alignment(input_analysis, output_analysis)
+        safe_output = safe_rewrite(
+            user_message=text,
+            llm_output=llm_output,
+            input_analysis=input_analysis,
+            output_analysis=output_analysis,
+            alignment=alignment,
+        )
+        return _final_response(llm_output, safe_output, alignment)
+    
+    # Verdict already known from the input: nothing to stream
+    decision = _early_decision(text, input_analysis, mode="standalone_stream")
+    if decision:
+        response = _final_response("", decision["safe_output"], decision["alignment"])
+        yield _sse("blocked", response.model_dump())
+        return
+    
+    # 4) LLM stream (fast mode) + incremental output analysis
+    try:
+        stream = stream_model(
+            prompt=text,
+            depth="fast",
+            temperature=0.2,
+            max_tokens=180,
+            mode="standalone",
+        )
+        async with aclosing(stream):
+            async for delta in stream:
+                released = guard.feed(delta)
+                if guard.blocked:
+                    # Closing the stream stops generation at the provider
+                    break
+                if released:
+                    yield _sse("delta", {"text": released})
+    except LLMProviderError:
+        response = StandaloneChatResponse(
+            answer=TECHNICAL_FALLBACK,
+            safety="Warning",
+            confidence=0.5,
+        )
+        yield _sse("done", response.model_dump())
+        return
+    
+    raw_llm_output = guard.text
+    
+    # 5-8) Output analysis on the received text, alignment, SafeRewrite
+    response = rewrite(raw_llm_output, guard.finish())
+    if response.answer != raw_llm_output:
+        yield _sse("blocked", response.model_dump())
+        return
+    
+    remainder = guard.remainder()
+    if remainder:
+        yield _sse("delta", {"text": remainder})
+    yield _sse("done", response.model_dump())
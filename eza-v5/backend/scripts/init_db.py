@@ -17,6 +17,7 @@ from backend.models.role import Role
 from backend.models.user import User
 from backend.core.utils.security import get_password_hash
 from backend.core.utils.dependencies import Base, DATABASE_URL
+from backend.services.risk_service import ensure_risk_rollup, rebuild_risk_rollup
 
 
 async def init_roles(session: AsyncSession):
@@ -82,6 +83,19 @@ async def create_admin_user(session: AsyncSession, email: str, password: str):
     print(f"Created admin user: {email}")
 
 
+async def init_risk_rollup(session: AsyncSession, rebuild: bool = False):
+    """Backfill the risk matrix rollup from existing cases once (again with --rebuild-risk-rollup)"""
+    if rebuild:
+        rows = await rebuild_risk_rollup(session)
+        print(f"Risk rollup rebuilt: {rows} rows")
+        return
+    rows = await ensure_risk_rollup(session)
+    if rows is None:
+        print("Risk rollup already backfilled")
+    else:
+        print(f"Risk rollup backfilled: {rows} rows")
+
+
 async def main():
     """Main initialization function"""
     engine = create_async_engine(DATABASE_URL, echo=True)
@@ -96,6 +110,10 @@ async def main():
     async with AsyncSessionLocal() as session:
         await init_roles(session)
     
+    # Risk matrix rollup (one-time backfill from existing cases)
+    async with AsyncSessionLocal() as session:
+        await init_risk_rollup(session, rebuild="--rebuild-risk-rollup" in sys.argv)
+    
     # Create admin user (optional)
     import os
     admin_email = os.getenv("ADMIN_EMAIL", "admin@eza.local")
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+Legacy API Key Migration Script
+One-off backfill of key_fingerprint for api_keys rows stored before
+fingerprints (bcrypt key_hash only)
+
+A bcrypt hash cannot be turned into a fingerprint, so the plain keys
+are needed: pass them in a file (one per line, e.g. collected from the
+key holders). Each key is checked against the legacy rows with bcrypt
+here, offline, and matching rows get their fingerprint. Legacy rows
+left unmatched do not authenticate; --deactivate-unmatched revokes
+them so their owners are issued new keys.
+
+Usage (from eza-v5/):
+    python backend/scripts/migrate_legacy_api_keys.py                        # report only
+    python backend/scripts/migrate_legacy_api_keys.py --keys-file keys.txt
+    python backend/scripts/migrate_legacy_api_keys.py --keys-file keys.txt --deactivate-unmatched
+"""
+
+import argparse
+import asyncio
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy import select
+from backend.models import user, role, institution, application  # noqa: F401 (relationship targets)
+from backend.models.api_key import APIKey
+from backend.core.utils.security import api_key_fingerprint, pwd_context
+from backend.core.utils.dependencies import DATABASE_URL
+
+
+async def migrate(session: AsyncSession, keys, deactivate_unmatched: bool):
+    result = await session.execute(select(APIKey).where(APIKey.key_fingerprint.is_(None)))
+    legacy = [row for row in result.scalars() if row.key_hash.startswith("$2")]
+    print(f"Legacy API keys without fingerprint: {len(legacy)}")
+
+    matched = 0
+    remaining = list(keys)
+    for row in legacy:
+        for key in remaining:
+            if pwd_context.verify(key, row.key_hash):
+                row.key_fingerprint = api_key_fingerprint(key)
+                remaining.remove(key)
+                matched += 1
+                print(f"Migrated API key {row.id} ({row.name})")
+                break
+
+    unmatched = [row for row in legacy if row.key_fingerprint is None]
+    if deactivate_unmatched:
+        now = datetime.now(timezone.utc)
+        for row in unmatched:
+            if row.is_active:
+                row.is_active = False
+                row.revoked_at = now
+                print(f"Deactivated unmatched API key {row.id} ({row.name})")
+
+    await session.commit()
+    print(f"Migrated: {matched}, unmatched: {len(unmatched)}, unused keys in file: {len(remaining)}")
+
+
+async def main(args):
+    keys = []
+    if args.keys_file:
+        with open(args.keys_file, encoding="utf-8") as f:
+            keys = [line.strip() for line in f if line.strip()]
+
+    engine = create_async_engine(DATABASE_URL)
+    AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with AsyncSessionLocal() as session:
+        await migrate(session, keys, args.deactivate_unmatched)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill fingerprints of legacy (bcrypt-only) API keys")
+    parser.add_argument("--keys-file", help="Plain API keys, one per line")
+    parser.add_argument("--deactivate-unmatched", action="store_true",
+                        help="Revoke legacy keys no plain key matched")
+    asyncio.run(main(parser.parse_args()))
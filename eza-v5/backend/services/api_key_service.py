@@ -4,14 +4,23 @@ API Key Service (Platform)
 Handles API key generation and management
 """
 
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Any
+from dataclasses import dataclass
+from collections import OrderedDict
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
+from backend.config import get_settings
 from backend.models.api_key import APIKey
-from backend.core.utils.security import hash_api_key
-from datetime import datetime, timedelta
+from backend.core.utils.security import api_key_fingerprint
+from backend.core.utils.pagination import paginate
+from datetime import datetime, timedelta, timezone
+import asyncio
+import logging
 import secrets
 import string
+import time
+
+logger = logging.getLogger("eza.api_keys")
 
 
 async def generate_api_key(
@@ -40,8 +49,8 @@ async def generate_api_key(
     alphabet = string.ascii_letters + string.digits
     key = "eza_" + ''.join(secrets.choice(alphabet) for _ in range(32))
     
-    # Hash the key for storage
-    key_hash = hash_api_key(key)
+    # Fingerprint the key for storage (indexed lookup, see authenticate_api_key)
+    key_hash = api_key_fingerprint(key)
     
     # Calculate expiration
     expires_at = None
@@ -51,6 +60,7 @@ async def generate_api_key(
     # Create API key record
     api_key = APIKey(
         key_hash=key_hash,
+        key_fingerprint=key_hash,
         name=name,
         user_id=user_id,
         institution_id=institution_id,
@@ -93,21 +103,28 @@ async def revoke_api_key(
     api_key.revoked_at = datetime.utcnow()
     
     await db.commit()
+    invalidate_api_key(api_key_id)
     return True
 
 
 async def list_api_keys(
     db: AsyncSession,
     user_id: Optional[int] = None,
-    institution_id: Optional[int] = None
+    institution_id: Optional[int] = None,
+    limit: int = 100,
+    offset: int = 0,
+    cursor: Optional[str] = None
 ) -> List[APIKey]:
     """
-    List API keys with optional filtering
+    List active API keys with optional filtering, newest first
     
     Args:
         db: Database session
         user_id: Filter by user ID
         institution_id: Filter by institution ID
+        limit: Maximum number of keys to return
+        offset: Offset for pagination (ignored when cursor is given)
+        cursor: Keyset cursor from the previous page (see core.utils.pagination)
     
     Returns:
         List of APIKey objects
@@ -121,7 +138,222 @@ async def list_api_keys(
         query = query.where(APIKey.institution_id == institution_id)
     
     query = query.where(APIKey.is_active == True)
+    query = paginate(query, APIKey.created_at, APIKey.id, limit, cursor=cursor, offset=offset)
     
     result = await db.execute(query)
     return list(result.scalars().all())
 
+
+
+# ---------------------------------------------------------------------------
+# AUTHENTICATION
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class VerifiedAPIKey:
+    """Fields of a verified, active API key (safe to cache across requests)"""
+    id: int
+    user_id: int
+    institution_id: Optional[int]
+    application_id: Optional[int]
+    expires_at: Optional[datetime]
+
+    def is_expired(self) -> bool:
+        if self.expires_at is None:
+            return False
+        expires_at = self.expires_at
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        return expires_at < datetime.now(timezone.utc)
+
+
+class VerifiedKeyCache:
+    """
+    Fingerprint -> VerifiedAPIKey, LRU with TTL.
+    Revocation on this worker is immediate (invalidate); other workers
+    pick it up when the entry's TTL runs out.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple[VerifiedAPIKey, float]]" = OrderedDict()
+        self._by_id: Dict[int, str] = {}
+        # Fingerprints that matched no key, so repeated bogus keys skip the query
+        self._misses: "OrderedDict[str, float]" = OrderedDict()
+
+    def get(self, fingerprint: str) -> Optional[VerifiedAPIKey]:
+        entry = self._entries.get(fingerprint)
+        if entry is None:
+            return None
+        key, expires_at = entry
+        if expires_at <= time.monotonic():
+            self._remove(fingerprint)
+            return None
+        self._entries.move_to_end(fingerprint)
+        return key
+
+    def set(self, fingerprint: str, key: VerifiedAPIKey):
+        if fingerprint in self._entries:
+            self._remove(fingerprint)
+        self._entries[fingerprint] = (key, time.monotonic() + self.ttl)
+        self._by_id[key.id] = fingerprint
+        self._misses.pop(fingerprint, None)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    def invalidate(self, api_key_id: int):
+        fingerprint = self._by_id.get(api_key_id)
+        if fingerprint is not None:
+            self._remove(fingerprint)
+
+    def is_known_miss(self, fingerprint: str) -> bool:
+        expires_at = self._misses.get(fingerprint)
+        if expires_at is None:
+            return False
+        if expires_at <= time.monotonic():
+            del self._misses[fingerprint]
+            return False
+        return True
+
+    def add_miss(self, fingerprint: str):
+        self._misses[fingerprint] = time.monotonic() + self.ttl
+        self._misses.move_to_end(fingerprint)
+        while len(self._misses) > self.max_entries:
+            self._misses.popitem(last=False)
+
+    def _remove(self, fingerprint: str):
+        key, _ = self._entries.pop(fingerprint)
+        if self._by_id.get(key.id) == fingerprint:
+            del self._by_id[key.id]
+
+    def clear(self):
+        self._entries.clear()
+        self._by_id.clear()
+        self._misses.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"entries": len(self._entries), "known_misses": len(self._misses)}
+
+
+_verified_keys: Optional[VerifiedKeyCache] = None
+
+
+def get_verified_key_cache() -> VerifiedKeyCache:
+    global _verified_keys
+    if _verified_keys is None:
+        settings = get_settings()
+        _verified_keys = VerifiedKeyCache(settings.API_KEY_CACHE_TTL_SECONDS, settings.API_KEY_CACHE_MAX_ENTRIES)
+    return _verified_keys
+
+
+def invalidate_api_key(api_key_id: int):
+    """Drop a key from this worker's verified-key cache (called on revoke)"""
+    get_verified_key_cache().invalidate(api_key_id)
+
+
+def _verified(api_key: APIKey) -> VerifiedAPIKey:
+    return VerifiedAPIKey(
+        id=api_key.id,
+        user_id=api_key.user_id,
+        institution_id=api_key.institution_id,
+        application_id=api_key.application_id,
+        expires_at=api_key.expires_at,
+    )
+
+
+async def authenticate_api_key(db: AsyncSession, key: str) -> Optional[VerifiedAPIKey]:
+    """
+    Verify a presented API key.
+
+    Returns:
+        VerifiedAPIKey, or None if the key is unknown or revoked
+        (expiry is left to the caller, see VerifiedAPIKey.is_expired)
+    """
+    cache = get_verified_key_cache()
+    fingerprint = api_key_fingerprint(key)
+
+    verified = cache.get(fingerprint)
+    if verified is not None:
+        record_api_key_use(verified.id)
+        return verified
+    if cache.is_known_miss(fingerprint):
+        return None
+
+    # Legacy bcrypt-only rows are not matched here: they are migrated
+    # offline (scripts/migrate_legacy_api_keys.py), never per request
+    result = await db.execute(select(APIKey).where(APIKey.key_fingerprint == fingerprint))
+    api_key = result.scalar_one_or_none()
+
+    if api_key is None or not api_key.is_active:
+        cache.add_miss(fingerprint)
+        return None
+
+    verified = _verified(api_key)
+    cache.set(fingerprint, verified)
+    record_api_key_use(verified.id)
+    return verified
+
+
+# ---------------------------------------------------------------------------
+# LAST-USED TRACKING (batched)
+# ---------------------------------------------------------------------------
+
+_pending_last_used: Dict[int, datetime] = {}
+_flush_task: Optional[asyncio.Task] = None
+
+
+def record_api_key_use(api_key_id: int):
+    """Note a key use; written to api_keys.last_used_at by the next flush"""
+    _pending_last_used[api_key_id] = datetime.now(timezone.utc)
+
+
+async def flush_last_used() -> int:
+    """Write pending last_used_at values in one bulk UPDATE, returns rows written"""
+    global _pending_last_used
+    if not _pending_last_used:
+        return 0
+    pending, _pending_last_used = _pending_last_used, {}
+    from backend.core.utils.dependencies import AsyncSessionLocal
+    try:
+        async with AsyncSessionLocal() as session:
+            await session.execute(
+                update(APIKey),
+                [{"id": key_id, "last_used_at": used_at} for key_id, used_at in pending.items()],
+            )
+            await session.commit()
+    except Exception as e:
+        # Keep the newest timestamps for the next attempt
+        for key_id, used_at in pending.items():
+            _pending_last_used.setdefault(key_id, used_at)
+        logger.warning(f"last_used_at flush failed ({len(pending)} keys): {e}")
+        return 0
+    return len(pending)
+
+
+async def _flush_loop(interval: float):
+    while True:
+        await asyncio.sleep(interval)
+        await flush_last_used()
+
+
+def start_last_used_flusher():
+    """Start the background last_used_at flush (lifespan startup)"""
+    global _flush_task
+    if _flush_task is None:
+        _flush_task = asyncio.create_task(
+            _flush_loop(get_settings().API_KEY_LAST_USED_FLUSH_SECONDS), name="api_key_last_used_flush"
+        )
+
+
+async def stop_last_used_flusher():
+    """Stop the flush loop and write what is still pending (lifespan shutdown)"""
+    global _flush_task
+    if _flush_task is not None:
+        _flush_task.cancel()
+        try:
+            await _flush_task
+        except asyncio.CancelledError:
+            pass
+        _flush_task = None
+    await flush_last_used()
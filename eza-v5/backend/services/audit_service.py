@@ -6,8 +6,9 @@ Handles audit log operations
 
 from typing import List, Optional, Dict, Any
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc
+from sqlalchemy import select
 from backend.telemetry.audit_log import AuditLog, log_audit_event
+from backend.core.utils.pagination import paginate
 from datetime import datetime
 
 
@@ -15,16 +16,18 @@ async def get_audit_logs(
     db: AsyncSession,
     endpoint: Optional[str] = None,
     limit: int = 100,
-    offset: int = 0
+    offset: int = 0,
+    cursor: Optional[str] = None
 ) -> List[AuditLog]:
     """
-    Get audit logs with optional filtering
+    Get audit logs with optional filtering, newest first
     
     Args:
         db: Database session
         endpoint: Filter by endpoint
         limit: Maximum number of logs to return
-        offset: Offset for pagination
+        offset: Offset for pagination (ignored when cursor is given)
+        cursor: Keyset cursor from the previous page (see core.utils.pagination)
     
     Returns:
         List of AuditLog objects
@@ -34,7 +37,7 @@ async def get_audit_logs(
     if endpoint:
         query = query.where(AuditLog.endpoint == endpoint)
     
-    query = query.order_by(desc(AuditLog.created_at)).limit(limit).offset(offset)
+    query = paginate(query, AuditLog.created_at, AuditLog.id, limit, cursor=cursor, offset=offset)
     
     result = await db.execute(query)
     return list(result.scalars().all())
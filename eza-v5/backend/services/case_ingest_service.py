@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+"""
+Case Ingest Service
+Bulk case creation for batch feeds (BTK, RTÜK)
+
+Items are processed in chunks of CASE_BULK_CHUNK_SIZE:
+- texts are scored with compute_risk_many in a process pool
+  (CASE_SCORING_WORKERS; 0 scores inline), the next chunk being scored
+  while the current one is written
+- each chunk is one transaction: a bulk INSERT ... RETURNING for the
+  cases (rows returned in parameter order) plus one multi-row upsert of
+  the risk matrix rollup
+
+Problems are reported per item ({"index", "error"}) and never fail the
+batch: invalid items are skipped, and a chunk whose scoring or
+transaction fails reports its items as failed while later chunks carry
+on.
+
+NDJSON input (ingest_ndjson) is parsed line by line as the request body
+arrives; result lines are spooled to a temporary file, so neither the
+input nor the output has to fit in memory.
+"""
+
+import asyncio
+import json
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional, Iterable, AsyncIterator, Tuple, Union, BinaryIO
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.config import get_settings
+from backend.models.case import Case
+from backend.core.engines.eza_risk_engine import compute_risk_many, matrix_severity, matrix_likelihood
+from backend.services.risk_service import increment_risk_rollup_counts
+
+logger = logging.getLogger("eza.cases")
+
+SOURCE_MAX_LENGTH = 50
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def _get_executor() -> Optional[ProcessPoolExecutor]:
+    global _executor
+    workers = get_settings().CASE_SCORING_WORKERS
+    if workers <= 0:
+        return None
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=workers)
+    return _executor
+
+
+def shutdown_case_scoring():
+    """Stop the scoring processes (lifespan shutdown)"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def _validate_item(item: Any, default_source: str) -> Tuple[str, str, Optional[Dict[str, Any]]]:
+    """(text, source, metadata) of a raw item, or ValueError"""
+    if isinstance(item, Exception):
+        raise ValueError(str(item))
+    if not isinstance(item, dict):
+        raise ValueError("Item must be an object")
+    text = item.get("text")
+    if not isinstance(text, str) or not text.strip():
+        raise ValueError("text must be a non-empty string")
+    source = item.get("source") or default_source
+    if not isinstance(source, str) or len(source) > SOURCE_MAX_LENGTH:
+        raise ValueError(f"source must be a string of at most {SOURCE_MAX_LENGTH} characters")
+    metadata = item.get("metadata")
+    if metadata is not None and not isinstance(metadata, dict):
+        raise ValueError("metadata must be an object")
+    return text, source, metadata or None
+
+
+async def _score(texts: List[str]) -> List[Dict[str, Any]]:
+    executor = _get_executor()
+    if executor is None:
+        return compute_risk_many(texts)
+    return await asyncio.get_running_loop().run_in_executor(executor, compute_risk_many, texts)
+
+
+async def _insert_chunk(db: AsyncSession, rows: List[Dict[str, Any]]) -> List[Tuple[int, datetime]]:
+    """One transaction: cases (INSERT ... RETURNING) and their rollup counts"""
+    # Bulk INSERT with RETURNING rows in the order of rows (not guaranteed
+    # by a plain multi-row VALUES)
+    result = await db.execute(
+        insert(Case).returning(Case.id, Case.created_at, sort_by_parameter_order=True),
+        rows,
+    )
+    returned = result.all()
+
+    counts: Dict[Tuple, int] = {}
+    for row, (_, created_at) in zip(rows, returned):
+        day = (created_at or datetime.now(timezone.utc)).astimezone(timezone.utc).date()
+        cell = (row["source"], day, matrix_severity(row["risk_score"]), matrix_likelihood(row["risk_level"]))
+        counts[cell] = counts.get(cell, 0) + 1
+    await increment_risk_rollup_counts(db, counts)
+    await db.commit()
+    return returned
+
+
+async def _process_chunk(
+    db: AsyncSession,
+    scores: "asyncio.Future",
+    valid: List[Tuple[int, str, str, Optional[Dict[str, Any]]]],
+    invalid: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    results = list(invalid)
+    try:
+        scored = await scores
+    except Exception as e:
+        # e.g. BrokenProcessPool: the chunk fails, later chunks carry on
+        logger.error(f"Case scoring failed for {len(valid)} items: {e}")
+        results.extend({"index": index, "error": f"Scoring failed: {e}"} for index, _, _, _ in valid)
+        results.sort(key=lambda result: result["index"])
+        return results
+    rows, row_indexes = [], []
+    for (index, text, source, metadata), score in zip(valid, scored):
+        if "error" in score:
+            results.append({"index": index, "error": score["error"]})
+            continue
+        rows.append({
+            "text": text,
+            "source": source,
+            "meta_data": metadata,
+            "risk_score": score["risk_score"],
+            "risk_level": score["risk_level"],
+        })
+        row_indexes.append(index)
+
+    if rows:
+        try:
+            returned = await _insert_chunk(db, rows)
+            for index, row, (case_id, created_at) in zip(row_indexes, rows, returned):
+                results.append({
+                    "index": index,
+                    "id": case_id,
+                    "risk_score": row["risk_score"],
+                    "risk_level": row["risk_level"],
+                    "created_at": created_at.isoformat() if created_at else None,
+                })
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Bulk case insert failed for {len(rows)} items: {e}")
+            results.extend({"index": index, "error": f"Insert failed: {e}"} for index in row_indexes)
+
+    results.sort(key=lambda result: result["index"])
+    return results
+
+
+def _prepare(chunk: List[Tuple[int, Any]], default_source: str):
+    valid, invalid = [], []
+    for index, item in chunk:
+        try:
+            valid.append((index, *_validate_item(item, default_source)))
+        except ValueError as e:
+            invalid.append({"index": index, "error": str(e)})
+    return valid, invalid
+
+
+async def ingest_cases(
+    db: AsyncSession,
+    items: Union[Iterable[Any], AsyncIterator[Any]],
+    source: str = "rtuk",
+    chunk_size: Optional[int] = None
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Create cases in chunks; yields each chunk's per-item results
+
+    Args:
+        db: Database session (committed once per chunk)
+        items: Raw items {"text", "source"?, "metadata"?}, sync or async
+               iterable; an item that is an Exception is reported as that
+               item's error (e.g. an unparseable NDJSON line)
+        source: Source for items that do not set one
+        chunk_size: Items per chunk (default CASE_BULK_CHUNK_SIZE)
+
+    Yields:
+        Lists of {"index", "id", "risk_score", "risk_level", "created_at"}
+        or {"index", "error"}, ordered by index within the chunk
+    """
+    chunk_size = chunk_size or get_settings().CASE_BULK_CHUNK_SIZE
+    pending = None  # (scoring task, valid, invalid) of the chunk waiting to be written
+
+    async for chunk in _chunks(items, chunk_size):
+        valid, invalid = _prepare(chunk, source)
+        scores = asyncio.ensure_future(_score([text for _, text, _, _ in valid]))
+        if pending is not None:
+            yield await _process_chunk(db, *pending)
+        pending = (scores, valid, invalid)
+
+    if pending is not None:
+        yield await _process_chunk(db, *pending)
+
+
+async def _chunks(items, chunk_size: int) -> AsyncIterator[List[Tuple[int, Any]]]:
+    chunk = []
+    index = 0
+    if hasattr(items, "__aiter__"):
+        async for item in items:
+            chunk.append((index, item))
+            index += 1
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+    else:
+        for item in items:
+            chunk.append((index, item))
+            index += 1
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def summarize(results: List[Dict[str, Any]]) -> Dict[str, int]:
+    """Counts for a list of per-item results"""
+    failed = sum(1 for result in results if "error" in result)
+    return {"total": len(results), "created": len(results) - failed, "failed": failed}
+
+
+async def iter_ndjson(byte_chunks: AsyncIterator[bytes]) -> AsyncIterator[Any]:
+    """Items of an NDJSON byte stream; a line that is not JSON yields a ValueError"""
+    buffer = b""
+    async for data in byte_chunks:
+        buffer += data
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield _parse_line(line)
+    if buffer.strip():
+        yield _parse_line(buffer)
+
+
+def _parse_line(line: bytes) -> Any:
+    try:
+        return json.loads(line)
+    except ValueError as e:
+        return ValueError(f"Invalid JSON line: {e}")
+
+
+async def ingest_ndjson(
+    db: AsyncSession,
+    byte_chunks: AsyncIterator[bytes],
+    out: BinaryIO,
+    source: str = "rtuk"
+) -> Dict[str, int]:
+    """
+    ingest_cases over an NDJSON body; writes one result line per item to
+    out, then a {"type": "summary", ...} line. Returns the summary counts.
+    """
+    summary = {"total": 0, "created": 0, "failed": 0}
+    async for results in ingest_cases(db, iter_ndjson(byte_chunks), source=source):
+        for key, count in summarize(results).items():
+            summary[key] += count
+        out.write("".join(json.dumps(result) + "\n" for result in results).encode("utf-8"))
+    out.write((json.dumps({"type": "summary", **summary}) + "\n").encode("utf-8"))
+    return summary
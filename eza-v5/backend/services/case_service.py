@@ -6,10 +6,11 @@ Handles case creation and retrieval using EZA engines
 
 from typing import List, Optional, Dict, Any
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc
+from sqlalchemy import select, func
 from backend.models.case import Case
 from backend.core.engines.eza_risk_engine import compute_risk
-import json
+from backend.services.risk_service import increment_risk_rollup
+from backend.core.utils.pagination import paginate
 
 
 async def create_case(
@@ -39,10 +40,12 @@ async def create_case(
         risk_score=risk_result["risk_score"],
         risk_level=risk_result["risk_level"],
         source=source,
-        meta_data=json.dumps(metadata) if metadata else None
+        meta_data=metadata or None
     )
     
     db.add(case)
+    # Keep the risk matrix rollup in step (committed together with the case)
+    await increment_risk_rollup(db, source, case.risk_score, case.risk_level)
     await db.commit()
     await db.refresh(case)
     
@@ -54,17 +57,19 @@ async def list_cases(
     source: Optional[str] = None,
     risk_level: Optional[str] = None,
     limit: int = 100,
-    offset: int = 0
+    offset: int = 0,
+    cursor: Optional[str] = None
 ) -> List[Case]:
     """
-    List cases with optional filtering
+    List cases with optional filtering, newest first
     
     Args:
         db: Database session
         source: Filter by source
         risk_level: Filter by risk level
         limit: Maximum number of cases to return
-        offset: Offset for pagination
+        offset: Offset for pagination (ignored when cursor is given)
+        cursor: Keyset cursor from the previous page (see core.utils.pagination)
     
     Returns:
         List of Case objects
@@ -77,12 +82,43 @@ async def list_cases(
     if risk_level:
         query = query.where(Case.risk_level == risk_level)
     
-    query = query.order_by(desc(Case.created_at)).limit(limit).offset(offset)
+    query = paginate(query, Case.created_at, Case.id, limit, cursor=cursor, offset=offset)
     
     result = await db.execute(query)
     return list(result.scalars().all())
 
 
+async def list_case_previews(
+    db: AsyncSession,
+    source: Optional[str] = None,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    preview_chars: int = 100
+) -> List[Any]:
+    """
+    Newest cases as compact rows (id, preview, risk_score, risk_level,
+    source, created_at) for feeds that do not render the full text.
+    preview is the first preview_chars + 1 characters, cut in the database,
+    so callers can tell whether the text was longer.
+    """
+    query = select(
+        Case.id,
+        func.substr(Case.text, 1, preview_chars + 1).label("preview"),
+        Case.risk_score,
+        Case.risk_level,
+        Case.source,
+        Case.created_at,
+    )
+    
+    if source:
+        query = query.where(Case.source == source)
+    
+    query = paginate(query, Case.created_at, Case.id, limit, cursor=cursor)
+    
+    result = await db.execute(query)
+    return list(result.all())
+
+
 async def get_case_by_id(db: AsyncSession, case_id: int) -> Optional[Case]:
     """Get a case by ID"""
     result = await db.execute(select(Case).where(Case.id == case_id))
@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+"""
+PDF Report Service
+Renders report PDFs in a process pool and caches them on disk
+
+Cache key (content address): SHA-256 of (report type, filters, data
+watermark). The watermark (case count, max id, last update for the
+filtered cases) changes whenever the underlying cases do, so a cached
+PDF is served only while it still matches the data. Files live in
+REPORT_CACHE_DIR, shared by all workers on the host.
+
+The key doubles as the job id: any worker can answer "done" for a job
+from the cache directory; "queued"/"running" are known to the worker
+that renders it.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.config import get_settings
+from backend.models.case import Case
+from backend.core.engines.report_pdf import render_report_pdf
+
+logger = logging.getLogger("eza.reports")
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+@dataclass
+class ReportJob:
+    job_id: str
+    report_type: str
+    filters: Dict[str, Any]
+    status: str = QUEUED
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "report_type": self.report_type,
+            "filters": self.filters,
+            "status": self.status,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+_jobs: Dict[str, ReportJob] = {}
+_tasks: Dict[str, asyncio.Task] = {}
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=get_settings().REPORT_PDF_WORKERS)
+    return _executor
+
+
+def shutdown_pdf_renderer():
+    """Stop the render processes (lifespan shutdown)"""
+    global _executor
+    for task in _tasks.values():
+        task.cancel()
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def cache_dir() -> Path:
+    path = Path(get_settings().REPORT_CACHE_DIR or os.path.join(tempfile.gettempdir(), "eza_reports"))
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def cached_pdf_path(job_id: str) -> Optional[Path]:
+    """Path of a rendered PDF, or None if it is not cached"""
+    if not job_id.isalnum():
+        return None
+    path = cache_dir() / f"{job_id}.pdf"
+    return path if path.is_file() else None
+
+
+async def data_watermark(db: AsyncSession, source: Optional[str]) -> Dict[str, Any]:
+    """Version of the cases a report covers (cheap aggregate over indexed columns)"""
+    query = select(func.count(Case.id), func.max(Case.id), func.max(Case.updated_at))
+    if source:
+        query = query.where(Case.source == source)
+    count, max_id, last_update = (await db.execute(query)).one()
+    return {
+        "count": count,
+        "max_id": max_id,
+        "last_update": last_update.isoformat() if last_update else None,
+    }
+
+
+def report_key(report_type: str, filters: Dict[str, Any], watermark: Dict[str, Any]) -> str:
+    """Content address of a rendered report"""
+    payload = json.dumps([report_type, filters, watermark], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _write_atomic(path: Path, data: bytes):
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _prune_cache(max_bytes: int, keep: Optional[Path] = None):
+    """
+    Delete least recently written PDFs beyond the cache budget. keep (the
+    PDF just rendered) is counted but never deleted, even if it alone
+    exceeds the budget.
+    """
+    files = sorted(cache_dir().glob("*.pdf"), key=lambda p: p.stat().st_mtime, reverse=True)
+    total = 0
+    for path in files:
+        total += path.stat().st_size
+        if total > max_bytes and path != keep:
+            path.unlink(missing_ok=True)
+
+
+async def _render(job: ReportJob, source: Optional[str]):
+    from backend.core.utils.dependencies import AsyncSessionLocal
+    from backend.services.report_service import build_report
+
+    job.status = RUNNING
+    try:
+        async with AsyncSessionLocal() as session:
+            report = await build_report(session, report_type=job.report_type, source=source, format="pdf")
+        report["metadata"]["pdf_available"] = True
+        report["metadata"].pop("note", None)
+        loop = asyncio.get_running_loop()
+        pdf = await loop.run_in_executor(_get_executor(), render_report_pdf, report)
+        path = cache_dir() / f"{job.job_id}.pdf"
+        await loop.run_in_executor(None, _write_atomic, path, pdf)
+        await loop.run_in_executor(None, _prune_cache, get_settings().REPORT_CACHE_MAX_BYTES, path)
+        job.status = DONE
+    except Exception as e:
+        logger.error(f"PDF report {job.job_id} failed: {e}")
+        job.status = FAILED
+        job.error = str(e)
+    finally:
+        job.finished_at = time.time()
+        _tasks.pop(job.job_id, None)
+
+
+async def request_pdf_report(db: AsyncSession, report_type: str, source: Optional[str] = None) -> ReportJob:
+    """
+    Job for a report PDF: done at once if cached, otherwise queued
+    (identical concurrent requests share one job)
+    """
+    filters = {"source": source}
+    job_id = report_key(report_type, filters, await data_watermark(db, source))
+
+    job = _jobs.get(job_id)
+    if job is not None and job.status in (QUEUED, RUNNING):
+        return job
+    if cached_pdf_path(job_id) is not None:
+        job = ReportJob(job_id, report_type, filters, status=DONE, finished_at=time.time())
+        _jobs[job_id] = job
+        return job
+
+    job = _jobs[job_id] = ReportJob(job_id, report_type, filters)
+    _tasks[job_id] = asyncio.create_task(_render(job, source), name=f"pdf_report:{job_id[:12]}")
+    _expire_jobs()
+    return job
+
+
+def get_report_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """Job status; jobs rendered by another worker show up as done once cached"""
+    job = _jobs.get(job_id)
+    if job is not None and job.status == DONE and cached_pdf_path(job_id) is None:
+        # Evicted from the cache since (budget of another render): unknown
+        # again, so the client requests it anew instead of polling "done"
+        del _jobs[job_id]
+        job = None
+    if job is not None:
+        return job.to_dict()
+    if cached_pdf_path(job_id) is not None:
+        return {"job_id": job_id, "status": DONE}
+    return None
+
+
+def _expire_jobs(max_age: float = 3600.0):
+    cutoff = time.time() - max_age
+    for job_id in [j for j, job in _jobs.items() if job.finished_at and job.finished_at < cutoff]:
+        del _jobs[job_id]
@@ -2,15 +2,99 @@
 """
 Report Service
 Handles report generation using EZA Report Engine
+
+Cases are read through a server-side cursor (AsyncSession.stream with
+yield_per) and folded into a ReportAccumulator in one pass, so memory
+stays flat regardless of the number of cases. The cursor selects only
+the columns the statistics need; the full rows (text, metadata) are
+loaded afterwards for the handful of high-risk cases the report shows.
+
+Exports (stream_report) write JSON, NDJSON or CSV chunks while the
+cursor is being read, for StreamingResponse.
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional, AsyncIterator, List
 from sqlalchemy.ext.asyncio import AsyncSession
 from backend.models.case import Case
-from backend.core.engines.eza_report_engine import generate_report
+from backend.core.engines.eza_report_engine import ReportAccumulator
 from sqlalchemy import select
+import csv
+import io
 import json
 
+# Rows fetched per server-side cursor round trip
+STREAM_BATCH_SIZE = 2000
+
+EXPORT_FORMATS = ("json", "ndjson", "csv")
+EXPORT_MEDIA_TYPES = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+CSV_COLUMNS = ["id", "source", "risk_score", "risk_level", "created_at"]
+
+
+def _case_row(row) -> Dict[str, Any]:
+    return {
+        "id": row.id,
+        "source": row.source,
+        "risk_score": row.risk_score,
+        "risk_level": row.risk_level,
+        "created_at": row.created_at.isoformat() if row.created_at else None
+    }
+
+
+def _case_dict(case: Case) -> Dict[str, Any]:
+    return {
+        "id": case.id,
+        "text": case.text,
+        "risk_score": case.risk_score,
+        "risk_level": case.risk_level,
+        "source": case.source,
+        "metadata": case.meta_data or {},
+        "created_at": case.created_at.isoformat() if case.created_at else None
+    }
+
+
+async def iter_case_rows(
+    db: AsyncSession,
+    source: Optional[str] = None,
+    batch_size: int = STREAM_BATCH_SIZE
+) -> AsyncIterator[Dict[str, Any]]:
+    """Case summaries (no text) from a server-side cursor, oldest first"""
+    query = select(Case.id, Case.source, Case.risk_score, Case.risk_level, Case.created_at).order_by(Case.id)
+    if source:
+        query = query.where(Case.source == source)
+
+    result = await db.stream(query.execution_options(yield_per=batch_size))
+    async for partition in result.partitions():
+        for row in partition:
+            yield _case_row(row)
+
+
+async def _hydrate_high_risk_cases(db: AsyncSession, accumulator: ReportAccumulator):
+    """Replace the kept high-risk summaries with full case dicts"""
+    ids = [case["id"] for case in accumulator.high_risk_cases]
+    if not ids:
+        return
+    result = await db.execute(select(Case).where(Case.id.in_(ids)))
+    full = {case.id: _case_dict(case) for case in result.scalars()}
+    accumulator.high_risk_cases = [full.get(case_id, summary) for case_id, summary in zip(ids, accumulator.high_risk_cases)]
+
+
+async def build_report(
+    db: AsyncSession,
+    report_type: str,
+    source: Optional[str] = None,
+    format: str = "json"
+) -> Dict[str, Any]:
+    """Report dictionary for report_type, computed in one streaming pass"""
+    accumulator = ReportAccumulator()
+    async for case in iter_case_rows(db, source):
+        accumulator.add(case)
+    await _hydrate_high_risk_cases(db, accumulator)
+    return accumulator.report(report_type, format)
+
 
 async def generate_rtuk_report(
     db: AsyncSession,
@@ -18,33 +102,87 @@ async def generate_rtuk_report(
 ) -> Dict[str, Any]:
     """
     Generate RTÜK regulatory report
-    
+
     Args:
         db: Database session
         format: Report format (json or pdf)
-    
+
     Returns:
         Report dictionary
     """
-    # Fetch RTÜK cases
-    query = select(Case).where(Case.source == "rtuk")
-    result = await db.execute(query)
-    cases = result.scalars().all()
-    
-    # Convert to dictionary format
-    cases_data = [
-        {
-            "id": case.id,
-            "text": case.text,
-            "risk_score": case.risk_score,
-            "risk_level": case.risk_level,
-            "source": case.source,
-            "metadata": json.loads(case.meta_data) if case.meta_data else {},
-            "created_at": case.created_at.isoformat() if case.created_at else None
-        }
-        for case in cases
-    ]
-    
-    # Use EZA Report Engine to generate report
-    return generate_report(cases_data, report_type="rtuk", format=format)
+    return await build_report(db, report_type="rtuk", source="rtuk", format=format)
+
+
+async def stream_report(
+    db: AsyncSession,
+    report_type: str,
+    source: Optional[str] = None,
+    format: str = "json"
+) -> AsyncIterator[str]:
+    """
+    Report export as text chunks (one chunk per cursor batch)
+
+    Formats:
+        json:   {"cases": [...], "metadata": {...}, "content": {...}}
+                (statistics come last: they are known only after the pass)
+        ndjson: one {"type": "case", ...} line per case, then one
+                {"type": "report", "metadata": ..., "content": ...} line
+        csv:    header + one line per case (CSV_COLUMNS)
+    """
+    accumulator = ReportAccumulator()
+    buffer: List[str] = []
+    first = True
 
+    if format == "json":
+        buffer.append('{"cases": [')
+    elif format == "csv":
+        csv_buffer = io.StringIO()
+        writer = csv.DictWriter(csv_buffer, fieldnames=CSV_COLUMNS, lineterminator="\n")
+        writer.writeheader()
+
+    async for case in iter_case_rows(db, source):
+        accumulator.add(case)
+        if format == "json":
+            buffer.append(("" if first else ",") + json.dumps(case, ensure_ascii=False))
+            first = False
+        elif format == "ndjson":
+            buffer.append(json.dumps({"type": "case", **case}, ensure_ascii=False) + "\n")
+        else:
+            writer.writerow(case)
+
+        if format == "csv" and csv_buffer.tell() >= 64 * 1024:
+            yield csv_buffer.getvalue()
+            csv_buffer.seek(0)
+            csv_buffer.truncate()
+        elif len(buffer) >= STREAM_BATCH_SIZE:
+            yield "".join(buffer)
+            buffer.clear()
+
+    if format == "csv":
+        yield csv_buffer.getvalue()
+        return
+
+    await _hydrate_high_risk_cases(db, accumulator)
+    metadata = accumulator.metadata(report_type, format)
+    content = accumulator.content(report_type)
+    if format == "json":
+        buffer.append('], "metadata": ' + json.dumps(metadata, ensure_ascii=False))
+        buffer.append(', "content": ' + json.dumps(content, ensure_ascii=False) + "}")
+    else:
+        buffer.append(json.dumps({"type": "report", "metadata": metadata, "content": content}, ensure_ascii=False) + "\n")
+    yield "".join(buffer)
+
+
+async def export_report(
+    report_type: str,
+    source: Optional[str] = None,
+    format: str = "json"
+) -> AsyncIterator[str]:
+    """
+    stream_report on its own session, for StreamingResponse bodies
+    (which run after the request's dependencies may have been closed)
+    """
+    from backend.core.utils.dependencies import AsyncSessionLocal
+    async with AsyncSessionLocal() as session:
+        async for chunk in stream_report(session, report_type, source, format):
+            yield chunk
@@ -2,13 +2,47 @@
 """
 Risk Service
 Handles risk matrix computation using EZA Risk Engine
+
+The matrix is aggregated in SQL:
+- rollup (default): sums case_risk_rollup, a per (source, day, cell)
+  count maintained by case_service.create_case. Cost depends on the
+  number of sources x days, not on the number of cases. Cases created
+  before the table existed are counted by a one-time backfill
+  (ensure_risk_rollup, at startup), recorded in case_risk_rollup_backfill.
+- cases: GROUP BY over the cases table with the same bucket expressions
+  (used to rebuild the rollup and when RISK_MATRIX_USE_ROLLUP is off)
 """
 
-from typing import List, Dict, Any
+from typing import Dict, Any, Optional, Tuple
+from datetime import date, datetime, timezone
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, case, delete, literal_column, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from backend.config import get_settings
 from backend.models.case import Case
-from backend.core.engines.eza_risk_engine import compute_risk_matrix
-from sqlalchemy import select
+from backend.models.case_risk_rollup import CaseRiskRollup, CaseRiskRollupBackfill
+from backend.core.engines.eza_risk_engine import (
+    risk_matrix_from_counts,
+    matrix_severity,
+    matrix_likelihood,
+    SEVERITY_HIGH_SCORE,
+    SEVERITY_MEDIUM_SCORE,
+    LIKELIHOOD_HIGH_LEVELS,
+    LIKELIHOOD_MEDIUM_LEVELS,
+)
+
+# SQL versions of matrix_severity / matrix_likelihood
+SEVERITY_BUCKET = case(
+    (Case.risk_score >= SEVERITY_HIGH_SCORE, "high"),
+    (Case.risk_score >= SEVERITY_MEDIUM_SCORE, "medium"),
+    else_="low",
+)
+LIKELIHOOD_BUCKET = case(
+    (Case.risk_level.in_(LIKELIHOOD_HIGH_LEVELS), "high"),
+    (Case.risk_level.in_(LIKELIHOOD_MEDIUM_LEVELS), "medium"),
+    else_="low",
+)
+CASE_DAY = func.date(func.timezone("UTC", Case.created_at))
 
 
 async def compute_risk_matrix_from_db(
@@ -25,25 +59,134 @@ async def compute_risk_matrix_from_db(
     Returns:
         3x3 risk matrix dictionary
     """
-    # Fetch cases from database
-    query = select(Case)
+    if get_settings().RISK_MATRIX_USE_ROLLUP:
+        return await compute_risk_matrix_from_rollup(db, source)
+    return await compute_risk_matrix_from_cases(db, source)
+
+
+async def compute_risk_matrix_from_rollup(db: AsyncSession, source: Optional[str] = None) -> Dict[str, Any]:
+    """Risk matrix from the case_risk_rollup table"""
+    query = select(
+        CaseRiskRollup.severity,
+        CaseRiskRollup.likelihood,
+        func.sum(CaseRiskRollup.case_count),
+    ).group_by(CaseRiskRollup.severity, CaseRiskRollup.likelihood)
     if source:
-        query = query.where(Case.source == source)
+        query = query.where(CaseRiskRollup.source == source)
     
     result = await db.execute(query)
-    cases = result.scalars().all()
-    
-    # Convert to dictionary format for risk engine
-    cases_data = [
-        {
-            "id": case.id,
-            "risk_score": case.risk_score,
-            "risk_level": case.risk_level,
-            "source": case.source
-        }
-        for case in cases
-    ]
+    return risk_matrix_from_counts({(row, col): count for row, col, count in result.all()})
+
+
+async def compute_risk_matrix_from_cases(db: AsyncSession, source: Optional[str] = None) -> Dict[str, Any]:
+    """Risk matrix with a GROUP BY over cases (no ORM rows, no text column)"""
+    query = select(SEVERITY_BUCKET, LIKELIHOOD_BUCKET, func.count()).group_by(
+        literal_column("1"), literal_column("2")
+    )
+    if source:
+        query = query.where(Case.source == source)
     
-    # Use EZA Risk Engine to compute matrix
-    return compute_risk_matrix(cases_data)
+    result = await db.execute(query)
+    return risk_matrix_from_counts({(row, col): count for row, col, count in result.all()})
+
+
+async def increment_risk_rollup(
+    db: AsyncSession,
+    source: str,
+    risk_score: float,
+    risk_level: str,
+    day: Optional[date] = None
+):
+    """
+    Count one new case in case_risk_rollup (upsert, same transaction as
+    the case insert; the caller commits)
+    """
+    cell = (source, day or datetime.now(timezone.utc).date(), matrix_severity(risk_score), matrix_likelihood(risk_level))
+    await increment_risk_rollup_counts(db, {cell: 1})
+
+
+async def increment_risk_rollup_counts(
+    db: AsyncSession,
+    counts: Dict[Tuple[str, date, str, str], int]
+):
+    """
+    Add case counts per (source, day, severity, likelihood) to
+    case_risk_rollup in one multi-row upsert (the caller commits)
+    """
+    if not counts:
+        return
+    statement = pg_insert(CaseRiskRollup).values([
+        {"source": source, "day": day, "severity": severity, "likelihood": likelihood, "case_count": count}
+        for (source, day, severity, likelihood), count in sorted(counts.items())
+    ])
+    statement = statement.on_conflict_do_update(
+        index_elements=[
+            CaseRiskRollup.source,
+            CaseRiskRollup.day,
+            CaseRiskRollup.severity,
+            CaseRiskRollup.likelihood,
+        ],
+        set_={"case_count": CaseRiskRollup.case_count + statement.excluded.case_count},
+    )
+    await db.execute(statement)
+
+
+async def ensure_risk_rollup(db: AsyncSession) -> Optional[int]:
+    """
+    Build case_risk_rollup from the existing cases once (lifespan startup,
+    scripts/init_db.py), e.g. after create_all added the table to a
+    database that already has cases. Done once the backfill marker row
+    exists, whatever the table holds by then.
+    Returns the number of rollup rows written, None if already done.
+    """
+    if await _backfill_done(db):
+        return None
+    await _lock_cases(db)
+    # Another worker may have finished the backfill while we waited
+    if await _backfill_done(db):
+        await db.rollback()
+        return None
+    return await _rebuild(db)
+
+
+async def rebuild_risk_rollup(db: AsyncSession) -> int:
+    """
+    Recompute case_risk_rollup from cases (backfill, or after cases were
+    changed outside create_case). Returns the number of rollup rows.
+    """
+    await _lock_cases(db)
+    return await _rebuild(db)
+
+
+async def _backfill_done(db: AsyncSession) -> bool:
+    return (await db.execute(select(CaseRiskRollupBackfill.id).limit(1))).first() is not None
+
+
+async def _lock_cases(db: AsyncSession):
+    # Until commit: case inserts (and their rollup increments) wait, and
+    # so does a concurrent rebuild (the mode conflicts with itself)
+    await db.execute(text("LOCK TABLE cases IN SHARE ROW EXCLUSIVE MODE"))
+
 
+async def _rebuild(db: AsyncSession) -> int:
+    """Rollup from cases plus the backfill marker, in one transaction"""
+    await db.execute(delete(CaseRiskRollup))
+    grouped = select(
+        Case.source,
+        CASE_DAY,
+        SEVERITY_BUCKET,
+        LIKELIHOOD_BUCKET,
+        func.count(),
+    ).group_by(literal_column("1"), literal_column("2"), literal_column("3"), literal_column("4"))
+    result = await db.execute(
+        CaseRiskRollup.__table__.insert().from_select(
+            ["source", "day", "severity", "likelihood", "case_count"], grouped
+        )
+    )
+    marker = pg_insert(CaseRiskRollupBackfill).values(id=1)
+    await db.execute(marker.on_conflict_do_update(
+        index_elements=[CaseRiskRollupBackfill.id],
+        set_={"completed_at": func.now()},
+    ))
+    await db.commit()
+    return result.rowcount
@@ -6,10 +6,11 @@ Audit Logging - Persist who asked what, risk scores, and actions
 from typing import Optional, Dict, Any
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import Column, Integer, String, Float, DateTime, JSON, Text
+from sqlalchemy import Column, Integer, String, Float, DateTime, JSON, Text, Index
 from sqlalchemy.sql import func
 from backend.core.utils.dependencies import Base, get_db
 from backend.telemetry.logger import setup_logger
+from backend.telemetry.audit_sink import get_audit_sink
 
 logger = setup_logger("eza.audit")
 
@@ -30,6 +31,12 @@ class AuditLog(Base):
     policy_pack = Column(String, nullable=True)
     meta_data = Column("metadata", JSON, nullable=True)  # Renamed to avoid conflict with Base.metadata
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # Keyset pagination (created_at, id), unfiltered and per endpoint
+    __table_args__ = (
+        Index('idx_audit_logs_created_at_id', 'created_at', 'id'),
+        Index('idx_audit_logs_endpoint_created_at_id', 'endpoint', 'created_at', 'id'),
+    )
 
 
 async def log_audit_event(
@@ -45,7 +52,27 @@ async def log_audit_event(
     policy_pack: Optional[str] = None,
     meta_data: Optional[Dict[str, Any]] = None,
 ):
-    """Log audit event to database"""
+    """
+    Log audit event to database.
+    Queued on the batched audit sink when it is running (no commit on the
+    request path), otherwise written inline with the request's session.
+    """
+    sink = get_audit_sink()
+    if sink is not None:
+        await sink.submit({
+            "user_id": user_id,
+            "institution_id": institution_id,
+            "endpoint": endpoint,
+            "method": method,
+            "input_hash": input_hash,
+            "risk_score": risk_score,
+            "eza_score": eza_score,
+            "action_taken": action_taken,
+            "policy_pack": policy_pack,
+            "metadata": meta_data,
+        })
+        return
+    
     try:
         audit_log = AuditLog(
             user_id=user_id,
@@ -86,6 +113,6 @@ async def log_high_risk_event(
         risk_score=risk_score,
         eza_score=eza_score,
         action_taken="blocked" if risk_score > 0.8 else "flagged",
-        metadata=metadata
+        meta_data=metadata
     )
 
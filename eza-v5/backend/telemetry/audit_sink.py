@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""
+Audit Sink - Batched, asynchronous audit log writer
+
+Requests enqueue audit rows on a bounded asyncio.Queue and return; one
+background task writes them with a multi-row INSERT, flushing when
+AUDIT_BATCH_SIZE rows are waiting or AUDIT_FLUSH_INTERVAL_MS after the
+first row of a batch, whichever comes first.
+
+Overflow policy when the queue is full (AUDIT_OVERFLOW_POLICY):
+- block:       wait up to AUDIT_ENQUEUE_TIMEOUT_MS for space (backpressure),
+               then drop the new row
+- drop_newest: drop the new row at once
+- drop_oldest: evict the oldest queued row to make room
+
+Rows are timestamped when they are enqueued, so created_at does not
+shift with batching. Failed batches are retried with backoff, then
+dropped (and counted).
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional, Callable, Awaitable
+
+from sqlalchemy import insert
+
+from backend.config import Settings, get_settings
+from backend.telemetry.logger import setup_logger
+
+logger = setup_logger("eza.audit")
+
+BLOCK = "block"
+DROP_NEWEST = "drop_newest"
+DROP_OLDEST = "drop_oldest"
+
+WRITE_ATTEMPTS = 3
+
+AuditWriter = Callable[[List[Dict[str, Any]]], Awaitable[None]]
+
+
+async def insert_audit_rows(rows: List[Dict[str, Any]]):
+    """Default writer: one multi-row INSERT into audit_logs"""
+    from backend.core.utils.dependencies import engine
+    from backend.telemetry.audit_log import AuditLog
+    async with engine.begin() as conn:
+        await conn.execute(insert(AuditLog.__table__), rows)
+
+
+class AuditSink:
+    """Bounded queue + background batch writer for audit rows"""
+
+    def __init__(self, settings: Optional[Settings] = None, writer: Optional[AuditWriter] = None):
+        settings = settings or get_settings()
+        self.batch_size = settings.AUDIT_BATCH_SIZE
+        self.flush_interval = settings.AUDIT_FLUSH_INTERVAL_MS / 1000.0
+        self.enqueue_timeout = settings.AUDIT_ENQUEUE_TIMEOUT_MS / 1000.0
+        self.overflow_policy = settings.AUDIT_OVERFLOW_POLICY
+        self.writer = writer or insert_audit_rows
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=settings.AUDIT_QUEUE_SIZE)
+        self._task: Optional[asyncio.Task] = None
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        self.failed_batches = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        if not self.running:
+            self._task = asyncio.create_task(self._run(), name="audit_sink")
+
+    async def submit(self, row: Dict[str, Any]) -> bool:
+        """Queue one audit row; returns False if it was dropped"""
+        row.setdefault("created_at", datetime.now(timezone.utc))
+        try:
+            self._queue.put_nowait(row)
+        except asyncio.QueueFull:
+            if not await self._overflow(row):
+                self.dropped += 1
+                return False
+        self.enqueued += 1
+        return True
+
+    async def _overflow(self, row: Dict[str, Any]) -> bool:
+        if self.overflow_policy == BLOCK:
+            try:
+                await asyncio.wait_for(self._queue.put(row), timeout=self.enqueue_timeout)
+                return True
+            except asyncio.TimeoutError:
+                return False
+        if self.overflow_policy == DROP_OLDEST:
+            try:
+                self._queue.get_nowait()
+                self._queue.task_done()
+                self.dropped += 1
+            except asyncio.QueueEmpty:
+                pass
+            try:
+                self._queue.put_nowait(row)
+                return True
+            except asyncio.QueueFull:
+                return False
+        return False
+
+    async def _next_batch(self) -> List[Dict[str, Any]]:
+        """Wait for a first row, then gather until batch_size or the flush interval"""
+        batch = [await self._queue.get()]
+        deadline = asyncio.get_running_loop().time() + self.flush_interval
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            remaining = deadline - asyncio.get_running_loop().time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _write(self, batch: List[Dict[str, Any]]):
+        for attempt in range(WRITE_ATTEMPTS):
+            try:
+                await self.writer(batch)
+                self.written += len(batch)
+                self.batches += 1
+                return
+            except Exception as e:
+                if attempt == WRITE_ATTEMPTS - 1:
+                    self.failed_batches += 1
+                    self.dropped += len(batch)
+                    logger.error(f"Failed to write {len(batch)} audit rows, dropping them: {e}")
+                    return
+                await asyncio.sleep(0.1 * 2 ** attempt)
+
+    async def _run(self):
+        while True:
+            batch = await self._next_batch()
+            try:
+                # Shielded so a shutdown cancel cannot abort a half-done write
+                await asyncio.shield(self._write(batch))
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def drain(self, timeout: float):
+        """Write everything queued, then stop the writer task"""
+        if self.running:
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout=timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"Audit sink drain timed out, {self._queue.qsize()} rows not written")
+                self.dropped += self._queue.qsize()
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "queued": self._queue.qsize(),
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "failed_batches": self.failed_batches,
+            "overflow_policy": self.overflow_policy,
+        }
+
+
+# Global sink (started in the lifespan)
+_audit_sink: Optional[AuditSink] = None
+
+
+def get_audit_sink() -> Optional[AuditSink]:
+    """The running audit sink, or None (callers then write inline)"""
+    if _audit_sink is not None and _audit_sink.running:
+        return _audit_sink
+    return None
+
+
+def start_audit_sink(settings: Optional[Settings] = None) -> Optional[AuditSink]:
+    """Start the global audit sink (lifespan startup); no-op when AUDIT_SINK_ENABLED is off"""
+    global _audit_sink
+    settings = settings or get_settings()
+    if not settings.AUDIT_SINK_ENABLED:
+        return None
+    if _audit_sink is None:
+        _audit_sink = AuditSink(settings)
+    _audit_sink.start()
+    return _audit_sink
+
+
+async def stop_audit_sink():
+    """Drain and stop the global audit sink (lifespan shutdown)"""
+    global _audit_sink
+    if _audit_sink is not None:
+        await _audit_sink.drain(get_settings().AUDIT_DRAIN_TIMEOUT_SECONDS)
+        logger.info(f"Audit sink stopped: {_audit_sink.stats()}")
+        _audit_sink = None
+
+
+def get_audit_sink_stats() -> Optional[Dict[str, Any]]:
+    """Sink counters (for /health)"""
+    return _audit_sink.stats() if _audit_sink is not None else None
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+Latency Histogram - Fixed-bucket log-linear (HDR-style) histogram
+
+Each power of two between MIN_MS and MAX_MS is split into SUB_BUCKETS
+equal-width buckets, so a bucket is at most 1/SUB_BUCKETS (~3%) of its
+value wide over the whole range (1 µs to ~35 min). Counts live in a
+preallocated array('d'): recording is an index computation and one
+in-place add, with no allocation and no locking (callers run on the
+event loop). Quantiles are read from the cumulative counts.
+
+Histograms with the same layout merge by adding their arrays, which is
+how per-worker series are combined (see metrics.MetricsCollector).
+"""
+
+import math
+from array import array
+from typing import Dict, Any, Optional, Iterable, List, Tuple
+
+SUB_BUCKETS = 32
+MIN_EXPONENT = -9  # frexp exponent of MIN_MS
+MAX_EXPONENT = 21  # frexp exponent of MAX_MS
+MIN_MS = 2.0 ** (MIN_EXPONENT - 1)  # ~0.001 ms
+MAX_MS = 2.0 ** MAX_EXPONENT  # ~35 min
+# Bucket 0 holds values below MIN_MS (including 0)
+BUCKET_COUNT = 1 + (MAX_EXPONENT - MIN_EXPONENT + 1) * SUB_BUCKETS
+
+DEFAULT_QUANTILES = (0.5, 0.95, 0.99, 0.999)
+
+
+def bucket_index(value_ms: float) -> int:
+    if value_ms < MIN_MS:
+        return 0
+    mantissa, exponent = math.frexp(value_ms)  # value = mantissa * 2**exponent, 0.5 <= mantissa < 1
+    if exponent > MAX_EXPONENT:
+        return BUCKET_COUNT - 1
+    return 1 + (exponent - MIN_EXPONENT) * SUB_BUCKETS + int((mantissa * 2.0 - 1.0) * SUB_BUCKETS)
+
+
+def bucket_bounds(index: int) -> Tuple[float, float]:
+    """(lower, upper) value of a bucket, in ms"""
+    if index == 0:
+        return 0.0, MIN_MS
+    octave, sub = divmod(index - 1, SUB_BUCKETS)
+    base = 2.0 ** (octave + MIN_EXPONENT - 1)
+    return base * (1.0 + sub / SUB_BUCKETS), base * (1.0 + (sub + 1) / SUB_BUCKETS)
+
+
+class LatencyHistogram:
+    """Log-linear latency histogram (milliseconds)"""
+
+    __slots__ = ("counts", "count", "sum", "min", "max")
+
+    def __init__(self):
+        self.counts = array("d", bytes(8 * BUCKET_COUNT))
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def record(self, value_ms: float):
+        self.counts[bucket_index(value_ms)] += 1
+        self.count += 1
+        self.sum += value_ms
+        if value_ms < self.min:
+            self.min = value_ms
+        if value_ms > self.max:
+            self.max = value_ms
+
+    def merge(self, other: "LatencyHistogram"):
+        counts = self.counts
+        for index, value in enumerate(other.counts):
+            if value:
+                counts[index] += value
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def mean(self) -> Optional[float]:
+        return self.sum / self.count if self.count else None
+
+    def quantiles(self, qs: Iterable[float] = DEFAULT_QUANTILES) -> Dict[float, Optional[float]]:
+        """Values (ms) at quantiles qs (0-1), from one pass over the buckets"""
+        qs = sorted(qs)
+        result: Dict[float, Optional[float]] = {q: None for q in qs}
+        if not self.count:
+            return result
+        targets = [(q, max(1.0, math.ceil(q * self.count))) for q in qs]
+        position = 0
+        cumulative = 0.0
+        for index, value in enumerate(self.counts):
+            if not value:
+                continue
+            cumulative += value
+            while position < len(targets) and cumulative >= targets[position][1]:
+                lower, upper = bucket_bounds(index)
+                # Bucket midpoint, clamped to the observed range
+                result[targets[position][0]] = min(max((lower + upper) / 2.0, self.min), self.max)
+                position += 1
+            if position == len(targets):
+                break
+        return result
+
+    def quantile(self, q: float) -> Optional[float]:
+        return self.quantiles((q,))[q]
+
+    def cumulative_counts(self, bounds_ms: Iterable[float]) -> List[float]:
+        """Counts of values in buckets whose upper bound is <= each bound (ascending bounds)"""
+        bounds = list(bounds_ms)
+        result = []
+        position = 0
+        cumulative = 0.0
+        for index, value in enumerate(self.counts):
+            upper = bucket_bounds(index)[1]
+            while position < len(bounds) and upper > bounds[position]:
+                result.append(cumulative)
+                position += 1
+            if position == len(bounds):
+                break
+            cumulative += value
+        result.extend([cumulative] * (len(bounds) - len(result)))
+        return result
+
+    def summary(self) -> Dict[str, Any]:
+        quantiles = self.quantiles()
+        return {
+            "count": self.count,
+            "avg": self.mean(),
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "p50": quantiles[0.5],
+            "p95": quantiles[0.95],
+            "p99": quantiles[0.99],
+            "p999": quantiles[0.999],
+        }
+
+    def to_state(self) -> Dict[str, Any]:
+        """Serializable state (counts as raw array bytes)"""
+        return {
+            "counts": self.counts.tobytes(),
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max,
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "LatencyHistogram":
+        histogram = cls()
+        histogram.counts = array("d", state["counts"])
+        histogram.count = state["count"]
+        histogram.sum = state["sum"]
+        histogram.min = state["min"] if state["min"] is not None else math.inf
+        histogram.max = state["max"]
+        return histogram
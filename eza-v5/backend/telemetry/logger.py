@@ -1,28 +1,58 @@
 # -*- coding: utf-8 -*-
 """
 Structured Application Logger
+
+configure_logging() routes every record through one QueueHandler on the
+root logger: the calling thread (usually the event loop) only appends
+the record to a bounded in-memory queue, and a QueueListener thread
+formats and writes it. A full queue drops the record (counted in
+get_logging_stats) instead of blocking the caller.
+
+The message is %-formatted when the record is queued, so arguments are
+rendered with the values they have at the call. Callable values in the
+structured fields (extra={"fields": {...}}) are the lazy part: they are
+only evaluated, in the listener thread, for records actually written.
+LOG_FORMAT "json" writes one JSON object per line; fields and the
+current trace_id (telemetry.tracing) become keys of that object.
+
+DEBUG records of the "eza" loggers are sampled: with
+LOG_DEBUG_SAMPLE_RATE > 0 that fraction of them is kept, with 0 they
+are not created at all. Other loggers (sqlalchemy, httpx, ...) follow
+LOG_LEVEL unsampled.
 """
 
+import json
 import logging
+import logging.handlers
+import queue
+import random
 import sys
 from typing import Optional, Dict, Any
-from datetime import datetime
+from datetime import datetime, timezone
+
+_TEXT_FORMAT = "%(asctime)s %(levelname)s [%(name)s] %(message)s"
+_TEXT_DATEFMT = "%Y-%m-%d %H:%M:%S"
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional["_NonBlockingQueueHandler"] = None
 
 
 def setup_logger(name: str = "eza", level: int = logging.INFO) -> logging.Logger:
-    """Setup structured logger"""
+    """
+    Setup structured logger
+
+    Records propagate to the root handler installed by configure_logging;
+    a stdout handler is only attached when none is installed (scripts).
+    """
     logger = logging.getLogger(name)
     logger.setLevel(level)
-    
-    if not logger.handlers:
+
+    if not logger.handlers and _queue_handler is None:
         handler = logging.StreamHandler(sys.stdout)
-        formatter = logging.Formatter(
-            "%(asctime)s %(levelname)s [%(name)s] %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S"
-        )
-        handler.setFormatter(formatter)
+        handler.setFormatter(logging.Formatter(_TEXT_FORMAT, datefmt=_TEXT_DATEFMT))
         logger.addHandler(handler)
-    
+        logger.propagate = False
+
     return logger
 
 
@@ -34,13 +64,159 @@ def log_event(
     level: int = logging.INFO
 ):
     """Log structured event"""
-    log_data = {
-        "event_type": event_type,
-        "message": message,
-        "timestamp": datetime.utcnow().isoformat(),
-    }
+    if not logger.isEnabledFor(level):
+        return
+    fields = {"event_type": event_type}
     if metadata:
-        log_data.update(metadata)
-    
-    logger.log(level, f"{event_type}: {message}", extra=log_data)
+        fields.update(metadata)
+    logger.log(level, "%s: %s", event_type, message, extra={"fields": fields})
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: ts, level, logger, msg, trace_id, fields, exc"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        trace_id = getattr(record, "trace_id", None)
+        if trace_id:
+            entry["trace_id"] = trace_id
+        for key, value in _resolve_fields(record).items():
+            entry.setdefault(key, value)
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    """Classic text line with the structured fields appended as key=value"""
+
+    def __init__(self):
+        super().__init__(_TEXT_FORMAT, datefmt=_TEXT_DATEFMT)
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = _resolve_fields(record)
+        if fields:
+            line += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+        return line
+
+
+def _resolve_fields(record: logging.LogRecord) -> Dict[str, Any]:
+    """Structured fields of a record, callables evaluated (once)"""
+    fields = getattr(record, "fields", None)
+    if not fields:
+        return {}
+    for key, value in fields.items():
+        if callable(value):
+            try:
+                fields[key] = value()
+            except Exception as e:
+                fields[key] = f"<field error: {e}>"
+    return fields
 
+
+class _NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that never blocks, counts drops and leaves formatting to the listener"""
+
+    def __init__(self, log_queue: "queue.Queue", debug_sample_rate: float):
+        super().__init__(log_queue)
+        self.debug_sample_rate = debug_sample_rate
+        self.dropped = 0
+        self.sampled_out = 0
+
+    def emit(self, record: logging.LogRecord):
+        if (
+            record.levelno < logging.INFO
+            and (record.name == "eza" or record.name.startswith("eza."))
+            and random.random() >= self.debug_sample_rate
+        ):
+            self.sampled_out += 1
+            return
+        super().emit(record)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Same process: the record object itself is handed over. Its
+        # message is rendered now, since arguments may be mutable; only
+        # callable fields stay deferred to the listener.
+        from backend.telemetry.tracing import current_span
+
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        active = current_span()
+        if active is not None:
+            record.trace_id = active.trace_id
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def configure_logging():
+    """
+    Install the queue handler on the root logger and start the writer
+    thread (idempotent). Called at application import time.
+    """
+    global _listener, _queue_handler
+    if _listener is not None:
+        return
+    from backend.config import get_settings
+
+    settings = get_settings()
+    level = logging.getLevelName(settings.LOG_LEVEL.upper())
+    if not isinstance(level, int):
+        level = logging.INFO
+
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(JsonFormatter() if settings.LOG_FORMAT == "json" else TextFormatter())
+
+    _queue_handler = _NonBlockingQueueHandler(
+        queue.Queue(maxsize=settings.LOG_QUEUE_SIZE), settings.LOG_DEBUG_SAMPLE_RATE
+    )
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_queue_handler)
+    root.setLevel(level)
+
+    # Records of setup_logger() loggers go through the queue as well
+    for logger in logging.Logger.manager.loggerDict.values():
+        if isinstance(logger, logging.Logger) and logger.name.startswith("eza"):
+            for handler in list(logger.handlers):
+                logger.removeHandler(handler)
+            logger.propagate = True
+    if settings.LOG_DEBUG_SAMPLE_RATE > 0:
+        logging.getLogger("eza").setLevel(logging.DEBUG)
+
+    _listener = logging.handlers.QueueListener(_queue_handler.queue, output, respect_handler_level=True)
+    _listener.start()
+
+
+def stop_logging():
+    """Write out queued records and stop the writer thread (lifespan shutdown)"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def get_logging_stats() -> Dict[str, Any]:
+    """Queue depth and records dropped (queue full) or sampled out (DEBUG)"""
+    if _queue_handler is None:
+        return {"enabled": False}
+    return {
+        "enabled": True,
+        "queued": _queue_handler.queue.qsize(),
+        "dropped": _queue_handler.dropped,
+        "debug_sampled_out": _queue_handler.sampled_out,
+    }
@@ -1,27 +1,74 @@
 # -*- coding: utf-8 -*-
 """
-Metrics Collection - Simple in-memory/Redis-based counters
+Metrics Collection - In-process counters and latency histograms
+
+Latencies are recorded into log-linear histograms (telemetry.histogram),
+one series per (metric name, labels), e.g. http_request{endpoint, method},
+provider_call{provider, outcome}, pipeline{mode}. Recording is
+synchronous and allocation-free, so it is cheap on hot paths.
+
+Multiple uvicorn workers: when METRICS_MULTIPROC_DIR is set (e.g. a
+directory under /dev/shm), every worker writes a snapshot of its
+counters and histogram arrays there every METRICS_SNAPSHOT_SECONDS, and
+/metrics merges the snapshots of all live workers with its own state.
+Without it, /metrics reports the worker that served the scrape.
 """
 
-from typing import Dict, Any, Optional
-from datetime import datetime
+from typing import Dict, Any, Optional, Tuple, List
 from collections import defaultdict
 import asyncio
+import base64
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+from backend.config import get_settings
 from backend.core.utils.dependencies import get_redis
+from backend.telemetry.histogram import LatencyHistogram, DEFAULT_QUANTILES
+
+logger = logging.getLogger("eza.metrics")
+
+Labels = Tuple[Tuple[str, str], ...]
+SeriesKey = Tuple[str, Labels]
+
+# Series beyond this many are folded into one {overflow="true"} series per name
+MAX_SERIES = 2000
+OVERFLOW_LABELS: Labels = (("overflow", "true"),)
+
+# Histogram buckets exposed on /metrics (seconds); quantiles are exposed separately
+EXPORT_BUCKETS_SECONDS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+
+def _labels(labels: Optional[Dict[str, Any]]) -> Labels:
+    if not labels:
+        return ()
+    return tuple(sorted((str(key), str(value)) for key, value in labels.items()))
+
+
+def _series_name(key: SeriesKey) -> str:
+    name, labels = key
+    if not labels:
+        return name
+    return name + "{" + ",".join(f"{k}={v}" for k, v in labels) + "}"
 
 
 class MetricsCollector:
     """Simple metrics collector"""
-    
+
     def __init__(self):
         self._counters: Dict[str, int] = defaultdict(int)
-        self._latencies: Dict[str, list[float]] = defaultdict(list)
+        self._histograms: Dict[SeriesKey, LatencyHistogram] = {}
+        self._cache_lookups: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
         self._use_redis = False
-    
+
     async def increment(self, metric_name: str, value: int = 1):
         """Increment counter"""
         self._counters[metric_name] += value
-        
+
         # Optionally store in Redis
         if self._use_redis:
             try:
@@ -29,38 +76,106 @@ class MetricsCollector:
                 await redis.incr(f"metrics:{metric_name}", value)
             except:
                 pass
-    
-    async def record_latency(self, metric_name: str, latency_ms: float):
+
+    def observe_latency(self, metric_name: str, latency_ms: float, labels: Optional[Dict[str, Any]] = None):
+        """Record one latency (ms) in the series for metric_name + labels"""
+        key = (metric_name, _labels(labels))
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            if len(self._histograms) >= MAX_SERIES:
+                key = (metric_name, OVERFLOW_LABELS)
+                histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = LatencyHistogram()
+        histogram.record(latency_ms)
+
+    async def record_latency(self, metric_name: str, latency_ms: float, labels: Optional[Dict[str, Any]] = None):
         """Record latency"""
-        self._latencies[metric_name].append(latency_ms)
-        
-        # Keep only last 1000 measurements
-        if len(self._latencies[metric_name]) > 1000:
-            self._latencies[metric_name] = self._latencies[metric_name][-1000:]
-    
+        self.observe_latency(metric_name, latency_ms, labels)
+
+    def record_cache_lookup(self, cache_name: str, outcome: str):
+        """Record a cache lookup outcome ("miss" or the tier that hit, e.g. "memory")"""
+        self._cache_lookups[cache_name][outcome] += 1
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Lookups, hits per tier and hit ratio per cache"""
+        return _cache_stats(self._cache_lookups)
+
     def get_counter(self, metric_name: str) -> int:
         """Get counter value"""
         return self._counters.get(metric_name, 0)
-    
+
+    def get_histogram(self, metric_name: str, labels: Optional[Dict[str, Any]] = None) -> Optional[LatencyHistogram]:
+        """
+        Histogram of one series, or of all series of metric_name merged
+        when labels is None
+        """
+        if labels is not None:
+            return self._histograms.get((metric_name, _labels(labels)))
+        merged = None
+        for (name, _), histogram in self._histograms.items():
+            if name == metric_name:
+                if merged is None:
+                    merged = LatencyHistogram()
+                merged.merge(histogram)
+        return merged
+
     def get_avg_latency(self, metric_name: str) -> Optional[float]:
         """Get average latency"""
-        latencies = self._latencies.get(metric_name, [])
-        if not latencies:
-            return None
-        return sum(latencies) / len(latencies)
-    
+        histogram = self.get_histogram(metric_name)
+        return histogram.mean() if histogram is not None else None
+
+    def get_latency_percentiles(
+        self,
+        metric_name: str,
+        labels: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """count, avg, min, max, p50, p95, p99, p999 (ms) of a series"""
+        histogram = self.get_histogram(metric_name, labels)
+        return histogram.summary() if histogram is not None else None
+
     def get_metrics(self) -> Dict[str, Any]:
         """Get all metrics"""
         return {
             "counters": dict(self._counters),
             "latencies": {
-                name: {
-                    "avg": self.get_avg_latency(name),
-                    "count": len(latencies)
+                _series_name(key): histogram.summary()
+                for key, histogram in self._histograms.items()
+            },
+            "caches": self.get_cache_stats(),
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-serializable state, for merging across workers"""
+        return {
+            "pid": os.getpid(),
+            "time": time.time(),
+            "counters": dict(self._counters),
+            "caches": {name: dict(outcomes) for name, outcomes in self._cache_lookups.items()},
+            "histograms": [
+                {
+                    "name": name,
+                    "labels": list(labels),
+                    **{k: v for k, v in histogram.to_state().items() if k != "counts"},
+                    "counts": base64.b64encode(histogram.counts.tobytes()).decode("ascii"),
                 }
-                for name, latencies in self._latencies.items()
-            }
+                for (name, labels), histogram in self._histograms.items()
+            ],
+        }
+
+
+def _cache_stats(lookups_by_cache: Dict[str, Dict[str, int]]) -> Dict[str, Any]:
+    stats = {}
+    for cache_name, outcomes in lookups_by_cache.items():
+        lookups = sum(outcomes.values())
+        hits = lookups - outcomes.get("miss", 0)
+        stats[cache_name] = {
+            "lookups": lookups,
+            "hits": hits,
+            "hit_ratio": hits / lookups if lookups else 0.0,
+            "by_outcome": dict(outcomes),
         }
+    return stats
 
 
 # Global metrics instance
@@ -72,12 +187,260 @@ async def increment_metric(metric_name: str, value: int = 1):
     await _metrics_collector.increment(metric_name, value)
 
 
-async def record_latency(metric_name: str, latency_ms: float):
+async def record_latency(metric_name: str, latency_ms: float, labels: Optional[Dict[str, Any]] = None):
     """Record latency metric"""
-    await _metrics_collector.record_latency(metric_name, latency_ms)
+    await _metrics_collector.record_latency(metric_name, latency_ms, labels)
+
+
+def observe_latency(metric_name: str, latency_ms: float, **labels: Any):
+    """Record latency metric (sync, called from hot paths)"""
+    _metrics_collector.observe_latency(metric_name, latency_ms, labels)
+
+
+def get_latency_percentiles(metric_name: str, **labels: Any) -> Optional[Dict[str, Any]]:
+    """Latency summary of one series (all series of metric_name without labels)"""
+    return _metrics_collector.get_latency_percentiles(metric_name, labels or None)
 
 
 def get_metrics() -> Dict[str, Any]:
     """Get all metrics"""
     return _metrics_collector.get_metrics()
 
+
+def record_cache_lookup(cache_name: str, outcome: str):
+    """Record cache lookup outcome (sync, called from hot paths)"""
+    _metrics_collector.record_cache_lookup(cache_name, outcome)
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    """Get cache hit-ratio metrics"""
+    return _metrics_collector.get_cache_stats()
+
+
+# ---------------------------------------------------------------------------
+# CROSS-WORKER AGGREGATION
+# ---------------------------------------------------------------------------
+
+_snapshot_task: Optional[asyncio.Task] = None
+
+
+def _snapshot_path(directory: str, pid: int) -> str:
+    return os.path.join(directory, f"worker_{pid}.json")
+
+
+def write_snapshot(state: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    """
+    Write this worker's snapshot to METRICS_MULTIPROC_DIR (atomic replace)
+
+    state is a MetricsCollector.snapshot() taken by the caller; it must be
+    taken on the event loop thread, which mutates the collector (the file
+    write itself may run in a thread). Taken here if omitted.
+    """
+    directory = get_settings().METRICS_MULTIPROC_DIR
+    if not directory:
+        return None
+    os.makedirs(directory, exist_ok=True)
+    if state is None:
+        state = _metrics_collector.snapshot()
+    path = _snapshot_path(directory, os.getpid())
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(state, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return path
+
+
+def _read_snapshots(directory: str, max_age: float) -> List[Dict[str, Any]]:
+    """Snapshots of the other workers, skipping stale ones (dead workers)"""
+    snapshots = []
+    own_path = _snapshot_path(directory, os.getpid())
+    now = time.time()
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return snapshots
+    for name in names:
+        path = os.path.join(directory, name)
+        if not name.endswith(".json") or path == own_path:
+            continue
+        try:
+            if now - os.path.getmtime(path) > max_age:
+                continue
+            with open(path) as f:
+                snapshots.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    return snapshots
+
+
+def collect_all() -> Dict[str, Any]:
+    """
+    Counters, cache lookups and histograms of all workers: this worker's
+    live state merged with the other workers' snapshots
+    """
+    counters: Dict[str, int] = defaultdict(int, _metrics_collector._counters)
+    caches: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    for cache_name, outcomes in _metrics_collector._cache_lookups.items():
+        caches[cache_name].update(outcomes)
+    histograms: Dict[SeriesKey, LatencyHistogram] = {}
+    for key, histogram in _metrics_collector._histograms.items():
+        histograms[key] = merged = LatencyHistogram()
+        merged.merge(histogram)
+    workers = 1
+
+    settings = get_settings()
+    if settings.METRICS_MULTIPROC_DIR:
+        for snapshot in _read_snapshots(settings.METRICS_MULTIPROC_DIR, settings.METRICS_SNAPSHOT_SECONDS * 5):
+            workers += 1
+            for name, value in snapshot.get("counters", {}).items():
+                counters[name] += value
+            for cache_name, outcomes in snapshot.get("caches", {}).items():
+                for outcome, value in outcomes.items():
+                    caches[cache_name][outcome] += value
+            for state in snapshot.get("histograms", []):
+                key = (state["name"], tuple(tuple(pair) for pair in state["labels"]))
+                histogram = LatencyHistogram.from_state({**state, "counts": base64.b64decode(state["counts"])})
+                if key in histograms:
+                    histograms[key].merge(histogram)
+                else:
+                    histograms[key] = histogram
+
+    return {"workers": workers, "counters": counters, "caches": caches, "histograms": histograms}
+
+
+async def _snapshot_loop(interval: float):
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            state = _metrics_collector.snapshot()
+            await asyncio.get_running_loop().run_in_executor(None, write_snapshot, state)
+        except Exception as e:
+            logger.warning(f"Metrics snapshot failed: {e}")
+
+
+def start_metrics_snapshots():
+    """Start writing this worker's snapshots (lifespan startup; no-op without METRICS_MULTIPROC_DIR)"""
+    global _snapshot_task
+    settings = get_settings()
+    if _snapshot_task is None and settings.METRICS_MULTIPROC_DIR:
+        _snapshot_task = asyncio.create_task(
+            _snapshot_loop(settings.METRICS_SNAPSHOT_SECONDS), name="metrics_snapshot"
+        )
+
+
+async def stop_metrics_snapshots():
+    """Stop the snapshot loop and write a final snapshot (lifespan shutdown)"""
+    global _snapshot_task
+    if _snapshot_task is not None:
+        _snapshot_task.cancel()
+        try:
+            await _snapshot_task
+        except asyncio.CancelledError:
+            pass
+        _snapshot_task = None
+        write_snapshot()
+
+
+# ---------------------------------------------------------------------------
+# OPENMETRICS EXPOSITION
+# ---------------------------------------------------------------------------
+
+def _metric_name(name: str) -> str:
+    return "eza_" + re.sub(r"[^a-zA-Z0-9_]", "_", name)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(labels: Labels, *extra: Tuple[str, str]) -> str:
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{re.sub(r"[^a-zA-Z0-9_]", "_", k)}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def render_openmetrics(state: Optional[Dict[str, Any]] = None) -> str:
+    """All metrics (merged across workers) in OpenMetrics text format"""
+    state = state or collect_all()
+    lines: List[str] = []
+
+    lines.append("# TYPE eza_workers gauge")
+    lines.append("# HELP eza_workers Workers included in this scrape")
+    lines.append(f"eza_workers {state['workers']}")
+
+    for name, value in sorted(state["counters"].items()):
+        metric = _metric_name(name)
+        lines.append(f"# TYPE {metric} counter")
+        lines.append(f"{metric}_total {value}")
+
+    if state["caches"]:
+        lines.append("# TYPE eza_cache_lookups counter")
+        for cache_name, outcomes in sorted(state["caches"].items()):
+            for outcome, value in sorted(outcomes.items()):
+                lines.append(f"eza_cache_lookups_total{_label_text((('cache', cache_name), ('outcome', outcome)))} {value}")
+
+    by_name: Dict[str, List[Tuple[Labels, LatencyHistogram]]] = defaultdict(list)
+    for (name, labels), histogram in state["histograms"].items():
+        by_name[name].append((labels, histogram))
+    bounds_ms = [bound * 1000.0 for bound in EXPORT_BUCKETS_SECONDS]
+
+    for name, series in sorted(by_name.items()):
+        series.sort()
+        metric = _metric_name(name) + "_latency_seconds"
+        lines.append(f"# TYPE {metric} histogram")
+        lines.append(f"# UNIT {metric} seconds")
+        for labels, histogram in series:
+            for bound, count in zip(EXPORT_BUCKETS_SECONDS, histogram.cumulative_counts(bounds_ms)):
+                lines.append(f"{metric}_bucket{_label_text(labels, ('le', repr(bound)))} {_number(count)}")
+            lines.append(f"{metric}_bucket{_label_text(labels, ('le', '+Inf'))} {histogram.count}")
+            lines.append(f"{metric}_count{_label_text(labels)} {histogram.count}")
+            lines.append(f"{metric}_sum{_label_text(labels)} {repr(histogram.sum / 1000.0)}")
+
+        quantile_metric = _metric_name(name) + "_latency_quantile_seconds"
+        lines.append(f"# TYPE {quantile_metric} gauge")
+        lines.append(f"# UNIT {quantile_metric} seconds")
+        for labels, histogram in series:
+            for q, value in histogram.quantiles(DEFAULT_QUANTILES).items():
+                if value is not None:
+                    lines.append(f"{quantile_metric}{_label_text(labels, ('quantile', repr(q)))} {repr(value / 1000.0)}")
+
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+# ---------------------------------------------------------------------------
+# HTTP MIDDLEWARE
+# ---------------------------------------------------------------------------
+
+class LatencyMiddleware:
+    """
+    ASGI middleware recording http_request latency per route template
+    (endpoint label, e.g. /api/regulator/cases/{case_id}) and method
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        t0 = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            route = scope.get("route")
+            _metrics_collector.observe_latency(
+                "http_request",
+                (time.perf_counter() - t0) * 1000,
+                {"endpoint": getattr(route, "path", None) or "unmatched", "method": scope["method"]},
+            )
@@ -0,0 +1,320 @@
+# -*- coding: utf-8 -*-
+"""
+Profiler - On-demand in-process CPU and allocation profiling
+
+CPU: a statistical profiler driven by a SIGPROF interval timer
+(setitimer ITIMER_PROF, i.e. process CPU time). Each tick the handler
+records the interrupted main-thread stack (the event loop and
+everything it runs) as a tuple of code objects, so a sample costs a
+frame walk and a dict increment; nothing is formatted until results
+are read. Results are collapsed stacks (one "a;b;c count" line per
+stack, the input of flamegraph.pl / speedscope) and the top functions
+by self and total samples.
+
+Allocations: tracemalloc between a baseline and a final snapshot,
+grouped by line. Restricted to one endpoint, only allocations whose
+traceback passes through the endpoint's module are kept.
+
+One CPU and one allocation session may run at a time per worker;
+each stops by itself after its duration. Results stay readable until
+the next session starts. Everything is per process: with several
+workers, each request reaches one of them (see "pid").
+"""
+
+import asyncio
+import os
+import signal
+import threading
+import time
+import tracemalloc
+from typing import Dict, Any, List, Optional, Tuple
+
+# Session limits
+MAX_SECONDS = 300.0
+MIN_INTERVAL_MS = 1.0
+MAX_STACK_DEPTH = 128
+TRACEMALLOC_FRAMES = 25
+
+
+class ProfilerError(RuntimeError):
+    """Profiling session cannot be started (busy or unsupported here)"""
+
+
+def _short_path(filename: str) -> str:
+    """Path relative to the package root or site-packages, for readable stacks"""
+    for marker in ("/backend/", "/site-packages/", "/lib/python"):
+        index = filename.rfind(marker)
+        if index >= 0:
+            return filename[index + 1:]
+    return filename
+
+
+class _CpuSession:
+    def __init__(self, seconds: float, interval_ms: float):
+        self.seconds = seconds
+        self.interval_ms = interval_ms
+        self.started_at = time.time()
+        self.stopped_at: Optional[float] = None
+        self.samples = 0
+        self.stacks: Dict[Tuple, int] = {}
+        self._previous_handler = None
+        self._stop_task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self.stopped_at is None
+
+    def _on_sample(self, signum, frame):
+        stack = []
+        while frame is not None and len(stack) < MAX_STACK_DEPTH:
+            stack.append(frame.f_code)
+            frame = frame.f_back
+        key = tuple(stack)  # leaf first
+        self.stacks[key] = self.stacks.get(key, 0) + 1
+        self.samples += 1
+
+    def start(self):
+        if not hasattr(signal, "setitimer") or not hasattr(signal, "SIGPROF"):
+            raise ProfilerError("CPU profiling needs SIGPROF interval timers (not available on this platform)")
+        if threading.current_thread() is not threading.main_thread():
+            raise ProfilerError("CPU profiling must be started from the main thread")
+        self._previous_handler = signal.signal(signal.SIGPROF, self._on_sample)
+        interval = self.interval_ms / 1000.0
+        signal.setitimer(signal.ITIMER_PROF, interval, interval)
+
+    def stop(self):
+        if not self.running:
+            return
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        signal.signal(signal.SIGPROF, self._previous_handler or signal.SIG_DFL)
+        self.stopped_at = time.time()
+        if self._stop_task is not None and self._stop_task is not asyncio.current_task():
+            self._stop_task.cancel()
+
+    def _stacks_copy(self) -> List[Tuple[Tuple, int]]:
+        # list() of the items runs in C, so no sample is taken mid-copy
+        return list(self.stacks.items())
+
+    def collapsed(self) -> str:
+        """Collapsed stacks, root first, "frame;frame;frame count" per line"""
+        labels: Dict[Any, str] = {}
+
+        def label(code) -> str:
+            text = labels.get(code)
+            if text is None:
+                text = labels[code] = f"{_short_path(code.co_filename)}:{code.co_qualname}".replace(";", ",").replace(" ", "_")
+            return text
+
+        lines = [
+            ";".join(label(code) for code in reversed(stack)) + f" {count}"
+            for stack, count in sorted(self._stacks_copy(), key=lambda item: -item[1])
+        ]
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def top_functions(self, limit: int) -> List[Dict[str, Any]]:
+        """Functions by self samples (leaf of the stack), with total (inclusive) samples"""
+        self_counts: Dict[Any, int] = {}
+        total_counts: Dict[Any, int] = {}
+        for stack, count in self._stacks_copy():
+            leaf = stack[0]
+            self_counts[leaf] = self_counts.get(leaf, 0) + count
+            for code in set(stack):
+                total_counts[code] = total_counts.get(code, 0) + count
+
+        samples = self.samples or 1
+        ranked = sorted(total_counts, key=lambda code: (-self_counts.get(code, 0), -total_counts[code]))
+        return [
+            {
+                "function": code.co_qualname,
+                "file": _short_path(code.co_filename),
+                "line": code.co_firstlineno,
+                "self_samples": self_counts.get(code, 0),
+                "self_pct": round(100.0 * self_counts.get(code, 0) / samples, 2),
+                "self_ms": round(self_counts.get(code, 0) * self.interval_ms, 1),
+                "total_samples": total_counts[code],
+                "total_pct": round(100.0 * total_counts[code] / samples, 2),
+            }
+            for code in ranked[:limit]
+        ]
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "kind": "cpu",
+            "pid": os.getpid(),
+            "running": self.running,
+            "seconds": self.seconds,
+            "interval_ms": self.interval_ms,
+            "started_at": self.started_at,
+            "stopped_at": self.stopped_at,
+            "samples": self.samples,
+            "stacks": len(self.stacks),
+        }
+
+
+class _AllocationSession:
+    def __init__(self, seconds: float, filename: Optional[str], endpoint: Optional[str]):
+        self.seconds = seconds
+        self.filename = filename
+        self.endpoint = endpoint
+        self.started_at = time.time()
+        self.stopped_at: Optional[float] = None
+        self.stats: List[Any] = []
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._started_tracing = False
+        self._stop_task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self.stopped_at is None
+
+    def _filters(self) -> List[tracemalloc.BaseFilter]:
+        filters = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ]
+        if self.filename:
+            filters.append(tracemalloc.Filter(True, self.filename, all_frames=True))
+        return filters
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            self._started_tracing = True
+        self._baseline = tracemalloc.take_snapshot().filter_traces(self._filters())
+
+    def stop(self):
+        if not self.running:
+            return
+        final = tracemalloc.take_snapshot().filter_traces(self._filters())
+        if self._started_tracing:
+            tracemalloc.stop()
+        self.stats = final.compare_to(self._baseline, "lineno")
+        self._baseline = None
+        self.stopped_at = time.time()
+        if self._stop_task is not None and self._stop_task is not asyncio.current_task():
+            self._stop_task.cancel()
+
+    def top_allocations(self, limit: int) -> List[Dict[str, Any]]:
+        """Lines by memory allocated (and still held) during the session"""
+        ranked = sorted(self.stats, key=lambda stat: -stat.size_diff)
+        return [
+            {
+                "file": _short_path(stat.traceback[0].filename),
+                "line": stat.traceback[0].lineno,
+                "size_diff_kb": round(stat.size_diff / 1024, 1),
+                "size_kb": round(stat.size / 1024, 1),
+                "count_diff": stat.count_diff,
+            }
+            for stat in ranked[:limit] if stat.size_diff > 0
+        ]
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "kind": "allocations",
+            "pid": os.getpid(),
+            "running": self.running,
+            "seconds": self.seconds,
+            "endpoint": self.endpoint,
+            "started_at": self.started_at,
+            "stopped_at": self.stopped_at,
+        }
+
+
+_cpu: Optional[_CpuSession] = None
+_allocations: Optional[_AllocationSession] = None
+
+
+async def _stop_after(session, seconds: float):
+    await asyncio.sleep(seconds)
+    session.stop()
+
+
+def _schedule_stop(session):
+    session._stop_task = asyncio.get_running_loop().create_task(
+        _stop_after(session, session.seconds), name=f"profiler_stop_{type(session).__name__}"
+    )
+
+
+def start_cpu_profile(seconds: float, interval_ms: float = 10.0) -> Dict[str, Any]:
+    """
+    Start CPU sampling for seconds (must run on the event loop thread)
+
+    Raises:
+        ProfilerError: a CPU session is running, or SIGPROF is unavailable
+    """
+    global _cpu
+    if _cpu is not None and _cpu.running:
+        raise ProfilerError("A CPU profile is already running")
+    session = _CpuSession(min(seconds, MAX_SECONDS), max(interval_ms, MIN_INTERVAL_MS))
+    session.start()
+    _cpu = session
+    _schedule_stop(session)
+    return session.status()
+
+
+def stop_cpu_profile() -> Optional[Dict[str, Any]]:
+    """Stop the CPU session early (no-op if finished); None if there was none"""
+    if _cpu is None:
+        return None
+    _cpu.stop()
+    return _cpu.status()
+
+
+def get_cpu_profile(limit: int = 30) -> Optional[Dict[str, Any]]:
+    """Status and top functions of the current or last CPU session"""
+    if _cpu is None:
+        return None
+    return {**_cpu.status(), "top": _cpu.top_functions(limit)}
+
+
+def get_cpu_collapsed() -> Optional[str]:
+    """Collapsed stacks of the current or last CPU session"""
+    return _cpu.collapsed() if _cpu is not None else None
+
+
+def start_allocation_profile(
+    seconds: float,
+    filename: Optional[str] = None,
+    endpoint: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Start a tracemalloc session for seconds
+
+    Args:
+        seconds: Session length
+        filename: Only count allocations with this file in their traceback
+        endpoint: Label of the endpoint filename belongs to (reported back)
+
+    Raises:
+        ProfilerError: an allocation session is running
+    """
+    global _allocations
+    if _allocations is not None and _allocations.running:
+        raise ProfilerError("An allocation profile is already running")
+    session = _AllocationSession(min(seconds, MAX_SECONDS), filename, endpoint)
+    session.start()
+    _allocations = session
+    _schedule_stop(session)
+    return session.status()
+
+
+def stop_allocation_profile() -> Optional[Dict[str, Any]]:
+    """Stop the allocation session early (no-op if finished); None if there was none"""
+    if _allocations is None:
+        return None
+    _allocations.stop()
+    return _allocations.status()
+
+
+def get_allocation_profile(limit: int = 30) -> Optional[Dict[str, Any]]:
+    """Status and top allocating lines of the current or last allocation session"""
+    if _allocations is None:
+        return None
+    return {**_allocations.status(), "top": _allocations.top_allocations(limit)}
+
+
+def shutdown_profiler():
+    """Stop running sessions (lifespan shutdown)"""
+    for session in (_cpu, _allocations):
+        if session is not None:
+            session.stop()
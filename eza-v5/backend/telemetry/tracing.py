@@ -0,0 +1,318 @@
+# -*- coding: utf-8 -*-
+"""
+Tracing - Lightweight spans for pipeline stages, engines and provider calls
+
+    with span("gateway.provider_call", provider="openai"):
+        ...
+
+    @traced("engine.analyze_input")
+    def analyze_input(text): ...
+
+The current span lives in a contextvar, so it follows awaits and is
+inherited by tasks created inside it (PipelineDAG nodes). Durations use
+perf_counter_ns.
+
+Sampling: a root span (no span active) samples its whole trace with
+probability TELEMETRY_SAMPLE_RATE (0 with ENABLE_TELEMETRY off).
+Unsampled traces and calls outside any trace cost a contextvar lookup;
+decorated engines only open child spans (child_only), so engines called
+outside a request (bulk scoring, reports) are never traced.
+
+Finished sampled spans are recorded in the span latency histogram
+(metrics: span{name}) and, when TRACE_EXPORT_PATH is set, appended to
+that file as OTLP/JSON lines (one ExportTraceServiceRequest per flush)
+by a background flusher.
+"""
+
+import asyncio
+import functools
+import inspect
+import json
+import logging
+import os
+import random
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from backend.config import get_settings
+
+logger = logging.getLogger("eza.tracing")
+
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+# Finished spans waiting for the file sink (oldest dropped beyond this)
+MAX_PENDING_SPANS = 10000
+# Recently finished spans kept for trace_summary, whether exported or not
+MAX_RECENT_SPANS = 2000
+
+# perf_counter_ns -> wall clock (ns since epoch)
+_CLOCK_OFFSET_NS = time.time_ns() - time.perf_counter_ns()
+
+
+class Span:
+    """One timed operation of a trace"""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "kind", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], kind: int, attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.kind = kind
+        self.attributes = attributes
+        self.error: Optional[str] = None
+        self.end_ns: Optional[int] = None
+        self.start_ns = time.perf_counter_ns()
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        return (self.end_ns - self.start_ns) / 1e6 if self.end_ns is not None else None
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def to_otlp(self) -> Dict[str, Any]:
+        otlp = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns + _CLOCK_OFFSET_NS),
+            "endTimeUnixNano": str(self.end_ns + _CLOCK_OFFSET_NS),
+            "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in self.attributes.items()],
+            "status": {"code": STATUS_ERROR, "message": self.error} if self.error else {"code": STATUS_OK},
+        }
+        if self.parent_id:
+            otlp["parentSpanId"] = self.parent_id
+        return otlp
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+# Current span; _UNSAMPLED marks a trace that lost the sampling draw
+_UNSAMPLED = object()
+_current: ContextVar[Any] = ContextVar("eza_current_span", default=None)
+
+_pending: Deque[Span] = deque(maxlen=MAX_PENDING_SPANS)
+_recent: Deque[Span] = deque(maxlen=MAX_RECENT_SPANS)
+_flush_task: Optional[asyncio.Task] = None
+
+
+def current_span() -> Optional[Span]:
+    """Active sampled span, if any"""
+    active = _current.get()
+    return active if isinstance(active, Span) else None
+
+
+def _sample_rate() -> float:
+    settings = get_settings()
+    return settings.TELEMETRY_SAMPLE_RATE if settings.ENABLE_TELEMETRY else 0.0
+
+
+def _finish(span: Span):
+    from backend.telemetry.metrics import observe_latency
+
+    observe_latency("span", span.duration_ms, name=span.name, outcome="error" if span.error else "ok")
+    _pending.append(span)
+    _recent.append(span)
+
+
+class span:
+    """
+    Context manager for a span (yields the Span, or None when not traced)
+
+    Args:
+        name: Span name ("engine.analyze_input", "gateway.provider_call")
+        child_only: only trace inside an active trace, never start one
+        force: start a sampled trace regardless of TELEMETRY_SAMPLE_RATE
+               (also inside an unsampled one)
+        kind: SPAN_KIND_INTERNAL or SPAN_KIND_CLIENT
+        activate: make the span current; False for spans held open across
+                  the yields of an async generator (contextvar changes
+                  cannot span those), which then get no child spans
+        **attributes: span attributes
+    """
+
+    __slots__ = ("name", "child_only", "force", "kind", "activate", "attributes", "_span", "_token")
+
+    def __init__(
+        self,
+        name: str,
+        child_only: bool = False,
+        force: bool = False,
+        kind: int = SPAN_KIND_INTERNAL,
+        activate: bool = True,
+        **attributes: Any
+    ):
+        self.name = name
+        self.child_only = child_only
+        self.force = force
+        self.kind = kind
+        self.activate = activate
+        self.attributes = attributes
+        self._span: Optional[Span] = None
+        self._token = None
+
+    def __enter__(self) -> Optional[Span]:
+        parent = _current.get()
+        if isinstance(parent, Span):
+            self._span = Span(self.name, parent.trace_id, parent.span_id, self.kind, self.attributes)
+        elif (parent is _UNSAMPLED and not self.force) or self.child_only:
+            return None
+        elif self.force or random.random() < _sample_rate():
+            self._span = Span(self.name, os.urandom(16).hex(), None, self.kind, self.attributes)
+        elif self.activate:
+            self._token = _current.set(_UNSAMPLED)
+            return None
+        else:
+            return None
+        if self.activate:
+            self._token = _current.set(self._span)
+        return self._span
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._token is not None:
+            _current.reset(self._token)
+        if self._span is not None:
+            self._span.end_ns = time.perf_counter_ns()
+            if exc is not None and not isinstance(exc, (asyncio.CancelledError, GeneratorExit)):
+                self._span.error = f"{exc_type.__name__}: {exc}"
+            _finish(self._span)
+        return False
+
+
+def traced(name: Optional[str] = None, child_only: bool = True, kind: int = SPAN_KIND_INTERNAL) -> Callable:
+    """
+    Decorator: run a sync or async function inside span(name). Engines
+    use the default child_only=True (traced only as part of a request).
+    """
+    def decorate(fn: Callable) -> Callable:
+        span_name = name or f"{fn.__module__.rsplit('.', 1)[-1]}.{fn.__name__}"
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                if _current.get() is None and child_only:
+                    return await fn(*args, **kwargs)
+                with span(span_name, child_only=child_only, kind=kind):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _current.get() is None and child_only:
+                return fn(*args, **kwargs)
+            with span(span_name, child_only=child_only, kind=kind):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    return decorate
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware opening the root span of each HTTP request, named
+    after the matched route template ("POST /api/proxy/internal/run")
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with span("http.request", kind=SPAN_KIND_SERVER, method=scope["method"]) as root:
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                if root is not None:
+                    route = scope.get("route")
+                    root.name = f"{scope['method']} {getattr(route, 'path', None) or 'unmatched'}"
+
+
+def trace_summary(trace_id: str) -> List[Dict[str, Any]]:
+    """Recently finished spans of a trace (name, ms, parent), in finish order"""
+    return [
+        {"name": s.name, "span_id": s.span_id, "parent_id": s.parent_id, "ms": round(s.duration_ms, 3), "error": s.error}
+        for s in list(_recent) if s.trace_id == trace_id
+    ]
+
+
+# ---------------------------------------------------------------------------
+# OTLP/JSON FILE SINK
+# ---------------------------------------------------------------------------
+
+def export_request(spans: List[Span]) -> Dict[str, Any]:
+    """OTLP ExportTraceServiceRequest (JSON encoding) for spans"""
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": get_settings().PROJECT_NAME}}]},
+            "scopeSpans": [{
+                "scope": {"name": "eza.tracing"},
+                "spans": [s.to_otlp() for s in spans],
+            }],
+        }]
+    }
+
+
+def flush_spans() -> int:
+    """Append pending spans to TRACE_EXPORT_PATH as one OTLP/JSON line, returns spans written"""
+    path = get_settings().TRACE_EXPORT_PATH
+    if not _pending:
+        return 0
+    spans = []
+    while _pending:
+        spans.append(_pending.popleft())
+    if not path:
+        return 0
+    line = json.dumps(export_request(spans), separators=(",", ":"))
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(line + "\n")
+    return len(spans)
+
+
+async def _flush_loop(interval: float):
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, flush_spans)
+        except Exception as e:
+            logger.warning(f"Trace export failed: {e}")
+
+
+def start_trace_exporter():
+    """Start the periodic span flush (lifespan startup)"""
+    global _flush_task
+    if _flush_task is None:
+        _flush_task = asyncio.create_task(
+            _flush_loop(get_settings().TRACE_FLUSH_SECONDS), name="trace_export"
+        )
+
+
+async def stop_trace_exporter():
+    """Stop the flush loop and write what is still pending (lifespan shutdown)"""
+    global _flush_task
+    if _flush_task is not None:
+        _flush_task.cancel()
+        try:
+            await _flush_task
+        except asyncio.CancelledError:
+            pass
+        _flush_task = None
+    flush_spans()
@@ -3,11 +3,16 @@
 Tenancy Resolver - Extract institution context from requests
 """
 
-from fastapi import Request, Header
+from fastapi import Request, Header, Depends
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
-from backend.core.utils.dependencies import get_current_user
-from backend.models.user import User
+from backend.core.utils.dependencies import get_db
+from backend.core.utils.principal import Principal, load_principal
+from backend.core.utils.security import decode_access_token_cached
+
+optional_bearer = HTTPBearer(auto_error=False)
 
 
 class TenantContext(BaseModel):
@@ -22,26 +27,32 @@ async def resolve_tenant(
     request: Request,
     x_institution_id: Optional[int] = Header(None, alias="X-Institution-Id"),
     x_api_key: Optional[str] = Header(None, alias="X-Api-Key"),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_bearer),
+    db: AsyncSession = Depends(get_db),
 ) -> TenantContext:
     """
     Resolve tenant context from request headers and JWT
     """
     ctx = TenantContext()
     
-    # Try to get user from JWT
-    try:
-        # This will work if authentication is enabled
-        # For now, we'll handle it gracefully
-        user: Optional[User] = None
-        # user = await get_current_user(...)  # TODO: Wire properly when auth is enabled
-    except:
-        user = None
+    # User from JWT, if one is sent (claims and principal are cached)
+    user: Optional[Principal] = None
+    if credentials is not None:
+        payload = decode_access_token_cached(credentials.credentials)
+        try:
+            if payload and payload.get("sub") is not None:
+                user = await load_principal(db, int(payload["sub"]))
+        except Exception:
+            # No tenant roles rather than failing the request
+            user = None
     
-    if user:
+    if user and user.is_active:
         ctx.user_id = user.id
-        ctx.institution_id = user.institution_id if hasattr(user, 'institution_id') else None
-        if user.role:
-            ctx.roles = [user.role.name]
+        ctx.institution_id = user.institution_id
+        ctx.roles = list(user.roles)
+        # Verified tenant only (the header below does not count for rate limits)
+        request.state.user_id = user.id
+        request.state.tenant_id = user.institution_id
     
     # Override with header if present
     if x_institution_id: